@@ -1,11 +1,10 @@
-from flask import Flask, request, jsonify, render_template, send_file, redirect, url_for, session, flash
+from flask import Flask, Request, request, jsonify, render_template, send_file, redirect, url_for, session, flash, Response
 from flask_cors import CORS
 import os
 import json
-import PyPDF2
-import docx
-from werkzeug.utils import secure_filename
+import tempfile
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.utils import secure_filename
 from datetime import datetime
 import openai
 # from transformers import pipeline
@@ -13,83 +12,55 @@ import nltk
 # from sklearn.feature_extraction.text import TfidfVectorizer
 # from sklearn.metrics.pairwise import cosine_similarity
 import random
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+import secrets
+import hashlib
 import io
+import base64
 import sqlite3
 from functools import wraps
+from database import db_pool, get_db, init_app as init_db_app
+from migrations import apply_migrations
+from keywords import KeywordMatcher
+from notifications import notification_broker, notification_writer, unread_counts, format_sse, TooManyStreams
+from sentiment import sentiment_batcher
+from scoring_cache import ScoreCache, SCORE_CACHE_PERSIST
+from resume_parser import (parse_stats, extraction_pool, ExtractionError, ExtractionPoolBusy, is_offloaded,
+                           parser_version, read_source)
+from resume_cache import ResumeCache, RESUME_CACHE_ENABLED
+from resume_store import resume_text_stats, slim_resume_data
+from question_bank import question_bank_store
+from role_rules import role_classifier
+from reports import render_report
+from session_results import (RESULT_COLUMNS, SessionResults, load_session_scores, refresh_session_results,
+                             resume_skills, save_session_results)
+from report_cache import report_cache
+from report_jobs import report_jobs, ReportQueueFull
+from report_export import report_export_pool, stream_zip, ExportBusy
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+class UploadRequest(Request):
+    """Request that keeps uploaded files in memory up to UPLOAD_SPOOL_THRESHOLD bytes"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Larger uploads roll over to an anonymous temp file that is removed on close
+        return tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_SPOOL_THRESHOLD'], mode='rb+')
 
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app)
 app.secret_key = 'your-secret-key-change-this-in-production'
 
 # Configuration
-app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['UPLOAD_SPOOL_THRESHOLD'] = int(os.environ.get('UPLOAD_SPOOL_THRESHOLD', str(1024 * 1024)))
 
-# Create upload directory if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Pooled per-request database connections
+init_db_app(app)
 
 # Initialize database
 def init_db():
-    conn = sqlite3.connect('talentmate.db')
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            full_name TEXT,
-            role TEXT DEFAULT 'user',
-            phone TEXT,
-            company TEXT,
-            position TEXT,
-            experience_years INTEGER,
-            skills TEXT,
-            bio TEXT,
-            profile_picture TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS interview_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            session_id TEXT UNIQUE,
-            job_role TEXT,
-            resume_data TEXT,
-            questions TEXT,
-            answers TEXT,
-            scores TEXT,
-            overall_score INTEGER,
-            status TEXT DEFAULT 'completed',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS interview_requests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            session_id TEXT,
-            preferred_date DATETIME,
-            preferred_time TEXT,
-            message TEXT,
-            status TEXT DEFAULT 'pending',
-            recruiter_id INTEGER,
-            recruiter_response TEXT,
-            scheduled_date DATETIME,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (recruiter_id) REFERENCES users (id)
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    with db_pool.connection() as conn:
+        apply_migrations(conn)
 
 # Initialize database on startup
 init_db()
@@ -106,7 +77,7 @@ def login_required(f):
 
 # User management functions
 def create_user(username, email, password, full_name):
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     password_hash = generate_password_hash(password)
     try:
@@ -116,24 +87,22 @@ def create_user(username, email, password, full_name):
         ''', (username, email, password_hash, full_name))
         conn.commit()
         user_id = cursor.lastrowid
-        conn.close()
         return user_id
     except sqlite3.IntegrityError:
-        conn.close()
+        conn.rollback()
         return None
 
 def verify_user(username, password):
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute('SELECT id, password_hash FROM users WHERE username = ?', (username,))
     user = cursor.fetchone()
-    conn.close()
     if user and check_password_hash(user[1], password):
         return user[0]
     return None
 
 def get_user_info(user_id):
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute('''
         SELECT username, email, full_name, role, phone, company, position, 
@@ -141,21 +110,8 @@ def get_user_info(user_id):
         FROM users WHERE id = ?
     ''', (user_id,))
     user = cursor.fetchone()
-    conn.close()
     return user
 
-# Initialize NLP models (optional)
-ENABLE_SENTIMENT = os.environ.get('ENABLE_SENTIMENT', '0') in ('1', 'true', 'True')
-sentiment_analyzer = None
-if ENABLE_SENTIMENT:
-    try:
-        from transformers import pipeline
-        sentiment_analyzer = pipeline("sentiment-analysis")
-        print("NLP models loaded successfully")
-    except Exception as e:
-        print(f"Error loading NLP models: {e}")
-        sentiment_analyzer = None
-
 # Download required NLTK data
 try:
     nltk.download('punkt', quiet=True)
@@ -164,233 +120,67 @@ except:
     pass
 
 class SkillMateAI:
-    def __init__(self):
-        self.question_bank = {
-            "coding": {
-                "beginner": [
-                    "Write a function to reverse a string without using built-in reverse methods.",
-                    "Implement a function to check if a number is prime.",
-                    "Write a program to find the factorial of a number using recursion.",
-                    "Create a function to find the largest element in an array.",
-                    "Implement a simple calculator that can add, subtract, multiply, and divide."
-                ],
-                "intermediate": [
-                    "Implement a binary search algorithm and explain its time complexity.",
-                    "Write a function to detect if a linked list has a cycle.",
-                    "Implement a stack using arrays and demonstrate its operations.",
-                    "Create a function to find all permutations of a string.",
-                    "Write a program to implement merge sort algorithm."
-                ],
-                "advanced": [
-                    "Design and implement a LRU (Least Recently Used) cache.",
-                    "Implement a trie data structure for autocomplete functionality.",
-                    "Write a function to find the shortest path in a weighted graph using Dijkstra's algorithm.",
-                    "Design a system to handle millions of concurrent users.",
-                    "Implement a distributed hash table with consistent hashing."
-                ]
-            },
-            "role_specific": {
-                "salesforce_admin": [
-                    "How would you design a custom object structure for a sales pipeline tracking system in Salesforce?",
-                    "Explain the difference between Role Hierarchy and Sharing Rules. When would you use each?",
-                    "Walk me through creating a validation rule to ensure data quality in opportunity records.",
-                    "How would you set up an approval process for expense reports with multiple approval levels?",
-                    "Describe how you would use Process Builder vs Flow vs Workflow Rules for automation.",
-                    "How would you handle data migration from a legacy CRM to Salesforce while maintaining data integrity?",
-                    "Explain how you would configure territory management for a global sales organization.",
-                    "How would you create custom reports and dashboards to track sales performance KPIs?"
-                ],
-                "salesforce_developer": [
-                    "Write an Apex trigger to prevent duplicate account creation based on email domain.",
-                    "How would you implement bulk data processing in Apex while avoiding governor limits?",
-                    "Explain the difference between SOQL and SOSL. Provide examples of when to use each.",
-                    "Design a Lightning Web Component for a custom opportunity management interface.",
-                    "How would you implement custom REST API endpoints in Salesforce for external integrations?",
-                    "Describe how you would use Platform Events for real-time data synchronization.",
-                    "Explain the MVC pattern in Salesforce development and how it applies to Lightning components.",
-                    "How would you optimize SOQL queries for better performance in large data sets?"
-                ],
-                "program_analyst": [
-                    "How would you approach analyzing business requirements for a new software implementation?",
-                    "Describe your process for conducting stakeholder interviews to gather functional requirements.",
-                    "How would you create and maintain a requirements traceability matrix for a large project?",
-                    "Explain how you would perform gap analysis between current state and future state processes.",
-                    "How would you facilitate workshops to resolve conflicting requirements from different departments?",
-                    "Describe your approach to creating user stories and acceptance criteria for development teams.",
-                    "How would you measure and report on project KPIs and success metrics?",
-                    "Explain how you would conduct risk assessment and mitigation planning for program initiatives."
-                ],
-                "java_fullstack": [
-                    "Design a RESTful API using Spring Boot for a microservices architecture.",
-                    "Explain the difference between @Component, @Service, and @Repository annotations in Spring.",
-                    "How would you implement JWT-based authentication in a Spring Boot application?",
-                    "Describe how you would optimize JPA/Hibernate queries for better database performance.",
-                    "How would you implement caching strategies using Redis in a Java application?",
-                    "Explain how you would handle concurrent requests and thread safety in a Java web application.",
-                    "Describe the implementation of a message queue system using RabbitMQ or Apache Kafka.",
-                    "How would you implement unit testing for a Spring Boot application using JUnit and Mockito?"
-                ],
-                "python_fullstack": [
-                    "Design a RESTful API using Django REST Framework with proper serialization and validation.",
-                    "Explain how you would implement async/await patterns in Python for handling concurrent requests.",
-                    "How would you structure a Django project for scalability and maintainability?",
-                    "Describe how you would implement caching strategies using Redis with Django.",
-                    "How would you handle database migrations and schema changes in a production Django application?",
-                    "Explain how you would implement OAuth2 authentication using Django and social auth.",
-                    "Describe how you would optimize Python code for better performance in data-heavy applications.",
-                    "How would you implement background task processing using Celery with Django?"
-                ],
-                "dotnet_fullstack": [
-                    "Design a Web API using ASP.NET Core with proper dependency injection and middleware.",
-                    "Explain the difference between .NET Core and .NET Framework, and when to use each.",
-                    "How would you implement Entity Framework Core with Code First migrations?",
-                    "Describe how you would implement authentication and authorization using ASP.NET Core Identity.",
-                    "How would you handle error handling and logging in a .NET Core application?",
-                    "Explain how you would implement SignalR for real-time communication features.",
-                    "Describe how you would optimize .NET applications for performance and memory management.",
-                    "How would you implement unit testing using xUnit and Moq in a .NET Core project?"
-                ]
-            },
-            "scenario": {
-                "leadership": [
-                    "Describe a time when you had to lead a team through a difficult project. How did you motivate your team?",
-                    "How would you handle a situation where team members have conflicting opinions on a technical approach?",
-                    "Tell me about a time when you had to make a difficult decision with limited information.",
-                    "How do you ensure effective communication within your team?",
-                    "Describe how you would handle an underperforming team member."
-                ],
-                "problem_solving": [
-                    "Walk me through how you would debug a system that's running slowly in production.",
-                    "How would you approach designing a new feature with unclear requirements?",
-                    "Describe a complex technical problem you solved and your approach.",
-                    "How do you prioritize tasks when everything seems urgent?",
-                    "Tell me about a time when you had to learn a new technology quickly."
-                ],
-                "communication": [
-                    "How would you explain a complex technical concept to a non-technical stakeholder?",
-                    "Describe a time when you had to give difficult feedback to a colleague.",
-                    "How do you handle disagreements during code reviews?",
-                    "Tell me about a presentation you gave and how you prepared for it.",
-                    "How do you ensure your written communication is clear and effective?"
-                ],
-                "salesforce_specific": [
-                    "How would you explain the benefits of Salesforce automation to a non-technical business user?",
-                    "Describe a time when you had to troubleshoot a complex Salesforce integration issue.",
-                    "How would you approach training end users on a new Salesforce feature you implemented?",
-                    "Tell me about a time when you had to balance technical constraints with business requirements.",
-                    "How would you handle a situation where a business user requests a customization that goes against best practices?"
-                ],
-                "analyst_specific": [
-                    "Describe how you would handle conflicting requirements from different stakeholders.",
-                    "How would you approach documenting complex business processes for technical implementation?",
-                    "Tell me about a time when your analysis revealed unexpected insights that changed project direction.",
-                    "How would you present technical recommendations to executive-level stakeholders?",
-                    "Describe your approach to quality assurance and testing coordination."
-                ]
-            }
-        }
-        
-    def extract_text_from_pdf(self, file_path):
-        """Extract text from PDF file"""
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
-        except Exception as e:
-            print(f"Error extracting PDF text: {e}")
-            return ""
-    
-    def extract_text_from_docx(self, file_path):
-        """Extract text from DOCX file"""
-        try:
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        except Exception as e:
-            print(f"Error extracting DOCX text: {e}")
-            return ""
+    # Bump whenever score_answer logic changes so cached scores are recomputed
+    SCORER_VERSION = 1
     
-    def parse_resume(self, file_path):
-        """Parse resume and extract key information"""
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension == '.pdf':
-            text = self.extract_text_from_pdf(file_path)
-        elif file_extension == '.docx':
-            text = self.extract_text_from_docx(file_path)
-        else:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-        
-        # Simple keyword extraction for skills and experience
-        skills_keywords = ['python', 'java', 'javascript', 'react', 'angular', 'node.js', 'sql', 'mongodb', 
-                          'aws', 'docker', 'kubernetes', 'git', 'machine learning', 'ai', 'data science']
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in skills_keywords:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        # Estimate experience level based on keywords
-        experience_indicators = {
-            'senior': ['senior', 'lead', 'architect', 'principal', 'manager'],
-            'mid': ['experienced', 'specialist', 'developer', '3+ years', '4+ years', '5+ years'],
-            'junior': ['junior', 'entry', 'graduate', 'intern', 'trainee']
+    def __init__(self):
+        # Questions are served from data/question_bank.json and reloaded when it changes
+        self.question_bank = question_bank_store
+        
+        # Keyword tables used by score_answer, compiled once into a single matcher
+        self.role_keywords = {
+            'salesforce': ['apex', 'soql', 'trigger', 'workflow', 'validation', 'lightning', 'component', 'process builder', 'flow'],
+            'java': ['spring', 'hibernate', 'jpa', 'microservices', 'rest api', 'junit', 'maven', 'dependency injection'],
+            'python': ['django', 'flask', 'orm', 'serializer', 'middleware', 'celery', 'rest framework', 'async'],
+            'dotnet': ['asp.net', 'entity framework', 'mvc', 'web api', 'dependency injection', 'middleware', 'linq'],
+            'analyst': ['requirements', 'stakeholder', 'user story', 'acceptance criteria', 'gap analysis', 'process', 'kpi']
         }
-        
-        experience_level = 'intermediate'  # default
-        for level, keywords in experience_indicators.items():
-            if any(keyword in text_lower for keyword in keywords):
-                experience_level = level
-                break
-        
-        return {
-            'skills': found_skills,
-            'experience_level': experience_level,
-            'full_text': text
+        self.scoring_keywords = {
+            'coding': ['algorithm', 'complexity', 'time', 'space', 'data structure',
+                       'variable', 'function', 'loop', 'condition', 'efficiency'],
+            'general': ['solution', 'implementation', 'design', 'architecture', 'best practice',
+                        'optimization', 'integration', 'configuration', 'development', 'testing'],
+            'scenario': ['experience', 'situation', 'approach', 'result', 'learned',
+                         'challenge', 'solution', 'team', 'communication'],
         }
+        self.scoring_keywords.update(self.role_keywords)
+        self.keyword_matcher = KeywordMatcher(self.scoring_keywords)
+        
+        # Cached scores are keyed by this fingerprint, so editing the keyword
+        # tables or bumping SCORER_VERSION invalidates them automatically
+        self.scoring_version = hashlib.sha256(json.dumps(
+            {'scorer': self.SCORER_VERSION, 'keywords': self.scoring_keywords}, sort_keys=True
+        ).encode('utf-8')).hexdigest()
+        self.score_cache = ScoreCache(self.scoring_version, pool=db_pool if SCORE_CACHE_PERSIST else None)
+        self.resume_cache = ResumeCache(
+            parser_version(extraction_pool.max_pages, extraction_pool.max_chars), db_pool
+        ) if RESUME_CACHE_ENABLED else None
+        
+    def parse_resume(self, source, filename=None):
+        """Parse resume and extract key information
+        
+        source is a path, bytes or binary stream; filename picks the format
+        when source is not a path. PDF and DOCX text is extracted in the
+        resume process pool, and reading stops once the skills and experience
+        level are settled or the page/character budget is spent. Results for
+        PDF and DOCX uploads are cached by content hash.
+        """
+        if filename is None and isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        if self.resume_cache is None or not is_offloaded(filename):
+            return extraction_pool.parse(source, filename)
+        data = read_source(source)
+        key = self.resume_cache.key(data, filename)
+        result = self.resume_cache.get(key, len(data))
+        if result is None:
+            result = extraction_pool.parse(data, filename)
+            self.resume_cache.put(key, result, len(data))
+        return result
     
     def detect_role_category(self, job_role):
-        """Detect the specific role category based on job title"""
-        job_role_lower = job_role.lower()
-        
-        # Salesforce roles
-        if 'salesforce' in job_role_lower:
-            if any(keyword in job_role_lower for keyword in ['developer', 'dev', 'apex', 'lightning']):
-                return 'salesforce_developer'
-            else:
-                return 'salesforce_admin'
-        
-        # Analyst roles
-        if any(keyword in job_role_lower for keyword in ['analyst', 'business analyst', 'program analyst', 'systems analyst']):
-            return 'program_analyst'
-        
-        # Full Stack Developer roles
-        if 'full stack' in job_role_lower or 'fullstack' in job_role_lower:
-            if any(keyword in job_role_lower for keyword in ['java', 'spring', 'hibernate']):
-                return 'java_fullstack'
-            elif any(keyword in job_role_lower for keyword in ['python', 'django', 'flask']):
-                return 'python_fullstack'
-            elif any(keyword in job_role_lower for keyword in ['.net', 'dotnet', 'c#', 'asp.net']):
-                return 'dotnet_fullstack'
-        
-        # Technology-specific roles
-        if any(keyword in job_role_lower for keyword in ['java', 'spring', 'hibernate']) and 'developer' in job_role_lower:
-            return 'java_fullstack'
-        elif any(keyword in job_role_lower for keyword in ['python', 'django', 'flask']) and 'developer' in job_role_lower:
-            return 'python_fullstack'
-        elif any(keyword in job_role_lower for keyword in ['.net', 'dotnet', 'c#', 'asp.net']) and 'developer' in job_role_lower:
-            return 'dotnet_fullstack'
-        
-        return None
-
+        """Detect the specific role category based on job title (rules in data/role_rules.json)"""
+        return role_classifier.detect(job_role)
+    
     def generate_questions(self, resume_data, job_role, num_questions=5):
         """Generate interview questions based on resume and job role"""
         experience_level = resume_data['experience_level']
@@ -406,13 +196,12 @@ class SkillMateAI:
             coding_level = 'intermediate'
         
         all_questions = []
+        bank = self.question_bank.current()
         
         # If we have role-specific questions, use them
-        if role_category and role_category in self.question_bank['role_specific']:
-            role_questions = random.sample(
-                self.question_bank['role_specific'][role_category],
-                k=min(3, len(self.question_bank['role_specific'][role_category]))
-            )
+        role_bank = bank.get('role_specific', role_category)
+        if role_category and role_bank:
+            role_questions = random.sample(role_bank, k=min(3, len(role_bank)))
             
             # Format role-specific questions
             for i, q in enumerate(role_questions):
@@ -424,10 +213,8 @@ class SkillMateAI:
                 })
         else:
             # Fallback to general coding questions
-            coding_questions = random.sample(
-                self.question_bank['coding'][coding_level], 
-                k=min(3, len(self.question_bank['coding'][coding_level]))
-            )
+            coding_bank = bank.get('coding', coding_level)
+            coding_questions = random.sample(coding_bank, k=min(3, len(coding_bank)))
             
             # Format coding questions
             for i, q in enumerate(coding_questions):
@@ -453,8 +240,8 @@ class SkillMateAI:
         
         selected_scenarios = []
         for category in scenario_categories[:2]:  # Take first 2 categories
-            if category in self.question_bank['scenario']:
-                questions = self.question_bank['scenario'][category]
+            questions = bank.get('scenario', category)
+            if questions:
                 selected_scenarios.extend(
                     random.sample(questions, k=1)
                 )
@@ -470,8 +257,33 @@ class SkillMateAI:
         
         return all_questions[:num_questions]  # Ensure we don't exceed requested number
     
-    def score_answer(self, question, answer, question_type):
-        """Score the answer using NLP techniques"""
+    def _score_cache_key(self, answer, question_type):
+        # Keyed on the exact text: the scorer (length checks, sentences,
+        # sentiment) sees case and whitespace, so answers differing only in
+        # them can score differently
+        return self.score_cache.key(question_type, sentiment_batcher.available, answer or '')
+    
+    def _expects_sentiment(self, answer):
+        """Whether _score_answer applies a sentiment adjustment to this answer"""
+        return sentiment_batcher.available and bool(answer) and len(answer.strip()) >= 10
+    
+    def score_answer(self, question, answer, question_type, sentiment=None):
+        """Score the answer, reusing the cached result of an identical answer"""
+        key = self._score_cache_key(answer, question_type)
+        result = self.score_cache.get(key)
+        if result is None:
+            expects_sentiment = self._expects_sentiment(answer)
+            if sentiment is None and expects_sentiment:
+                sentiment = sentiment_batcher.analyze(answer)
+            result = self._score_answer(question, answer, question_type, sentiment)
+            # A timed-out or failed sentiment call scored without the adjustment;
+            # caching that would keep the wrong score for the whole TTL
+            if sentiment is not None or not expects_sentiment:
+                self.score_cache.put(key, result)
+        return dict(result, areas_to_improve=list(result['areas_to_improve']))
+    
+    def _score_answer(self, question, answer, question_type, sentiment=None):
+        """Score the answer using NLP techniques (sentiment is fetched by the caller; None scores without it)"""
         if not answer or len(answer.strip()) < 10:
             return {
                 'score': 0,
@@ -495,11 +307,12 @@ class SkillMateAI:
         else:
             areas_to_improve.append("Increase response length and detail")
         
+        # The answer is lowercased once and each keyword is looked up at most once
+        keywords = self.keyword_matcher.match(answer)
+        
         # Technical keywords for coding questions
         if question_type == 'coding':
-            technical_keywords = ['algorithm', 'complexity', 'time', 'space', 'data structure', 
-                                'variable', 'function', 'loop', 'condition', 'efficiency']
-            keyword_count = sum(1 for keyword in technical_keywords if keyword.lower() in answer.lower())
+            keyword_count = keywords.count('coding')
             
             if keyword_count >= 3:
                 score += 30
@@ -512,30 +325,10 @@ class SkillMateAI:
         
         # Role-specific technical scoring
         elif question_type == 'role_specific':
-            # Define role-specific keywords
-            role_keywords = {
-                'salesforce': ['apex', 'soql', 'trigger', 'workflow', 'validation', 'lightning', 'component', 'process builder', 'flow'],
-                'java': ['spring', 'hibernate', 'jpa', 'microservices', 'rest api', 'junit', 'maven', 'dependency injection'],
-                'python': ['django', 'flask', 'orm', 'serializer', 'middleware', 'celery', 'rest framework', 'async'],
-                'dotnet': ['asp.net', 'entity framework', 'mvc', 'web api', 'dependency injection', 'middleware', 'linq'],
-                'analyst': ['requirements', 'stakeholder', 'user story', 'acceptance criteria', 'gap analysis', 'process', 'kpi']
-            }
-            
-            # Determine which keywords to use based on the question context
-            applicable_keywords = []
-            answer_lower = answer.lower()
-            
-            for role, keywords in role_keywords.items():
-                if any(keyword in answer_lower for keyword in keywords):
-                    applicable_keywords.extend(keywords)
-                    break
-            
-            # If no specific role keywords found, use general technical terms
-            if not applicable_keywords:
-                applicable_keywords = ['solution', 'implementation', 'design', 'architecture', 'best practice', 
-                                     'optimization', 'integration', 'configuration', 'development', 'testing']
-            
-            keyword_count = sum(1 for keyword in applicable_keywords if keyword in answer_lower)
+            # Use the first role whose keywords appear in the answer,
+            # falling back to general technical terms
+            keyword_count = next((keywords.count(role) for role in self.role_keywords if keywords.count(role)),
+                                 keywords.count('general'))
             
             if keyword_count >= 4:
                 score += 35
@@ -551,9 +344,7 @@ class SkillMateAI:
         
         # Scenario-based scoring
         elif question_type == 'scenario':
-            scenario_keywords = ['experience', 'situation', 'approach', 'result', 'learned', 
-                               'challenge', 'solution', 'team', 'communication']
-            keyword_count = sum(1 for keyword in scenario_keywords if keyword.lower() in answer.lower())
+            keyword_count = keywords.count('scenario')
             
             if keyword_count >= 3:
                 score += 30
@@ -573,16 +364,12 @@ class SkillMateAI:
             areas_to_improve.append("Improve response structure and organization")
         
         # Sentiment analysis (if available)
-        if sentiment_analyzer:
-            try:
-                sentiment = sentiment_analyzer(answer[:512])  # Limit text length
-                if sentiment[0]['label'] == 'POSITIVE' and sentiment[0]['score'] > 0.6:
-                    score += 15
-                    feedback_points.append("Positive and confident tone")
-                elif sentiment[0]['score'] < 0.3:
-                    areas_to_improve.append("Show more confidence in your response")
-            except:
-                pass
+        if sentiment:
+            if sentiment['label'] == 'POSITIVE' and sentiment['score'] > 0.6:
+                score += 15
+                feedback_points.append("Positive and confident tone")
+            elif sentiment['score'] < 0.3:
+                areas_to_improve.append("Show more confidence in your response")
         
         # Cap score at 100
         score = min(score, 100)
@@ -605,6 +392,38 @@ class SkillMateAI:
             'areas_to_improve': areas_to_improve
         }
 
+    def score_answers(self, items):
+        """Score several (question, answer, question_type) items at once
+        
+        Equivalent answers to questions of the same type are scored once and
+        share the result, and previously scored answers come from the cache.
+        """
+        items = [(question, answer, question_type, self._score_cache_key(answer, question_type))
+                 for question, answer, question_type in items]
+        
+        scored = {}
+        for _, _, _, key in items:
+            if key not in scored:
+                scored[key] = self.score_cache.get(key)
+        misses = {key: (question, answer, question_type)
+                  for question, answer, question_type, key in items if scored[key] is None}
+        
+        # Queue the sentiment of every uncached answer together so they run as one batch
+        sentiments = {}
+        if misses and sentiment_batcher.available:
+            texts = list(dict.fromkeys(answer for _, answer, _ in misses.values() if self._expects_sentiment(answer)))
+            sentiments = dict(zip(texts, sentiment_batcher.analyze_many(texts)))
+        
+        for key, (question, answer, question_type) in misses.items():
+            sentiment = sentiments.get(answer)
+            scored[key] = self._score_answer(question, answer, question_type, sentiment)
+            # Answers whose sentiment call timed out or failed are re-scored next time
+            if sentiment is not None or not self._expects_sentiment(answer):
+                self.score_cache.put(key, scored[key])
+        
+        return [dict(scored[key], areas_to_improve=list(scored[key]['areas_to_improve']))
+                for _, _, _, key in items]
+
 # Initialize AI system
 skillmate_ai = SkillMateAI()
 
@@ -631,7 +450,7 @@ def interview():
 @login_required
 def review():
     # Get user's interview sessions
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute('''
         SELECT session_id, job_role, created_at 
@@ -640,7 +459,6 @@ def review():
         ORDER BY created_at DESC
     ''', (session['user_id'],))
     sessions = cursor.fetchall()
-    conn.close()
     return render_template('review.html', sessions=sessions)
 
 @app.route('/help')
@@ -657,7 +475,7 @@ def profile():
         return redirect(url_for('home'))
     
     # Get user's interview history
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute('''
         SELECT session_id, job_role, overall_score, created_at, status 
@@ -677,7 +495,6 @@ def profile():
     ''', (session['user_id'],))
     interview_requests = cursor.fetchall()
     
-    conn.close()
     return render_template('profile.html', user=user_info, interview_history=interview_history, interview_requests=interview_requests)
 
 @app.route('/profile/edit', methods=['GET', 'POST'])
@@ -691,7 +508,7 @@ def edit_profile():
         skills = request.form.get('skills')
         bio = request.form.get('bio')
         
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE users 
@@ -699,7 +516,6 @@ def edit_profile():
             WHERE id = ?
         ''', (phone, company, position, experience_years, skills, bio, session['user_id']))
         conn.commit()
-        conn.close()
         
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('profile'))
@@ -715,22 +531,23 @@ def recruiter_dashboard():
         flash('Access denied. Recruiter privileges required.', 'error')
         return redirect(url_for('home'))
     
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     
-    # Get all users with their latest interview scores
+    # Candidate rows are loaded page by page from /api/recruiter/candidates;
+    # the page itself only needs the headline counts
     cursor.execute('''
-        SELECT u.id, u.full_name, u.email, u.company, u.position,
-               MAX(is_session.overall_score) as best_score,
-               COUNT(is_session.id) as total_interviews,
-               u.created_at, u.experience_years
+        SELECT COUNT(*), COUNT(cs.best_score), COALESCE(SUM(cs.best_score >= 80), 0)
         FROM users u
-        LEFT JOIN interview_sessions is_session ON u.id = is_session.user_id
+        LEFT JOIN candidate_stats cs ON cs.user_id = u.id
         WHERE u.role = 'user'
-        GROUP BY u.id
-        ORDER BY CASE WHEN best_score IS NULL THEN 1 ELSE 0 END, best_score DESC
     ''')
-    all_users = cursor.fetchall()
+    total_candidates, scored_candidates, high_performers = cursor.fetchone()
+    candidate_totals = {
+        'total': total_candidates,
+        'scored': scored_candidates,
+        'high_performers': high_performers
+    }
     
     # Get pending interview requests
     cursor.execute('''
@@ -743,8 +560,185 @@ def recruiter_dashboard():
     ''')
     pending_requests = cursor.fetchall()
     
-    conn.close()
-    return render_template('recruiter_dashboard.html', users=all_users, pending_requests=pending_requests)
+    return render_template('recruiter_dashboard.html', candidate_totals=candidate_totals, pending_requests=pending_requests)
+
+# Sort keys for the candidate list. Each expression matches an index created in
+# migration 5 exactly; NULLs are folded into a sentinel so cursors stay comparable.
+CANDIDATE_SORT_KEYS = {
+    'best_score': 'COALESCE(cs.best_score, -1)',
+    'latest_score': 'COALESCE(cs.latest_score, -1)',
+    'last_activity': "COALESCE(cs.last_activity, '')",
+    'total_interviews': 'cs.total_interviews',
+}
+CANDIDATE_PAGE_SIZE = 50
+CANDIDATE_MAX_PAGE_SIZE = 200
+
+def encode_cursor(values):
+    """Encode keyset position values as an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor_value):
+    """Decode a cursor produced by encode_cursor, or raise ValueError"""
+    padded = cursor_value + '=' * (-len(cursor_value) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError('Invalid cursor')
+    # [sort, order, last sort key, last user id]; anything else was not made by encode_cursor
+    if (not isinstance(values, list) or len(values) != 4
+            or not isinstance(values[0], str) or not isinstance(values[1], str)
+            or not isinstance(values[2], (str, int, float, type(None)))
+            or not isinstance(values[3], int) or isinstance(values[3], bool)):
+        raise ValueError('Invalid cursor')
+    return values
+
+def _int_arg(name):
+    """Optional integer query parameter"""
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+def _like_pattern(value):
+    """Substring LIKE pattern with wildcards in the user's input escaped"""
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+@app.route('/api/recruiter/candidates')
+@login_required
+def get_recruiter_candidates():
+    """Keyset-paginated candidate list with server-side filters and sorting"""
+    try:
+        if session.get('user_role') != 'recruiter':
+            return jsonify({'error': 'Access denied'}), 403
+        
+        sort = request.args.get('sort', 'best_score')
+        order = request.args.get('order', 'desc').lower()
+        if sort not in CANDIDATE_SORT_KEYS:
+            return jsonify({'error': f'Unsupported sort key: {sort}'}), 400
+        if order not in ('asc', 'desc'):
+            return jsonify({'error': 'order must be asc or desc'}), 400
+        sort_expr = CANDIDATE_SORT_KEYS[sort]
+        
+        try:
+            limit = _int_arg('limit') or CANDIDATE_PAGE_SIZE
+            min_score = _int_arg('min_score')
+            max_score = _int_arg('max_score')
+            min_experience = _int_arg('min_experience')
+            max_experience = _int_arg('max_experience')
+            min_interviews = _int_arg('min_interviews')
+            max_interviews = _int_arg('max_interviews')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        limit = max(1, min(limit, CANDIDATE_MAX_PAGE_SIZE))
+        
+        conditions = ["u.role = 'user'"]
+        params = []
+        
+        # Score bounds are expressed on the indexed key so a best_score sort
+        # turns them into an index range instead of a filter
+        if min_score is not None:
+            conditions.append('COALESCE(cs.best_score, -1) >= ?')
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append('COALESCE(cs.best_score, -1) <= ?')
+            params.append(max_score)
+        has_score = request.args.get('has_score')
+        if has_score in ('0', 'false'):
+            conditions.append('cs.best_score IS NULL')
+        elif has_score in ('1', 'true'):
+            conditions.append('cs.best_score IS NOT NULL')
+        if min_experience is not None:
+            conditions.append('COALESCE(u.experience_years, 0) >= ?')
+            params.append(min_experience)
+        if max_experience is not None:
+            conditions.append('COALESCE(u.experience_years, 0) <= ?')
+            params.append(max_experience)
+        if min_interviews is not None:
+            conditions.append('cs.total_interviews >= ?')
+            params.append(min_interviews)
+        if max_interviews is not None:
+            conditions.append('cs.total_interviews <= ?')
+            params.append(max_interviews)
+        for field in ('company', 'position'):
+            value = request.args.get(field, '').strip()
+            if value:
+                conditions.append(f"u.{field} LIKE ? ESCAPE '\\'")
+                params.append(_like_pattern(value))
+        name = request.args.get('name', '').strip()
+        if name:
+            conditions.append("(u.full_name LIKE ? ESCAPE '\\' OR u.email LIKE ? ESCAPE '\\')")
+            params.extend([_like_pattern(name), _like_pattern(name)])
+        joined = request.args.get('joined', '').strip()
+        if joined:
+            conditions.append("u.created_at >= date(?) AND u.created_at < date(?, '+1 day')")
+            params.extend([joined, joined])
+        
+        cursor_value = request.args.get('cursor')
+        if cursor_value:
+            try:
+                cursor_sort, cursor_order, last_key, last_id = decode_cursor(cursor_value)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if cursor_sort != sort or cursor_order != order:
+                return jsonify({'error': 'Cursor does not match the requested sort'}), 400
+            # Written as a range on the indexed key plus a tie-breaker on user_id;
+            # SQLite does not use expression indexes for row-value comparisons
+            if order == 'desc':
+                conditions.append(f'{sort_expr} <= ? AND ({sort_expr} < ? OR cs.user_id < ?)')
+            else:
+                conditions.append(f'{sort_expr} >= ? AND ({sort_expr} > ? OR cs.user_id > ?)')
+            params.extend([last_key, last_key, last_id])
+        
+        direction = 'DESC' if order == 'desc' else 'ASC'
+        conn = get_db()
+        cursor = conn.cursor()
+        # CROSS JOIN pins candidate_stats as the outer table so SQLite walks the sort index
+        cursor.execute(f'''
+            SELECT u.id, u.full_name, u.email, u.company, u.position,
+                   cs.best_score, cs.latest_score, cs.total_interviews, cs.last_activity,
+                   u.created_at, u.experience_years, {sort_expr}
+            FROM candidate_stats cs
+            CROSS JOIN users u ON u.id = cs.user_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {sort_expr} {direction}, cs.user_id {direction}
+            LIMIT ?
+        ''', params + [limit + 1])
+        rows = cursor.fetchall()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        candidates = []
+        for row in rows:
+            candidates.append({
+                'id': row[0],
+                'full_name': row[1],
+                'email': row[2],
+                'company': row[3],
+                'position': row[4],
+                'best_score': row[5],
+                'latest_score': row[6],
+                'total_interviews': row[7],
+                'last_activity': row[8],
+                'created_at': row[9],
+                'experience_years': row[10]
+            })
+        
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = encode_cursor([sort, order, rows[-1][11], rows[-1][0]])
+        
+        return jsonify({
+            'candidates': candidates,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/recruiter/notifications')
 @login_required
@@ -755,7 +749,7 @@ def recruiter_notifications():
         flash('Access denied. Recruiter privileges required.', 'error')
         return redirect(url_for('home'))
     
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     # Get all notifications for the recruiter
@@ -767,7 +761,6 @@ def recruiter_notifications():
     ''', (session['user_id'],))
     
     notifications = cursor.fetchall()
-    conn.close()
     
     # Format notifications for template
     formatted_notifications = []
@@ -797,14 +790,16 @@ def schedule_interview():
         flash('Please fill in all required fields', 'error')
         return redirect(url_for('profile'))
     
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute('''
         INSERT INTO interview_requests (user_id, session_id, preferred_date, preferred_time, message)
         VALUES (?, ?, ?, ?, ?)
     ''', (session['user_id'], session_id, preferred_date, preferred_time, message))
     conn.commit()
-    conn.close()
+    
+    # Let open recruiter dashboards pick up the new pending request
+    notification_broker.publish_role('recruiter', 'interview_request', {'session_id': session_id})
     
     flash('Interview request submitted successfully!', 'success')
     return redirect(url_for('profile'))
@@ -820,7 +815,7 @@ def manage_interview_request(request_id):
         flash('Access denied. Recruiter privileges required.', 'error')
         return redirect(url_for('home'))
     
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     if action == 'approve':
@@ -842,7 +837,6 @@ def manage_interview_request(request_id):
         flash('Interview request rejected.', 'success')
     
     conn.commit()
-    conn.close()
     
     # Send email notification
     try:
@@ -861,7 +855,7 @@ def get_candidate_interview_requests(candidate_identifier):
         if session.get('user_role') != 'recruiter':
             return jsonify({'error': 'Access denied'}), 403
         
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Try to find user by ID first, then by email
@@ -884,7 +878,6 @@ def get_candidate_interview_requests(candidate_identifier):
         ''', (user_value,))
         
         requests = cursor.fetchall()
-        conn.close()
         
         interview_requests = []
         for request in requests:
@@ -912,12 +905,24 @@ def get_candidate_interview_requests(candidate_identifier):
     except Exception as e:
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+def notification_to_dict(row):
+    """Convert an (id, type, title, message, data, is_read, created_at) row for JSON"""
+    return {
+        'id': row[0],
+        'type': row[1],
+        'title': row[2],
+        'message': row[3],
+        'data': json.loads(row[4]) if row[4] else {},
+        'is_read': bool(row[5]),
+        'created_at': row[6]
+    }
+
 @app.route('/api/notifications')
 @login_required
 def get_notifications():
     """Get notifications for the current user"""
     try:
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -928,61 +933,104 @@ def get_notifications():
             LIMIT 50
         ''', (session['user_id'],))
         
-        notifications = []
-        for row in cursor.fetchall():
-            notifications.append({
-                'id': row[0],
-                'type': row[1],
-                'title': row[2],
-                'message': row[3],
-                'data': json.loads(row[4]) if row[4] else {},
-                'is_read': bool(row[5]),
-                'created_at': row[6]
-            })
+        notifications = [notification_to_dict(row) for row in cursor.fetchall()]
         
-        conn.close()
         return jsonify({'notifications': notifications})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def get_unread_count(user_id):
+    """Unread notification count, served from the cache and rebuilt on a miss"""
+    count = unread_counts.get(user_id)
+    if count is None:
+        token = unread_counts.token()
+        cursor = get_db().cursor()
+        cursor.execute('''
+            SELECT COUNT(*) FROM notifications 
+            WHERE user_id = ? AND is_read = FALSE
+        ''', (user_id,))
+        count = cursor.fetchone()[0]
+        unread_counts.fill(user_id, count, token)
+    return count
+
 @app.route('/api/notifications/count')
 @login_required
 def get_notification_count():
     """Get unread notification count"""
     try:
-        conn = sqlite3.connect('talentmate.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT COUNT(*) FROM notifications 
-            WHERE user_id = ? AND is_read = FALSE
-        ''', (session['user_id'],))
+        return jsonify({'count': get_unread_count(session['user_id'])})
         
-        count = cursor.fetchone()[0]
-        conn.close()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/notifications/stream')
+@login_required
+def notification_stream():
+    """Server-Sent Events stream of new notifications for the current user"""
+    user_id = session['user_id']
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    # Subscribe before reading the database so nothing published in between is lost
+    try:
+        subscription = notification_broker.subscribe(user_id, session.get('user_role'))
+    except TooManyStreams as e:
+        return jsonify({'error': str(e), 'fallback': 'poll'}), 429
+    
+    try:
+        initial = [format_sse('count', {'count': get_unread_count(user_id)})]
         
-        return jsonify({'count': count})
+        conn = get_db()
+        cursor = conn.cursor()
         
+        # Replay whatever the client missed while it was disconnected
+        if last_event_id is not None:
+            cursor.execute('''
+                SELECT id, type, title, message, data, is_read, created_at
+                FROM notifications 
+                WHERE user_id = ? AND id > ?
+                ORDER BY id
+                LIMIT 100
+            ''', (user_id, last_event_id))
+            for row in cursor.fetchall():
+                initial.append(format_sse('notification', notification_to_dict(row), row[0]))
+                last_event_id = row[0]
     except Exception as e:
+        notification_broker.unsubscribe(subscription)
         return jsonify({'error': str(e)}), 500
+    
+    response = Response(subscription.stream(initial, last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Covers clients that disconnect before the generator ever starts
+    response.call_on_close(lambda: notification_broker.unsubscribe(subscription))
+    return response
 
 @app.route('/api/notifications/<int:notification_id>/read', methods=['POST'])
 @login_required
 def mark_notification_read(notification_id):
     """Mark a notification as read"""
     try:
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            UPDATE notifications 
-            SET is_read = TRUE, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ? AND user_id = ?
-        ''', (notification_id, session['user_id']))
-        
-        conn.commit()
-        conn.close()
+        # A count loaded while the update commits must not be cached before it is adjusted
+        with unread_counts.writing():
+            cursor.execute('''
+                UPDATE notifications 
+                SET is_read = TRUE, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND user_id = ? AND is_read = FALSE
+            ''', (notification_id, session['user_id']))
+            
+            conn.commit()
+            if cursor.rowcount:
+                unread_counts.adjust(session['user_id'], -1)
+        if cursor.rowcount:
+            notification_broker.publish(session['user_id'], 'read', {'id': notification_id})
         
         return jsonify({'success': True})
         
@@ -994,7 +1042,7 @@ def mark_notification_read(notification_id):
 def mark_all_notifications_read():
     """Mark all notifications as read for the current user"""
     try:
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -1004,7 +1052,8 @@ def mark_all_notifications_read():
         ''', (session['user_id'],))
         
         conn.commit()
-        conn.close()
+        unread_counts.invalidate(session['user_id'])
+        notification_broker.publish(session['user_id'], 'count', {'count': 0})
         
         return jsonify({'success': True})
         
@@ -1012,39 +1061,8 @@ def mark_all_notifications_read():
         return jsonify({'error': str(e)}), 500
 
 def create_notification(user_id, notification_type, title, message, data=None):
-    """Helper function to create a notification"""
-    import time
-    max_retries = 3
-    retry_delay = 0.1
-    
-    for attempt in range(max_retries):
-        try:
-            conn = sqlite3.connect('talentmate.db', timeout=10.0)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO notifications (user_id, type, title, message, data)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, notification_type, title, message, json.dumps(data) if data else None))
-            
-            conn.commit()
-            conn.close()
-            return True
-            
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e) and attempt < max_retries - 1:
-                print(f"Database locked on attempt {attempt + 1}, retrying in {retry_delay}s...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-                continue
-            else:
-                print(f"Error creating notification: {e}")
-                return False
-        except Exception as e:
-            print(f"Error creating notification: {e}")
-            return False
-    
-    return False
+    """Helper function to create a notification (written in the background)"""
+    return notification_writer.submit(user_id, notification_type, title, message, data)
 
 @app.route('/api/propose-interview', methods=['POST'])
 @login_required
@@ -1064,7 +1082,7 @@ def propose_interview():
         if not all([candidate_id, proposed_date, proposed_time]):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Create an interview request record
@@ -1077,7 +1095,6 @@ def propose_interview():
         
         request_id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         # Create notification for the candidate
         notification_title = "Interview Invitation"
@@ -1115,7 +1132,7 @@ def respond_interview():
         if not all([request_id, response]):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Get the interview request details
@@ -1144,7 +1161,6 @@ def respond_interview():
             ''', (proposed_date, proposed_time, request_id))
             
             conn.commit()
-            conn.close()
             
             # Notify recruiter (after closing the connection)
             create_notification(
@@ -1166,7 +1182,6 @@ def respond_interview():
             ''', (request_id,))
             
             conn.commit()
-            conn.close()
             
             # Notify recruiter (after closing the connection)
             create_notification(
@@ -1196,7 +1211,6 @@ def respond_interview():
             ''', (alternative_date, alternative_time, message, request_id))
             
             conn.commit()
-            conn.close()
             
             # Notify recruiter (after closing the connection)
             create_notification(
@@ -1235,7 +1249,7 @@ def accept_alternative():
         if not all([request_id, final_date, final_time]):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Update the interview request to accepted with final date/time
@@ -1258,7 +1272,6 @@ def accept_alternative():
         candidate_id = result[0]
         
         conn.commit()
-        conn.close()
         
         # Create notification for the candidate
         create_notification(
@@ -1292,7 +1305,7 @@ def reject_alternative():
         if not request_id:
             return jsonify({'error': 'Missing request ID'}), 400
         
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
         
         # Update the interview request to rejected
@@ -1315,7 +1328,6 @@ def reject_alternative():
         candidate_id = result[0]
         
         conn.commit()
-        conn.close()
         
         # Create notification for the candidate
         create_notification(
@@ -1334,7 +1346,7 @@ def reject_alternative():
 
 def send_interview_email(request_id, action, scheduled_date=None):
     """Send email notification for interview acceptance/rejection"""
-    conn = sqlite3.connect('talentmate.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     # Get request and user details
@@ -1348,7 +1360,6 @@ def send_interview_email(request_id, action, scheduled_date=None):
     ''', (request_id,))
     
     result = cursor.fetchone()
-    conn.close()
     
     if not result:
         return
@@ -1459,19 +1470,22 @@ def upload_resume():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Parse resume
-        resume_data = skillmate_ai.parse_resume(filepath)
+        # Parse straight from the upload stream (spooled to a temp file only when large)
+        try:
+            resume_data = skillmate_ai.parse_resume(file.stream, file.filename)
+        except ExtractionPoolBusy as e:
+            return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+        except ExtractionError as e:
+            return jsonify({'error': str(e)}), 422
+        finally:
+            file.close()
         
         # Generate questions
         questions = skillmate_ai.generate_questions(resume_data, job_role)
         
         # Store session data (in production, use proper session management)
-        session_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        # Timestamp prefix keeps ids sortable; the suffix keeps uploads in the same second apart
+        session_id = f'{datetime.now().strftime("%Y%m%d%H%M%S")}{secrets.token_hex(3)}'
         session_data = {
             'session_id': session_id,
             'resume_data': resume_data,
@@ -1482,17 +1496,17 @@ def upload_resume():
         }
         
         # Save session data
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
+        # The resume text is stored once, compressed; the session row keeps a small summary
+        resume_summary, resume_text_hash = slim_resume_data(conn, resume_data)
         cursor.execute('''
-            INSERT INTO interview_sessions (user_id, session_id, job_role, resume_data, questions, answers, scores)
+            INSERT INTO interview_sessions (user_id, session_id, job_role, resume_data, resume_text_hash, questions, question_count)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (session['user_id'], session_id, job_role, json.dumps(resume_data), json.dumps(questions), json.dumps({}), json.dumps({})))
+        ''', (session['user_id'], session_id, job_role, json.dumps(resume_summary), resume_text_hash,
+              json.dumps(questions), len(questions)))
+        save_session_results(conn, session_id, SessionResults.compute(questions, 0, {}, resume_skills(resume_data)))
         conn.commit()
-        conn.close()
-        
-        # Clean up uploaded file
-        os.remove(filepath)
         
         return jsonify({
             'session_id': session_id,
@@ -1506,6 +1520,41 @@ def upload_resume():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def save_scored_answers(cursor, session_id, questions_data, rows):
+    """Upsert (question_id, question_type, answer, score_result) rows, refresh the
+    session's results summary and return its (overall_score, answered_count);
+    the caller commits"""
+    # One row per answer and per score; the session_scores triggers keep
+    # interview_sessions.overall_score up to date
+    cursor.executemany('''
+        INSERT INTO session_answers (session_id, question_id, answer)
+        VALUES (?, ?, ?)
+        ON CONFLICT (session_id, question_id)
+        DO UPDATE SET answer = excluded.answer, answered_at = CURRENT_TIMESTAMP
+    ''', [(session_id, question_id, answer) for question_id, _, answer, _ in rows])
+    cursor.executemany('''
+        INSERT INTO session_scores (session_id, question_id, question_type, score, feedback, areas_to_improve)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (session_id, question_id)
+        DO UPDATE SET score = excluded.score, feedback = excluded.feedback,
+                      areas_to_improve = excluded.areas_to_improve
+    ''', [(session_id, question_id, question_type, result['score'], result['feedback'], json.dumps(result['areas_to_improve']))
+          for question_id, question_type, _, result in rows])
+    # Summarized here, in the same transaction, so reads never recompute it
+    results = refresh_session_results(cursor.connection, session_id, questions_data)
+    cursor.execute('SELECT overall_score FROM interview_sessions WHERE session_id = ?', (session_id,))
+    return cursor.fetchone()[0], results.answered_count
+
+def notify_interview_completed(user_id, session_id, overall_score):
+    """Tell the candidate their results are ready"""
+    create_notification(
+        user_id,
+        'interview_result',
+        'Interview Results Available',
+        f'Your interview has been completed with a score of {overall_score}%. Click to view your detailed results.',
+        {'session_id': session_id, 'score': overall_score}
+    )
+
 @app.route('/submit-answer', methods=['POST'])
 @login_required
 def submit_answer():
@@ -1516,19 +1565,16 @@ def submit_answer():
         question_id = data.get('question_id')
         answer = data.get('answer', '')
         
-        # Load session data
-        conn = sqlite3.connect('talentmate.db')
+        # Load session questions (answers and scores live in their own tables)
+        conn = get_db()
         cursor = conn.cursor()
-        cursor.execute('SELECT questions, answers, scores FROM interview_sessions WHERE session_id = ? AND user_id = ?', (session_id, session['user_id']))
+        cursor.execute('SELECT questions FROM interview_sessions WHERE session_id = ? AND user_id = ?', (session_id, session['user_id']))
         session_data = cursor.fetchone()
-        conn.close()
 
         if not session_data:
             return jsonify({'error': 'Session not found'}), 404
         
         questions_data = json.loads(session_data[0])
-        answers_data = json.loads(session_data[1])
-        scores_data = json.loads(session_data[2])
         
         # Find the question
         question_data = None
@@ -1547,34 +1593,14 @@ def submit_answer():
             question_data['type']
         )
         
-        # Store answer and score
-        answers_data[question_id] = answer
-        scores_data[question_id] = score_result
-        
-        # Calculate overall score
-        scores_list = [score_data['score'] for score_data in scores_data.values() if isinstance(score_data, dict) and 'score' in score_data]
-        overall_score = round(sum(scores_list) / len(scores_list)) if scores_list else None
-        
-        # Save updated session data
-        conn = sqlite3.connect('talentmate.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE interview_sessions
-            SET questions = ?, answers = ?, scores = ?, overall_score = ?
-            WHERE session_id = ? AND user_id = ?
-        ''', (json.dumps(questions_data), json.dumps(answers_data), json.dumps(scores_data), overall_score, session_id, session['user_id']))
+        # Store answer and score as one row each
+        overall_score, answered_count = save_scored_answers(
+            cursor, session_id, questions_data, [(question_id, question_data['type'], answer, score_result)])
         conn.commit()
-        conn.close()
         
         # Create notification if this is the final question (all questions answered)
-        if len(answers_data) == len(questions_data) and overall_score is not None:
-            create_notification(
-                session['user_id'],
-                'interview_result',
-                'Interview Results Available',
-                f'Your interview has been completed with a score of {overall_score}%. Click to view your detailed results.',
-                {'session_id': session_id, 'score': overall_score}
-            )
+        if answered_count == len(questions_data) and overall_score is not None:
+            notify_interview_completed(session['user_id'], session_id, overall_score)
         
         return jsonify({
             'score': score_result['score'],
@@ -1585,198 +1611,422 @@ def submit_answer():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/get-results/<session_id>')
+@app.route('/submit-answers', methods=['POST'])
 @login_required
-def get_results(session_id):
-    """Get complete interview results"""
+def submit_answers():
+    """Score and store several answers of a session in one request"""
     try:
-        conn = sqlite3.connect('talentmate.db')
+        data = request.get_json(silent=True) or {}
+        session_id = data.get('session_id')
+        answers = data.get('answers')
+        
+        if not isinstance(answers, list) or not answers:
+            return jsonify({'error': 'answers must be a non-empty list of {question_id, answer}'}), 400
+        
+        conn = get_db()
         cursor = conn.cursor()
-        cursor.execute('SELECT questions, answers, scores, job_role, resume_data FROM interview_sessions WHERE session_id = ? AND user_id = ?', (session_id, session['user_id']))
+        cursor.execute('SELECT questions FROM interview_sessions WHERE session_id = ? AND user_id = ?', (session_id, session['user_id']))
         session_data = cursor.fetchone()
-        conn.close()
 
         if not session_data:
             return jsonify({'error': 'Session not found'}), 404
         
-        # Robust parsing with fallbacks
-        questions_data = json.loads(session_data[0]) if session_data[0] else []
-        answers_data = json.loads(session_data[1]) if session_data[1] else {}
-        scores_data = json.loads(session_data[2]) if session_data[2] else {}
-        job_role = session_data[3]
-        resume_data = json.loads(session_data[4]) if session_data[4] else {}
-        
-        # Handle both dict and list formats for scores_data
-        if isinstance(scores_data, dict):
-            scores = list(scores_data.values())
-        elif isinstance(scores_data, list):
-            scores = scores_data
-        else:
-            scores = []
-        
-        # Calculate overall statistics with safe numeric extraction
-        numeric_scores = []
-        for score_data in scores:
-            if isinstance(score_data, dict) and 'score' in score_data:
-                try:
-                    numeric_scores.append(float(score_data['score']))
-                except (ValueError, TypeError):
-                    pass
-            elif isinstance(score_data, (int, float)):
-                numeric_scores.append(float(score_data))
-        
-        if numeric_scores:
-            avg_score = sum(numeric_scores) / len(numeric_scores)
-            max_score = max(numeric_scores)
-            min_score = min(numeric_scores)
-        else:
-            avg_score = max_score = min_score = 0
+        questions_data = json.loads(session_data[0])
+        questions_by_id = {q['id']: q for q in questions_data}
+        
+        # The last answer wins if a question appears more than once
+        submitted = {}
+        for item in answers:
+            # A missing or null answer is scored as empty; anything else must be text
+            if (not isinstance(item, dict) or not isinstance(item.get('question_id'), str)
+                    or not isinstance(item.get('answer') or '', str)):
+                return jsonify({'error': 'answers must be a non-empty list of {question_id, answer}'}), 400
+            submitted[item['question_id']] = item.get('answer') or ''
+        
+        unknown = [question_id for question_id in submitted if question_id not in questions_by_id]
+        if unknown:
+            return jsonify({'error': 'Question not found', 'question_ids': unknown}), 404
+        
+        question_ids = list(submitted)
+        score_results = skillmate_ai.score_answers([
+            (questions_by_id[question_id]['question'], submitted[question_id], questions_by_id[question_id]['type'])
+            for question_id in question_ids
+        ])
+        
+        # Every answer is written in one transaction
+        overall_score, answered_count = save_scored_answers(cursor, session_id, questions_data, [
+            (question_id, questions_by_id[question_id]['type'], submitted[question_id], result)
+            for question_id, result in zip(question_ids, score_results)
+        ])
+        conn.commit()
+        
+        completed = answered_count == len(questions_data) and overall_score is not None
+        if completed:
+            notify_interview_completed(session['user_id'], session_id, overall_score)
+        
+        return jsonify({
+            'results': [
+                {
+                    'question_id': question_id,
+                    'score': result['score'],
+                    'feedback': result['feedback'],
+                    'areas_to_improve': result['areas_to_improve']
+                }
+                for question_id, result in zip(question_ids, score_results)
+            ],
+            'answered_questions': answered_count,
+            'total_questions': len(questions_data),
+            'overall_score': overall_score,
+            'completed': completed
+        })
         
-        # Collect all improvement areas with isinstance check
-        all_improvements = []
-        for score_data in scores:
-            if isinstance(score_data, dict) and 'areas_to_improve' in score_data:
-                if isinstance(score_data['areas_to_improve'], list):
-                    all_improvements.extend(score_data['areas_to_improve'])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/get-results/<session_id>')
+@login_required
+def get_results(session_id):
+    """Get complete interview results"""
+    try:
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT s.job_role, r.session_id, {', '.join('r.' + column for column in RESULT_COLUMNS.split(', '))}
+            FROM interview_sessions s
+            LEFT JOIN session_results r ON r.session_id = s.session_id
+            WHERE s.session_id = ? AND s.user_id = ?
+        ''', (session_id, session['user_id']))
+        row = cursor.fetchone()
+
+        if not row:
+            return jsonify({'error': 'Session not found'}), 404
         
-        # Remove duplicates and get top suggestions
-        unique_improvements = list(set(all_improvements))
+        if row[1] is not None:
+            results = SessionResults.from_row(row[2:])
+        else:
+            # Written by an older worker that did not store summaries
+            results = refresh_session_results(conn, session_id)
+            conn.commit()
         
         return jsonify({
             'session_id': session_id,
-            'overall_score': round(avg_score, 1),
-            'max_score': max_score,
-            'min_score': min_score,
-            'total_questions': len(questions_data) if isinstance(questions_data, (list, dict)) else 0,
-            'answered_questions': len(answers_data) if isinstance(answers_data, (list, dict)) else 0,
-            'detailed_scores': scores_data,
-            'improvement_suggestions': unique_improvements[:5],  # Top 5
-            'job_role': job_role,
-            'skills_identified': resume_data.get('skills', []) if isinstance(resume_data, dict) else []
+            'overall_score': round(results.avg_score, 1) if results.avg_score is not None else 0,
+            'max_score': results.max_score if results.max_score is not None else 0,
+            'min_score': results.min_score if results.min_score is not None else 0,
+            'total_questions': results.total_questions,
+            'answered_questions': results.answered_count,
+            'detailed_scores': results.detailed_scores,
+            'improvement_suggestions': results.improvements,
+            'category_scores': results.category_scores,
+            'job_role': row[0],
+            'skills_identified': results.skills
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/sessions/summary')
+@login_required
+def get_sessions_summary():
+    """Scores of all of the user's sessions in one query (for the review page)"""
+    try:
+        include_categories = request.args.get('categories') in ('1', 'true')
+        conn = get_db()
+        cursor = conn.cursor()
+        if include_categories:
+            cursor.execute('''
+                SELECT s.session_id, s.job_role, s.created_at, s.overall_score, s.question_count,
+                       (SELECT COUNT(*) FROM session_answers a WHERE a.session_id = s.session_id),
+                       sc.question_type, AVG(sc.score)
+                FROM interview_sessions s
+                LEFT JOIN session_scores sc ON sc.session_id = s.session_id
+                WHERE s.user_id = ?
+                GROUP BY s.id, sc.question_type
+                ORDER BY s.created_at DESC
+            ''', (session['user_id'],))
+        else:
+            cursor.execute('''
+                SELECT s.session_id, s.job_role, s.created_at, s.overall_score, s.question_count,
+                       (SELECT COUNT(*) FROM session_answers a WHERE a.session_id = s.session_id)
+                FROM interview_sessions s
+                WHERE s.user_id = ?
+                ORDER BY s.created_at DESC
+            ''', (session['user_id'],))
+        
+        # With categories there is one row per (session, question type); fold them
+        summaries = {}
+        for row in cursor.fetchall():
+            summary = summaries.get(row[0])
+            if summary is None:
+                summary = summaries[row[0]] = {
+                    'session_id': row[0],
+                    'job_role': row[1],
+                    'created_at': row[2],
+                    'overall_score': row[3],
+                    'total_questions': row[4] or 0,
+                    'answered_questions': row[5]
+                }
+                if include_categories:
+                    summary['category_scores'] = {}
+            if include_categories and row[6] is not None:
+                summary['category_scores'][row[6]] = round(row[7], 1)
+        
+        return jsonify({'sessions': list(summaries.values())})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def render_session_report(session_id):
+    """Load a session and render its report into the report cache; returns (pdf, cached)"""
+    with db_pool.connection() as conn:
+        row = conn.execute('''
+            SELECT questions, job_role, resume_data, created_at, scores_version
+            FROM interview_sessions WHERE session_id = ?
+        ''', (session_id,)).fetchone()
+        if row is None:
+            raise ValueError('Session not found')
+        questions_data = json.loads(row[0]) if row[0] else []
+        resume_data = json.loads(row[2]) if row[2] else {}
+        answered_count, scores_data = load_session_scores(conn, session_id, questions_data)
+        current_version = conn.execute('SELECT scores_version FROM interview_sessions WHERE session_id = ?', (session_id,)).fetchone()[0]
+    
+    pdf = render_report(session_id, row[1], row[3], questions_data, answered_count, scores_data, resume_data)
+    # An answer scored while loading may have mixed two versions; such a report is served but not cached
+    cached = current_version == row[4]
+    if cached:
+        report_cache.put(report_cache.key(session_id, row[4]), pdf)
+    return pdf, cached
+
+def render_report_job(session_id):
+    """Render job body: finished jobs are kept for polling, so they only hold a
+    report that could not be cached; cached ones are read back from report_cache"""
+    pdf, cached = render_session_report(session_id)
+    return None if cached else pdf
+
+def report_job_response(job, status_code=200):
+    """JSON status of a render job, with a download link once the report is ready"""
+    data = report_jobs.status(job)
+    if data['status'] == 'done':
+        data['download_url'] = url_for('download_report', session_id=job.session_id)
+    response = jsonify(data)
+    response.status_code = status_code
+    response.headers['Location'] = url_for('get_report_job', job_id=job.id)
+    return response
+
 @app.route('/download-report/<session_id>')
 @login_required
 def download_report(session_id):
-    """Generate and download PDF report"""
+    """Download the PDF report, rendering it only if this scores version is not cached"""
     try:
-        conn = sqlite3.connect('talentmate.db')
+        conn = get_db()
         cursor = conn.cursor()
-        cursor.execute('SELECT questions, answers, scores, job_role, resume_data FROM interview_sessions WHERE session_id = ? AND user_id = ?', (session_id, session['user_id']))
-        session_data = cursor.fetchone()
-        conn.close()
+        cursor.execute('SELECT scores_version, created_at FROM interview_sessions WHERE session_id = ? AND user_id = ?', (session_id, session['user_id']))
+        version_row = cursor.fetchone()
 
-        if not session_data:
+        if not version_row:
             return jsonify({'error': 'Session not found'}), 404
         
-        questions_data = json.loads(session_data[0]) if session_data[0] else []
-        answers_data = json.loads(session_data[1]) if session_data[1] else {}
-        scores_data = json.loads(session_data[2]) if session_data[2] else {}
-        job_role = session_data[3]
-        resume_data = json.loads(session_data[4]) if session_data[4] else {}
-        
-        # Create PDF in memory
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.darkblue
-        )
-        story.append(Paragraph("TalentMate Mock Interview Report", title_style))
-        story.append(Spacer(1, 20))
-        
-        # Session info
-        story.append(Paragraph(f"<b>Session ID:</b> {session_id}", styles['Normal']))
-        story.append(Paragraph(f"<b>Job Role:</b> {job_role}", styles['Normal']))
-        story.append(Paragraph(f"<b>Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Overall performance
-        # Handle both dict and list formats for scores_data
-        if isinstance(scores_data, dict):
-            scores = list(scores_data.values())
-        elif isinstance(scores_data, list):
-            scores = scores_data
+        # The ETag is the cache key, so a revalidation needs no blobs and no rendering
+        etag = report_cache.key(session_id, version_row[0])
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
         else:
-            scores = []
-        
-        # Calculate numeric scores safely
-        numeric_scores = []
-        for score_data in scores:
-            if isinstance(score_data, dict) and 'score' in score_data:
-                try:
-                    numeric_scores.append(float(score_data['score']))
-                except (ValueError, TypeError):
-                    pass
-            elif isinstance(score_data, (int, float)):
-                numeric_scores.append(float(score_data))
-        
-        if numeric_scores:
-            avg_score = sum(numeric_scores) / len(numeric_scores)
-            story.append(Paragraph("Overall Performance", styles['Heading2']))
-            story.append(Paragraph(f"Average Score: {avg_score:.1f}/100", styles['Normal']))
-            story.append(Paragraph(f"Questions Answered: {len(answers_data) if isinstance(answers_data, (list, dict)) else 0}/{len(questions_data) if isinstance(questions_data, (list, dict)) else 0}", styles['Normal']))
-            story.append(Spacer(1, 20))
-        
-        # Detailed question analysis
-        story.append(Paragraph("Detailed Question Analysis", styles['Heading2']))
-        
-        if isinstance(questions_data, list):
-            for i, question in enumerate(questions_data):
-                if isinstance(question, dict) and 'id' in question:
-                    question_id = question['id']
-                    if isinstance(scores_data, dict) and question_id in scores_data:
-                        score_data = scores_data[question_id]
-                        
-                        if isinstance(score_data, dict):
-                            story.append(Paragraph(f"Question {i+1}: {question.get('category', 'General')}", styles['Heading3']))
-                            story.append(Paragraph(f"<b>Q:</b> {question.get('question', 'N/A')}", styles['Normal']))
-                            story.append(Paragraph(f"<b>Score:</b> {score_data.get('score', 0)}/100", styles['Normal']))
-                            story.append(Paragraph(f"<b>Feedback:</b> {score_data.get('feedback', 'No feedback available')}", styles['Normal']))
-                            
-                            if score_data.get('areas_to_improve') and isinstance(score_data['areas_to_improve'], list):
-                                story.append(Paragraph("<b>Areas to Improve:</b>", styles['Normal']))
-                                for improvement in score_data['areas_to_improve']:
-                                    story.append(Paragraph(f"• {improvement}", styles['Normal']))
-                            
-                            story.append(Spacer(1, 15))
-        
-        # Skills and recommendations
-        story.append(Paragraph("Skills Identified", styles['Heading2']))
-        skills = resume_data.get('skills', []) if isinstance(resume_data, dict) else []
-        if skills and isinstance(skills, list):
-            for skill in skills:
-                if isinstance(skill, str):
-                    story.append(Paragraph(f"• {skill.title()}", styles['Normal']))
-        else:
-            story.append(Paragraph("No specific technical skills identified", styles['Normal']))
+            pdf = report_cache.get(etag)
+            if pdf is None:
+                # Renders run on the report pool; a render already in progress is joined
+                job = report_jobs.submit(etag, session_id, session['user_id'],
+                                         lambda: render_report_job(session_id))
+                pdf = report_jobs.wait(job)
+                if pdf is None:
+                    # The job put the report in the cache; render again only if it was evicted since
+                    pdf = report_cache.get(etag) or render_session_report(session_id)[0]
+            response = send_file(
+                io.BytesIO(pdf),
+                as_attachment=True,
+                download_name=f'talentmate_interview_report_{session_id}.pdf',
+                mimetype='application/pdf'
+            )
         
-        story.append(Spacer(1, 20))
+        response.set_etag(etag)
+        # Reports are private to their owner; browsers revalidate before reuse
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
+    except ReportQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    except FutureTimeoutError:
+        return jsonify({'error': 'Report is still rendering, try again shortly'}), 503, {'Retry-After': '5'}
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/reports/<session_id>', methods=['POST'])
+@login_required
+def start_report_job(session_id):
+    """Start rendering a session's report in the background and return its job"""
+    try:
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute('SELECT scores_version FROM interview_sessions WHERE session_id = ? AND user_id = ?', (session_id, session['user_id']))
+        version_row = cursor.fetchone()
+
+        if not version_row:
+            return jsonify({'error': 'Session not found'}), 404
         
-        return send_file(
-            buffer,
-            as_attachment=True,
-            download_name=f'talentmate_interview_report_{session_id}.pdf',
-            mimetype='application/pdf'
-        )
+        job_id = report_cache.key(session_id, version_row[0])
+        if report_jobs.get(job_id) is None and report_cache.contains(job_id):
+            return jsonify({
+                'job_id': job_id,
+                'session_id': session_id,
+                'status': 'done',
+                'download_url': url_for('download_report', session_id=session_id)
+            })
+        
+        job = report_jobs.submit(job_id, session_id, session['user_id'],
+                                 lambda: render_report_job(session_id))
+        return report_job_response(job, 200 if job.status == 'done' else 202)
         
+    except ReportQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/reports/jobs/<job_id>')
+@login_required
+def get_report_job(job_id):
+    """Progress of a report render job"""
+    job = report_jobs.get(job_id)
+    if job is None or job.user_id != session['user_id']:
+        return jsonify({'error': 'Job not found'}), 404
+    return report_job_response(job)
+
+EXPORT_PAGE_SIZE = 100
+
+def export_report_entries(conditions, params):
+    """Yield (file name, data) archive entries for every session matching the export filter"""
+    keys = {}
+    with db_pool.connection() as conn:
+        def tasks():
+            # Keyset pages by id keep no statement open while reports are rendered and streamed
+            last_id = 0
+            while True:
+                rows = conn.execute(f'''
+                    SELECT s.id, s.session_id, s.scores_version, s.job_role, s.created_at, u.full_name, u.username
+                    FROM interview_sessions s JOIN users u ON u.id = s.user_id
+                    WHERE {' AND '.join(conditions + ['s.id > ?'])}
+                    ORDER BY s.id
+                    LIMIT ?
+                ''', params + [last_id, EXPORT_PAGE_SIZE]).fetchall()
+                if not rows:
+                    return
+                for row_id, session_id, scores_version, job_role, created_at, full_name, username in rows:
+                    name = f"{secure_filename(full_name or username or '') or 'candidate'}_{session_id}.pdf"
+                    keys[name] = report_cache.key(session_id, scores_version)
+                    pdf = report_cache.get(keys[name])
+                    args = None
+                    if pdf is None:
+                        blobs = conn.execute('SELECT questions, resume_data FROM interview_sessions WHERE id = ?', (row_id,)).fetchone()
+                        questions_data = json.loads(blobs[0]) if blobs[0] else []
+                        resume_data = json.loads(blobs[1]) if blobs[1] else {}
+                        answered_count, scores_data = load_session_scores(conn, session_id, questions_data)
+                        args = (session_id, job_role, created_at, questions_data, answered_count, scores_data, resume_data)
+                    yield name, pdf, args
+                last_id = rows[-1][0]
+        
+        for name, pdf, rendered, error in report_export_pool.render_many(tasks()):
+            key = keys.pop(name)
+            if error is not None:
+                yield f'{name[:-4]}.error.txt', f'Report could not be rendered: {error}\n'
+                continue
+            if rendered:
+                report_cache.put(key, pdf)
+            yield name, pdf
+
+@app.route('/api/recruiter/reports/export')
+@login_required
+def export_reports():
+    """Stream the PDF reports of every session matching a filter as one ZIP archive (recruiters only)"""
+    if session.get('user_role') != 'recruiter':
+        return jsonify({'error': 'Access denied'}), 403
+    
+    try:
+        min_score = _int_arg('min_score')
+        max_score = _int_arg('max_score')
+        date_from = request.args.get('from', '').strip()
+        date_to = request.args.get('to', '').strip()
+        for value in (date_from, date_to):
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    conditions = ["u.role = 'user'"]
+    params = []
+    role = request.args.get('role', '').strip()
+    if role:
+        conditions.append("s.job_role LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(role))
+    if min_score is not None:
+        conditions.append('s.overall_score >= ?')
+        params.append(min_score)
+    if max_score is not None:
+        conditions.append('s.overall_score <= ?')
+        params.append(max_score)
+    if date_from:
+        conditions.append('s.created_at >= date(?)')
+        params.append(date_from)
+    if date_to:
+        conditions.append("s.created_at < date(?, '+1 day')")
+        params.append(date_to)
+    
+    try:
+        report_export_pool.begin()
+    except ExportBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '30'}
+    
+    response = Response(stream_zip(export_report_entries(conditions, params)), mimetype='application/zip')
+    response.headers['Content-Disposition'] = f"attachment; filename=talentmate_reports_{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip"
+    # Runs however the stream ends, including a client that disconnects before the first entry
+    response.call_on_close(report_export_pool.end)
+    return response
+
+@app.route('/api/metrics')
+@login_required
+def get_metrics():
+    """Runtime statistics for monitoring (recruiters only)"""
+    if session.get('user_role') != 'recruiter':
+        return jsonify({'error': 'Access denied'}), 403
+    
+    return jsonify({
+        'db_pool': db_pool.stats(),
+        'notification_streams': notification_broker.stats(),
+        'unread_count_cache': unread_counts.stats(),
+        'notification_writer': notification_writer.stats(),
+        'sentiment': sentiment_batcher.stats(),
+        'score_cache': skillmate_ai.score_cache.stats(),
+        'resume_parser': parse_stats.snapshot(),
+        'resume_pool': extraction_pool.stats(),
+        'resume_cache': skillmate_ai.resume_cache.stats() if skillmate_ai.resume_cache else None,
+        'resume_texts': resume_text_stats(get_db()),
+        'question_bank': question_bank_store.stats(),
+        'role_classifier': role_classifier.stats(),
+        'report_cache': report_cache.stats(),
+        'report_jobs': report_jobs.stats(),
+        'report_export': report_export_pool.stats()
+    })
+
+@app.route('/api/question-bank/reload', methods=['POST'])
+@login_required
+def reload_question_bank():
+    """Reload the question bank file in this worker (others pick it up within the check interval)"""
+    if session.get('user_role') != 'recruiter':
+        return jsonify({'error': 'Access denied'}), 403
+    
+    reloaded = question_bank_store.reload()
+    stats = question_bank_store.stats()
+    if not reloaded:
+        return jsonify({'error': stats['last_error'], 'question_bank': stats}), 422
+    return jsonify({'question_bank': stats})
+
 if __name__ == '__main__':
     print("Starting TalentMate Mock Interview System...")
     print("Access the application at http://localhost:5000")
@@ -0,0 +1,97 @@
+"""
+Benchmark: get_results read path, per-request recomputation vs stored summary
+
+Builds a temporary database holding one session with a large parsed resume
+and a scored answer per question, then times what get_results used to do on
+every request (decode the session blobs, load the score rows, recompute the
+summary) against reading the precomputed session_results row.
+
+    python benchmarks/bench_get_results.py [--questions 5 20 50] [--resume-chars 200000]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import apply_migrations  # noqa: E402
+from session_results import (RESULT_COLUMNS, SessionResults, load_session_scores,  # noqa: E402
+                             refresh_session_results, resume_skills)
+
+
+def seed(conn, session_id, questions, resume_chars):
+    questions_data = [{'id': f'q{i}', 'type': ('coding', 'scenario')[i % 2], 'category': 'General',
+                       'question': f'Question {i} ' + 'detail ' * 30} for i in range(questions)]
+    resume_data = {'skills': ['python', 'django', 'react', 'aws'], 'experience_level': 'senior',
+                   'full_text': ('Built services in Python. ' * (resume_chars // 26 + 1))[:resume_chars]}
+    conn.execute('INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)',
+                 (session_id, f'{session_id}@example.com', 'x'))
+    conn.execute('''
+        INSERT INTO interview_sessions (user_id, session_id, job_role, resume_data, questions, question_count)
+        VALUES (last_insert_rowid(), ?, 'Python Developer', ?, ?, ?)
+    ''', (session_id, json.dumps(resume_data), json.dumps(questions_data), questions))
+    for i, question in enumerate(questions_data):
+        conn.execute('INSERT INTO session_answers (session_id, question_id, answer) VALUES (?, ?, ?)',
+                     (session_id, question['id'], 'answer ' * 50))
+        conn.execute('''
+            INSERT INTO session_scores (session_id, question_id, question_type, score, feedback, areas_to_improve)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (session_id, question['id'], question['type'], 40 + i % 60, 'Feedback text',
+              json.dumps(['Add examples', f'Area {i % 7}'])))
+    refresh_session_results(conn, session_id)
+    conn.commit()
+
+
+def recompute(conn, session_id):
+    row = conn.execute('SELECT questions, job_role, resume_data FROM interview_sessions WHERE session_id = ?',
+                       (session_id,)).fetchone()
+    questions_data = json.loads(row[0])
+    resume_data = json.loads(row[2])
+    answered_count, scores_data = load_session_scores(conn, session_id, questions_data)
+    return SessionResults.compute(questions_data, answered_count, scores_data, resume_skills(resume_data))
+
+
+def stored(conn, session_id):
+    row = conn.execute(f'''
+        SELECT s.job_role, {', '.join('r.' + column for column in RESULT_COLUMNS.split(', '))}
+        FROM interview_sessions s JOIN session_results r ON r.session_id = s.session_id
+        WHERE s.session_id = ?
+    ''', (session_id,)).fetchone()
+    return SessionResults.from_row(row[1:])
+
+
+def per_call_us(fn, conn, session_id, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(conn, session_id)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--questions', type=int, nargs='+', default=[5, 20, 50])
+    parser.add_argument('--resume-chars', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        apply_migrations(conn)
+        for questions in args.questions:
+            session_id = f'bench{questions}'
+            seed(conn, session_id, questions, args.resume_chars)
+            assert vars(recompute(conn, session_id)) == vars(stored(conn, session_id))
+            before = per_call_us(recompute, conn, session_id, args.repeat)
+            after = per_call_us(stored, conn, session_id, args.repeat)
+            print(f'{questions:>3} questions, {args.resume_chars} char resume: '
+                  f'recompute {before:8.1f} us | stored summary {after:7.1f} us ({before / after:5.1f}x)')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
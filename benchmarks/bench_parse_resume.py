@@ -0,0 +1,116 @@
+"""
+Benchmark: resume parsing time and peak memory
+
+Compares the previous whole-document extraction (string concatenation over
+every page) with the incremental extractor in resume_parser on the demo_*.txt
+samples and on synthetic PDFs built from them with reportlab.
+
+    python benchmarks/bench_parse_resume.py [--pages 20 200 500]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import PyPDF2  # noqa: E402
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from resume_parser import RESUME_MAX_SKILLS, parse_resume_file  # noqa: E402
+from skill_taxonomy import skill_taxonomy  # noqa: E402
+
+
+def legacy_parse_resume(file_path):
+    """parse_resume before incremental extraction"""
+    if file_path.endswith('.pdf'):
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            text = ""
+            for page in pdf_reader.pages:
+                text += page.extract_text()
+    else:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            text = file.read()
+    skills_keywords = ['python', 'java', 'javascript', 'react', 'angular', 'node.js', 'sql', 'mongodb',
+                       'aws', 'docker', 'kubernetes', 'git', 'machine learning', 'ai', 'data science']
+    text_lower = text.lower()
+    found_skills = [skill for skill in skills_keywords if skill in text_lower]
+    experience_indicators = {
+        'senior': ['senior', 'lead', 'architect', 'principal', 'manager'],
+        'mid': ['experienced', 'specialist', 'developer', '3+ years', '4+ years', '5+ years'],
+        'junior': ['junior', 'entry', 'graduate', 'intern', 'trainee']
+    }
+    experience_level = 'intermediate'
+    for level, keywords in experience_indicators.items():
+        if any(keyword in text_lower for keyword in keywords):
+            experience_level = level
+            break
+    return {'skills': found_skills, 'experience_level': experience_level, 'full_text': text}
+
+
+def make_pdf(path, lines, pages):
+    pdf = canvas.Canvas(path, pagesize=letter)
+    per_page = 50
+    for page in range(pages):
+        y = 750
+        for i in range(per_page):
+            pdf.drawString(40, y, lines[(page * per_page + i) % len(lines)][:110])
+            y -= 14
+        pdf.showPage()
+    pdf.save()
+
+
+def measure(fn, path):
+    # Timed without tracemalloc, which slows allocation-heavy code down
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def compare(label, path):
+    old, old_time, old_peak = measure(legacy_parse_resume, path)
+    new, new_time, new_peak = measure(parse_resume_file, path)
+    # The taxonomy matches whole tokens and aliases, so skill lists differ from the substring scan
+    print(f'{label:<34} old {old_time * 1000:8.1f} ms {old_peak / 1e6:7.2f} MB | '
+          f'new {new_time * 1000:8.1f} ms {new_peak / 1e6:7.2f} MB | '
+          f'{old_time / new_time:5.1f}x  skills {len(old["skills"])}/{len(new["skills"])} '
+          f'level {old["experience_level"]}/{new["experience_level"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[20, 200, 500])
+    args = parser.parse_args()
+
+    samples = sorted(glob.glob(os.path.join(ROOT, 'demo_*.txt')))
+    for sample in samples:
+        compare(os.path.basename(sample), sample)
+
+    lines = [line for sample in samples for line in open(sample, encoding='utf-8').read().splitlines() if line.strip()]
+    # Enough skills on the first page to settle the result
+    names = skill_taxonomy.skills[:RESUME_MAX_SKILLS]
+    rich = ['Senior engineer'] + ['Skills: ' + ', '.join(names[i:i + 8]) for i in range(0, len(names), 8)] + lines
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f'demo_{pages}.pdf')
+            make_pdf(path, lines, pages)
+            compare(f'demo text PDF, {pages} pages', path)
+            path = os.path.join(tmp, f'rich_{pages}.pdf')
+            make_pdf(path, rich, pages)
+            compare(f'skills settled on page 1, {pages} pages', path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: question bank load time and question selection at scale
+
+Builds synthetic banks of up to 100k questions spread over the shipped
+types and keys, then times loading (parse + index build) and the per-request
+selection done by generate_questions.
+
+    python benchmarks/bench_question_bank.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from question_bank import DEFAULT_QUESTION_BANK_PATH, QuestionBankStore  # noqa: E402
+
+
+def synthetic_bank(shipped, size, seed=11):
+    rng = random.Random(seed)
+    questions = list(shipped)
+    while len(questions) < size:
+        template = rng.choice(shipped)
+        question = dict(template, text=f'{template["text"]} (variant {len(questions)})')
+        questions.append(question)
+    return {'version': 1, 'questions': questions}
+
+
+def select(bank, rng):
+    """The lookups generate_questions makes for one interview"""
+    role = bank.get('role_specific', rng.choice(['java_fullstack', 'salesforce_admin', None]))
+    picked = rng.sample(role, k=min(3, len(role))) if role else rng.sample(bank.get('coding', 'intermediate'), k=3)
+    for category in ('problem_solving', 'communication'):
+        picked += rng.sample(bank.get('scenario', category), k=1)
+    return picked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(DEFAULT_QUESTION_BANK_PATH, encoding='utf-8') as file:
+        shipped = json.load(file)['questions']
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [len(shipped)] + args.sizes:
+            path = os.path.join(tmp, f'bank_{size}.json')
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(synthetic_bank(shipped, size), file)
+            store = QuestionBankStore(path)
+            bank = store.current()
+            rng = random.Random(3)
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                select(store.current(), rng)
+            per_call = (time.perf_counter() - start) / args.calls
+            print(f'{bank.size:>7} questions ({os.path.getsize(path) / 1e6:6.2f} MB): '
+                  f'load + index {store.stats()["load_ms"]:8.1f} ms | selection {per_call * 1e6:6.1f} us/interview')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: PDF report download cost, rendered vs cached
+
+Renders a ten-question report the way download_report does on a miss, then
+times memory-tier hits and disk-tier hits of the report cache for the same
+report.
+
+    python benchmarks/bench_report_cache.py [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_cache import ReportCache  # noqa: E402
+from reports import render_report  # noqa: E402
+
+ANSWER_FEEDBACK = 'Good structure. Mention time complexity and give a concrete example from a past project.'
+
+
+def sample_report_args(questions=10):
+    questions_data = [
+        {'id': f'q{i}', 'type': 'coding', 'category': 'Problem Solving',
+         'question': f'Explain how you would design component {i} and what trade-offs you would make.'}
+        for i in range(questions)
+    ]
+    scores_data = {
+        q['id']: {'score': 60 + i * 3, 'feedback': ANSWER_FEEDBACK,
+                  'areas_to_improve': ['Add specific examples', 'Discuss edge cases']}
+        for i, q in enumerate(questions_data)
+    }
+    resume_data = {'skills': ['python', 'java', 'react', 'docker', 'kubernetes', 'aws']}
+    return ('bench-session', 'Java Full Stack Developer', '2025-01-01 10:00:00',
+            questions_data, questions, scores_data, resume_data)
+
+
+def per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    report_args = sample_report_args()
+    render_report(*report_args)  # builds the shared styles once, like a warm worker
+    render_ms = per_call_ms(lambda: render_report(*report_args), max(1, args.repeat // 10))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ReportCache(tmp)
+        key = cache.key('bench-session', 1)
+        pdf = render_report(*report_args)
+        cache.put(key, pdf)
+        memory_ms = per_call_ms(lambda: cache.get(key), args.repeat)
+
+        def disk_hit():
+            cache.clear()
+            cache.get(key)
+        disk_ms = per_call_ms(disk_hit, args.repeat)
+
+    print(f'report size {len(pdf) / 1024:.1f} KB')
+    print(f'render (cache miss)  {render_ms:9.3f} ms')
+    print(f'disk tier hit        {disk_ms:9.3f} ms  ({render_ms / disk_ms:,.0f}x faster)')
+    print(f'memory tier hit      {memory_ms:9.3f} ms  ({render_ms / memory_ms:,.0f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: bulk report export, serial rendering vs the process pool
+
+Streams a ZIP export of N synthetic sessions through stream_zip, rendering
+every report either on the calling thread or in ReportExportPool, and
+reports throughput and the parent process's peak Python memory during a
+pooled export, which should stay flat as N grows.
+
+    python benchmarks/bench_report_export.py [--sessions 50 200] [--workers W]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_export import ReportExportPool, stream_zip  # noqa: E402
+from reports import render_report  # noqa: E402
+
+
+def session_args(index, questions=10):
+    questions_data = [
+        {'id': f'q{i}', 'type': 'coding', 'category': 'Problem Solving',
+         'question': f'Session {index}: explain how you would design component {i}.'}
+        for i in range(questions)
+    ]
+    scores_data = {
+        q['id']: {'score': (index + i * 7) % 100, 'feedback': 'Clear answer; add a concrete example.',
+                  'areas_to_improve': ['Add specific examples']}
+        for i, q in enumerate(questions_data)
+    }
+    return (f'session-{index}', 'Python Full Stack Developer', '2025-01-01 10:00:00',
+            questions_data, questions, scores_data, {'skills': ['python', 'django', 'react']})
+
+
+def tasks(count):
+    for index in range(count):
+        yield f'candidate_{index}.pdf', None, session_args(index)
+
+
+def serial_entries(count):
+    for name, _, args in tasks(count):
+        yield name, render_report(*args)
+
+
+def pooled_entries(pool, count):
+    for name, pdf, _, error in pool.render_many(tasks(count)):
+        yield name, pdf
+
+
+def timed(entries):
+    start = time.perf_counter()
+    size = sum(len(piece) for piece in stream_zip(entries))
+    return time.perf_counter() - start, size
+
+
+def traced_peak(entries):
+    # Traced separately: tracemalloc slows rendering on the calling thread several times over
+    tracemalloc.start()
+    for _ in stream_zip(entries):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    pool = ReportExportPool(workers=args.workers, window=args.workers * 2)
+    try:
+        # Start the workers (and import reportlab in them) before timing
+        list(pool.render_many(tasks(args.workers)))
+        print(f'{os.cpu_count()} CPUs, {args.workers} export workers')
+        for count in args.sessions:
+            serial_elapsed, size = timed(serial_entries(count))
+            pool_elapsed, _ = timed(pooled_entries(pool, count))
+            peak = traced_peak(pooled_entries(pool, count))
+            print(f'{count:>5} sessions (zip {size / 1e6:5.2f} MB): serial {count / serial_elapsed:6.1f} reports/s | '
+                  f'pool {count / pool_elapsed:6.1f} reports/s | parent peak {peak / 1e6:5.2f} MB')
+    finally:
+        pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: request latency with and without the resume extraction pool
+
+Simulates a threaded web worker handling heavy PDF uploads concurrently with
+light requests (a text resume parse plus ~1 ms of pure-Python handler work),
+once with extraction on the request threads and once with the process pool,
+and reports latency percentiles.
+
+    python benchmarks/bench_resume_pool.py [--heavy 8] [--light 200] [--workers 4]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from resume_parser import ExtractionPool  # noqa: E402
+
+
+def make_pdf(pages):
+    lines = [line for line in open(os.path.join(ROOT, 'demo_resume.txt'), encoding='utf-8').read().splitlines()
+             if line.strip() and 'python' not in line.lower()]
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for page in range(pages):
+        for i in range(50):
+            pdf.drawString(40, 800 - 14 * i, lines[(page * 50 + i) % len(lines)][:100])
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def handler_work():
+    """Stand-in for the Python work of an ordinary request (routing, scoring, JSON)"""
+    return sum(i * i for i in range(20000))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(pool, pdf, text, heavy, light, threads):
+    def timed(data, filename):
+        started = time.perf_counter()
+        pool.parse(data, filename)
+        if filename == 'resume.txt':
+            handler_work()
+        return filename, time.perf_counter() - started
+
+    jobs = [(pdf, 'resume.pdf')] * heavy + [(text, 'resume.txt')] * light
+    # Interleave so light requests arrive while heavy ones are in progress
+    jobs = jobs[::2] + jobs[1::2]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda job: timed(*job), jobs))
+    wall = time.perf_counter() - started
+    light_times = [elapsed * 1000 for filename, elapsed in results if filename == 'resume.txt']
+    heavy_times = [elapsed * 1000 for filename, elapsed in results if filename == 'resume.pdf']
+    return wall, light_times, heavy_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--heavy', type=int, default=8, help='concurrent PDF uploads')
+    parser.add_argument('--light', type=int, default=200, help='light requests mixed in')
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=8, help='request threads')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    pdf = make_pdf(args.pages)
+    text = open(os.path.join(ROOT, 'demo_resume.txt'), 'rb').read()
+    pooled = ExtractionPool(workers=args.workers, timeout=600, max_pending=args.heavy + args.light)
+    pooled.parse(pdf, 'warmup.pdf')  # start the worker processes outside the measurement
+
+    print(f'{args.heavy} x {args.pages}-page PDF + {args.light} light requests on {args.threads} threads, '
+          f'{os.cpu_count()} CPUs')
+    for label, pool in (('request thread', ExtractionPool(workers=0)), (f'pool ({args.workers} workers)', pooled)):
+        wall, light, heavy = run(pool, pdf, text, args.heavy, args.light, args.threads)
+        print(f'{label:<20} wall {wall:6.2f} s | light p50 {percentile(light, 0.5):8.1f} ms '
+              f'p95 {percentile(light, 0.95):8.1f} ms max {max(light):8.1f} ms | '
+              f'PDF mean {statistics.mean(heavy):8.1f} ms')
+    pooled.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: resume text inline in every session row vs compressed, shared storage
+
+Builds a temporary database where each candidate runs several mock
+interviews with the same resume, stored the way upload_resume used to (the
+whole parsed resume, text included, as JSON in each session row). It then
+times reading the skills back the way the report and results paths do,
+compacts the rows as migration 11 does, times the same read again and
+reports the database size before and after VACUUM.
+
+    python benchmarks/bench_resume_store.py [--candidates 200] [--sessions 5] [--resume-chars 20000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import apply_migrations, database_size, vacuum_database  # noqa: E402
+from resume_store import compact_resume_data, resume_text_stats  # noqa: E402
+from session_results import resume_skills  # noqa: E402
+
+WORDS = ('python django react aws kubernetes led team built services designed pipelines migrated '
+         'platform improved latency reduced costs mentored engineers shipped features').split()
+
+
+def seed(conn, candidates, sessions, resume_chars):
+    rng = random.Random(42)
+    for candidate in range(candidates):
+        text = ' '.join(rng.choice(WORDS) for _ in range(resume_chars // 7))[:resume_chars]
+        resume_json = json.dumps({'skills': ['python', 'django', 'aws'], 'experience_level': 'senior',
+                                  'full_text': text})
+        conn.executemany('''
+            INSERT INTO interview_sessions (user_id, session_id, job_role, resume_data)
+            VALUES (?, ?, 'Python Developer', ?)
+        ''', [(candidate, f'c{candidate}s{s}', resume_json) for s in range(sessions)])
+    conn.commit()
+
+
+def read_skills_us(conn, session_ids):
+    start = time.perf_counter()
+    for session_id in session_ids:
+        row = conn.execute('SELECT resume_data FROM interview_sessions WHERE session_id = ?', (session_id,)).fetchone()
+        resume_skills(json.loads(row[0]))
+    return (time.perf_counter() - start) / len(session_ids) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=200)
+    parser.add_argument('--sessions', type=int, default=5, help='mock interviews per candidate')
+    parser.add_argument('--resume-chars', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        apply_migrations(conn)
+        seed(conn, args.candidates, args.sessions, args.resume_chars)
+        session_ids = [f'c{c}s{s}' for c in range(args.candidates) for s in range(args.sessions)]
+        size_before = database_size(conn)
+        inline_us = read_skills_us(conn, session_ids)
+
+        start = time.perf_counter()
+        compacted, before, after = compact_resume_data(conn)
+        conn.commit()
+        compact_s = time.perf_counter() - start
+        _, size_after = vacuum_database(conn)
+        slim_us = read_skills_us(conn, session_ids)
+        texts = resume_text_stats(conn)
+        conn.close()
+
+    print(f'{compacted} sessions, {texts["texts"]} distinct resumes of {args.resume_chars} chars '
+          f'(compacted in {compact_s:.2f}s)')
+    print(f'resume_data:   {before / 1e6:8.2f} MB -> {after / 1e6:6.3f} MB')
+    print(f'resume_texts:  {texts["bytes"] / 1e6:8.2f} MB of text stored as {texts["compressed_bytes"] / 1e6:.2f} MB')
+    print(f'database file: {size_before / 1e6:8.2f} MB -> {size_after / 1e6:6.2f} MB after VACUUM')
+    print(f'read skills:   {inline_us:8.1f} us -> {slim_us:6.1f} us per session ({inline_us / slim_us:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
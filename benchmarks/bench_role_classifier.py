@@ -0,0 +1,110 @@
+"""
+Benchmark: role classification throughput, legacy if-chain vs compiled rules
+
+Classifies the job-title corpus from tests/data/job_titles.json (plus
+synthetic variants) with the substring if-chain detect_role_category used to
+run, the compiled classifier with its LRU disabled, and the compiled
+classifier with its LRU warm. Also reports titles on which the legacy
+substring matching and the compiled whole-token rules disagree.
+
+    python benchmarks/bench_role_classifier.py [--titles 20000] [--rules N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from role_rules import DEFAULT_ROLE_RULES_PATH, RoleClassifier  # noqa: E402
+
+CORPUS = os.path.join(ROOT, 'tests', 'data', 'job_titles.json')
+SENIORITY = ['', 'Senior ', 'Junior ', 'Lead ', 'Principal ', 'Staff ']
+SUFFIXES = ['', ' II', ' (Remote)', ' - Contract', ' - Healthcare', ' / Hybrid']
+
+
+def legacy_detect(job_role):
+    """detect_role_category before the rule table"""
+    job_role_lower = job_role.lower()
+    if 'salesforce' in job_role_lower:
+        if any(keyword in job_role_lower for keyword in ['developer', 'dev', 'apex', 'lightning']):
+            return 'salesforce_developer'
+        else:
+            return 'salesforce_admin'
+    if any(keyword in job_role_lower for keyword in ['analyst', 'business analyst', 'program analyst', 'systems analyst']):
+        return 'program_analyst'
+    if 'full stack' in job_role_lower or 'fullstack' in job_role_lower:
+        if any(keyword in job_role_lower for keyword in ['java', 'spring', 'hibernate']):
+            return 'java_fullstack'
+        elif any(keyword in job_role_lower for keyword in ['python', 'django', 'flask']):
+            return 'python_fullstack'
+        elif any(keyword in job_role_lower for keyword in ['.net', 'dotnet', 'c#', 'asp.net']):
+            return 'dotnet_fullstack'
+    if any(keyword in job_role_lower for keyword in ['java', 'spring', 'hibernate']) and 'developer' in job_role_lower:
+        return 'java_fullstack'
+    elif any(keyword in job_role_lower for keyword in ['python', 'django', 'flask']) and 'developer' in job_role_lower:
+        return 'python_fullstack'
+    elif any(keyword in job_role_lower for keyword in ['.net', 'dotnet', 'c#', 'asp.net']) and 'developer' in job_role_lower:
+        return 'dotnet_fullstack'
+    return None
+
+
+def synthetic_rules(shipped, count, seed=5):
+    """Shipped rules plus filler rules on made-up technologies, up to count rules"""
+    rng = random.Random(seed)
+    rules = list(shipped)
+    while len(rules) < count:
+        n = len(rules)
+        rules.append({
+            'role': f'synthetic_{n}',
+            'priority': rng.randint(1, 50),
+            'required': [[f'tech{n}', f'stack{n} platform'], ['developer', 'engineer']],
+        })
+    return rules
+
+
+def throughput(detect, titles):
+    start = time.perf_counter()
+    for title in titles:
+        detect(title)
+    return len(titles) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--rules', type=int, nargs='+', default=[100, 1000])
+    args = parser.parse_args()
+
+    with open(CORPUS, encoding='utf-8') as file:
+        corpus = [title for title, _ in json.load(file)]
+    with open(DEFAULT_ROLE_RULES_PATH, encoding='utf-8') as file:
+        shipped = json.load(file)['rules']
+    rng = random.Random(7)
+    titles = [rng.choice(SENIORITY) + rng.choice(corpus) + rng.choice(SUFFIXES) for _ in range(args.titles)]
+    distinct = len(set(titles))
+
+    print(f'{len(titles)} titles ({distinct} distinct)')
+    print(f'legacy if-chain               {throughput(legacy_detect, titles):>10,.0f} titles/s')
+    for count in [len(shipped)] + args.rules:
+        rules = synthetic_rules(shipped, count)
+        cold = RoleClassifier(rules, cache_size=0)
+        warm = RoleClassifier(rules, cache_size=distinct)
+        throughput(warm.detect, titles)
+        print(f'{count:>5} rules  compiled, no cache {throughput(cold.detect, titles):>10,.0f} titles/s | '
+              f'cached {throughput(warm.detect, titles):>10,.0f} titles/s')
+
+    classifier = RoleClassifier(shipped)
+    changed = [(title, legacy_detect(title), classifier.detect(title))
+               for title in corpus if legacy_detect(title) != classifier.detect(title)]
+    print(f'{len(changed)} of {len(corpus)} corpus titles classified differently from the if-chain:')
+    for title, old, new in changed:
+        print(f'  {title!r}: {old} -> {new}')
+
+
+if __name__ == '__main__':
+    main()
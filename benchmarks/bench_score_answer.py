@@ -0,0 +1,148 @@
+"""
+Benchmark: keyword matching in SkillMateAI.score_answer
+
+Compares the previous per-keyword substring scans (rebuilt on every call)
+with the compiled KeywordMatcher on a corpus of synthetic answers.
+
+    python benchmarks/bench_score_answer.py [--answers N] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keywords import KeywordMatcher  # noqa: E402
+
+ROLE_KEYWORDS = {
+    'salesforce': ['apex', 'soql', 'trigger', 'workflow', 'validation', 'lightning', 'component', 'process builder', 'flow'],
+    'java': ['spring', 'hibernate', 'jpa', 'microservices', 'rest api', 'junit', 'maven', 'dependency injection'],
+    'python': ['django', 'flask', 'orm', 'serializer', 'middleware', 'celery', 'rest framework', 'async'],
+    'dotnet': ['asp.net', 'entity framework', 'mvc', 'web api', 'dependency injection', 'middleware', 'linq'],
+    'analyst': ['requirements', 'stakeholder', 'user story', 'acceptance criteria', 'gap analysis', 'process', 'kpi']
+}
+SCORING_KEYWORDS = dict({
+    'coding': ['algorithm', 'complexity', 'time', 'space', 'data structure',
+               'variable', 'function', 'loop', 'condition', 'efficiency'],
+    'general': ['solution', 'implementation', 'design', 'architecture', 'best practice',
+                'optimization', 'integration', 'configuration', 'development', 'testing'],
+    'scenario': ['experience', 'situation', 'approach', 'result', 'learned',
+                 'challenge', 'solution', 'team', 'communication'],
+}, **ROLE_KEYWORDS)
+FILLER = ('the we then it was a to and of our in for with on that this so after before '
+          'sometimes maintain customers database request page users report release').split()
+
+
+def legacy_keyword_count(answer, question_type):
+    """The keyword section of score_answer before the compiled matcher"""
+    if question_type == 'coding':
+        technical_keywords = ['algorithm', 'complexity', 'time', 'space', 'data structure',
+                              'variable', 'function', 'loop', 'condition', 'efficiency']
+        return sum(1 for keyword in technical_keywords if keyword.lower() in answer.lower())
+    if question_type == 'role_specific':
+        role_keywords = {
+            'salesforce': ['apex', 'soql', 'trigger', 'workflow', 'validation', 'lightning', 'component', 'process builder', 'flow'],
+            'java': ['spring', 'hibernate', 'jpa', 'microservices', 'rest api', 'junit', 'maven', 'dependency injection'],
+            'python': ['django', 'flask', 'orm', 'serializer', 'middleware', 'celery', 'rest framework', 'async'],
+            'dotnet': ['asp.net', 'entity framework', 'mvc', 'web api', 'dependency injection', 'middleware', 'linq'],
+            'analyst': ['requirements', 'stakeholder', 'user story', 'acceptance criteria', 'gap analysis', 'process', 'kpi']
+        }
+        applicable_keywords = []
+        answer_lower = answer.lower()
+        for role, keywords in role_keywords.items():
+            if any(keyword in answer_lower for keyword in keywords):
+                applicable_keywords.extend(keywords)
+                break
+        if not applicable_keywords:
+            applicable_keywords = ['solution', 'implementation', 'design', 'architecture', 'best practice',
+                                   'optimization', 'integration', 'configuration', 'development', 'testing']
+        return sum(1 for keyword in applicable_keywords if keyword in answer_lower)
+    scenario_keywords = ['experience', 'situation', 'approach', 'result', 'learned',
+                         'challenge', 'solution', 'team', 'communication']
+    return sum(1 for keyword in scenario_keywords if keyword.lower() in answer.lower())
+
+
+_BOUNDARY_PATTERNS = {}
+
+
+def regex_keyword_count(answer, question_type):
+    """Substring scans made word-boundary correct with one regex per keyword"""
+    def present(keyword, text):
+        pattern = _BOUNDARY_PATTERNS.get(keyword)
+        if pattern is None:
+            pattern = _BOUNDARY_PATTERNS[keyword] = re.compile(r'\b' + re.escape(keyword) + r'(?:e?s)?\b')
+        return pattern.search(text) is not None
+
+    answer_lower = answer.lower()
+    if question_type == 'role_specific':
+        for keywords in ROLE_KEYWORDS.values():
+            count = sum(1 for keyword in keywords if present(keyword, answer_lower))
+            if count:
+                return count
+        return sum(1 for keyword in SCORING_KEYWORDS['general'] if present(keyword, answer_lower))
+    category = 'coding' if question_type == 'coding' else 'scenario'
+    return sum(1 for keyword in SCORING_KEYWORDS[category] if present(keyword, answer_lower))
+
+
+def compiled_keyword_count(matcher, answer, question_type):
+    keywords = matcher.match(answer)
+    if question_type == 'coding':
+        return keywords.count('coding')
+    if question_type == 'role_specific':
+        return next((keywords.count(role) for role in ROLE_KEYWORDS if keywords.count(role)),
+                    keywords.count('general'))
+    return keywords.count('scenario')
+
+
+def make_answers(count, seed=42):
+    rng = random.Random(seed)
+    vocabulary = [k for keywords in SCORING_KEYWORDS.values() for k in keywords]
+    answers = []
+    for _ in range(count):
+        words = [rng.choice(vocabulary) if rng.random() < 0.05 else rng.choice(FILLER)
+                 for _ in range(rng.randint(40, 250))]
+        answers.append(' '.join(words).capitalize() + '.')
+    return answers
+
+
+def run(label, fn, answers, repeat, question_types):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i, answer in enumerate(answers):
+            fn(answer, question_types[i % len(question_types)])
+        best = min(best, time.perf_counter() - start)
+    print(f'  {label:<24} {len(answers) / best:>10,.0f} answers/s  ({best * 1000:.1f} ms)')
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--answers', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    answers = make_answers(args.answers)
+    start = time.perf_counter()
+    matcher = KeywordMatcher(SCORING_KEYWORDS)
+    print(f'matcher build          {(time.perf_counter() - start) * 1000:.2f} ms (once per process)')
+
+    mismatches = sum(1 for i, answer in enumerate(answers)
+                     for question_type in ('coding', 'role_specific', 'scenario')
+                     if regex_keyword_count(answer, question_type) != compiled_keyword_count(matcher, answer, question_type))
+    print(f'disagreements with per-keyword regex: {mismatches}')
+
+    for question_types in (('coding',), ('role_specific',), ('scenario',), ('coding', 'role_specific', 'scenario')):
+        print(' + '.join(question_types))
+        legacy = run('substring scans (old)', legacy_keyword_count, answers, args.repeat, question_types)
+        run('per-keyword regex', regex_keyword_count, answers, args.repeat, question_types)
+        compiled = run('KeywordMatcher', lambda a, t: compiled_keyword_count(matcher, a, t),
+                       answers, args.repeat, question_types)
+        print(f'  speedup vs old            {legacy / compiled:.2f}x')
+
+if __name__ == '__main__':
+    main()
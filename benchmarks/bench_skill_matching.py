@@ -0,0 +1,86 @@
+"""
+Benchmark: skill matching cost versus taxonomy size
+
+Compares the previous approach (one substring scan of the resume per skill
+and alias) with the token trie in skill_taxonomy, for the shipped taxonomy
+and for synthetic taxonomies of up to 10k skills, on a demo resume and on
+a long resume.
+
+    python benchmarks/bench_skill_matching.py [--sizes 1000 10000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from skill_taxonomy import DEFAULT_TAXONOMY_PATH, SkillTaxonomy  # noqa: E402
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'vo', 'xi', 'ze', 'qu', 'bra', 'dex', 'flo', 'gri', 'pyn']
+
+
+def synthetic_taxonomy(base, size, seed=7):
+    """The shipped taxonomy padded with made-up skills, each with two aliases"""
+    rng = random.Random(seed)
+    skills = list(base['skills'])
+    names = {skill['name'] for skill in skills}
+    while len(skills) < size:
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        name = ' '.join(words)
+        if name not in names:
+            names.add(name)
+            skills.append({'name': name, 'aliases': [name.replace(' ', ''), name + 'js']})
+    return {'skills': skills, 'experience_levels': base['experience_levels']}
+
+
+def substring_match(data, text):
+    """Previous parse_resume approach, extended to every skill term"""
+    text = text.lower()
+    found = []
+    for skill in data['skills']:
+        terms = [skill['name']] + skill.get('aliases', [])
+        if any(term in text for term in terms):
+            found.append(skill['name'])
+    levels = {level for level, terms in data['experience_levels'].items() if any(term in text for term in terms)}
+    return found, levels
+
+
+def timeit(fn, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    with open(DEFAULT_TAXONOMY_PATH, encoding='utf-8') as file:
+        base = json.load(file)
+    resume = open(os.path.join(ROOT, 'demo_java_developer.txt'), encoding='utf-8').read()
+    texts = [('demo resume', resume), ('long resume', (resume + '\n') * (200000 // len(resume)))]
+
+    for size in [len(base['skills'])] + args.sizes:
+        data = base if size == len(base['skills']) else synthetic_taxonomy(base, size)
+        start = time.perf_counter()
+        taxonomy = SkillTaxonomy(data['skills'], data['experience_levels'])
+        build = time.perf_counter() - start
+        print(f'{len(data["skills"]):>6} skills ({taxonomy.term_count} terms, built in {build * 1000:.0f} ms)')
+        for label, text in texts:
+            old = timeit(substring_match, data, text)
+            new = timeit(taxonomy.match, text)
+            print(f'    {label:<12} {len(text):>7} chars: substring {old * 1000:9.2f} ms | '
+                  f'trie {new * 1000:8.2f} ms | {old / new:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+TalentMate database layer
+
+A small bounded pool of SQLite connections shared by all request handlers.
+Each request borrows one connection (via get_db) and returns it when the
+app context is torn down, so handlers never pay the connect cost twice.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from flask import g, has_app_context
+
+DATABASE_PATH = os.environ.get('TALENTMATE_DB', 'talentmate.db')
+POOL_SIZE = int(os.environ.get('TALENTMATE_DB_POOL_SIZE', '8'))
+POOL_TIMEOUT = float(os.environ.get('TALENTMATE_DB_POOL_TIMEOUT', '10'))
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 64 * 1024 * 1024  # 64MB
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout"""
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections configured for concurrent access"""
+
+    def __init__(self, database, max_size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._open = 0
+        self._in_use = 0
+        self._stats = {
+            'acquired': 0,
+            'reused': 0,
+            'created': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'discarded': 0,
+            'peak_in_use': 0,
+        }
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+        return conn
+
+    def _reset_after_fork(self):
+        # Connections must never be shared across processes (e.g. gunicorn --preload)
+        self._idle = queue.LifoQueue()
+        self._open = 0
+        self._in_use = 0
+        self._pid = os.getpid()
+
+    def acquire(self):
+        """Borrow a connection, creating one if the pool has spare capacity"""
+        if os.getpid() != self._pid:
+            with self._lock:
+                self._reset_after_fork()
+
+        try:
+            conn = self._idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            conn = None
+            reused = False
+            with self._lock:
+                if self._open < self.max_size:
+                    self._open += 1
+                    create = True
+                else:
+                    create = False
+                    self._stats['waits'] += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+                with self._lock:
+                    self._stats['created'] += 1
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                    reused = True
+                except queue.Empty:
+                    with self._lock:
+                        self._stats['timeouts'] += 1
+                    raise PoolTimeout(f'No database connection available after {self.timeout}s')
+
+        with self._lock:
+            self._in_use += 1
+            self._stats['acquired'] += 1
+            if reused:
+                self._stats['reused'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any unfinished transaction"""
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._open -= 1
+            self._stats['discarded'] += 1
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """Close every idle connection (used on shutdown and in tests)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._open -= 1
+
+    def stats(self):
+        """Snapshot of pool usage counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'database': self.database,
+                'max_size': self.max_size,
+                'open': self._open,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+            })
+        acquired = snapshot['acquired']
+        snapshot['reuse_ratio'] = round(snapshot['reused'] / acquired, 3) if acquired else 0.0
+        return snapshot
+
+
+db_pool = ConnectionPool(DATABASE_PATH)
+
+
+def get_db():
+    """Get the connection bound to the current request, borrowing one if needed"""
+    conn = g.get('_db_conn')
+    if conn is None:
+        conn = db_pool.acquire()
+        g._db_conn = conn
+    return conn
+
+
+def close_db(exc=None):
+    """Return the request's connection to the pool"""
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        db_pool.release(conn)
+
+
+@contextmanager
+def db_connection():
+    """Use the request connection inside a request, otherwise borrow one from the pool"""
+    if has_app_context():
+        yield get_db()
+    else:
+        with db_pool.connection() as conn:
+            yield conn
+
+
+def init_app(app):
+    """Register the per-request connection teardown with the Flask app"""
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,78 @@
+"""
+TalentMate keyword matching
+
+A precompiled multi-keyword matcher used when scoring answers. Keyword tables
+are normalized once; each answer is lowercased once and each category is
+evaluated at most once per answer. Matches respect word boundaries ("ai"
+does not match inside "maintain") and accept a plain plural suffix ("loops"
+counts as "loop").
+
+At these table sizes CPython's substring search beats both a regex
+alternation and tokenizing the answer in Python, so keywords are located
+with str.find and only the candidates are checked for word boundaries
+(see benchmarks/bench_score_answer.py).
+"""
+
+PLURAL_SUFFIXES = ('s', 'es')
+
+
+def contains_word(text, keyword):
+    """True if keyword occurs in text as a whole word, optionally pluralized"""
+    size = len(text)
+    start = text.find(keyword)
+    while start != -1:
+        if start == 0 or not text[start - 1].isalnum():
+            end = start + len(keyword)
+            if end == size or not text[end].isalnum():
+                return True
+            for suffix in PLURAL_SUFFIXES:
+                tail = end + len(suffix)
+                if text.startswith(suffix, end) and (tail == size or not text[tail].isalnum()):
+                    return True
+        start = text.find(keyword, start + 1)
+    return False
+
+
+class KeywordMatch:
+    """Keyword hits of one text; categories are evaluated lazily and memoized"""
+
+    def __init__(self, matcher, text):
+        self.matcher = matcher
+        self.text = text.lower()
+        self._found = {}
+
+    def found(self, category):
+        """Keywords of a category present in the text"""
+        keywords = self._found.get(category)
+        if keywords is None:
+            text = self.text
+            # The substring test rejects most keywords without a Python-level call
+            keywords = [keyword for keyword in self.matcher.categories[category]
+                        if keyword in text and contains_word(text, keyword)]
+            self._found[category] = keywords
+        return keywords
+
+    def count(self, category):
+        """Number of distinct keywords of a category present in the text"""
+        return len(self.found(category))
+
+    def counts(self):
+        """Hit counts for every category"""
+        return {category: self.count(category) for category in self.matcher.categories}
+
+
+class KeywordMatcher:
+    """Keyword tables shared by every answer scored in the process"""
+
+    def __init__(self, categories):
+        # Lowercased and de-duplicated once instead of on every call
+        self.categories = {name: tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+                           for name, keywords in categories.items()}
+
+    def match(self, text):
+        """Prepare a text for keyword lookups"""
+        return KeywordMatch(self, text)
+
+    def counts(self, text):
+        """Hit counts for every category of one text"""
+        return self.match(text).counts()
@@ -0,0 +1,640 @@
+"""
+TalentMate schema migrations
+
+Each migration is registered with a version number and runs exactly once,
+inside its own transaction. The applied version is tracked in SQLite's
+PRAGMA user_version, so databases created by older releases (which had no
+version at all) are brought up to date on the next start.
+
+Run `python migrations.py` to migrate the configured database,
+`python migrations.py --check-plans` to verify that none of the hot
+queries below needs a full table scan, or
+`python migrations.py --backfill-answers` to copy answers written to the
+legacy JSON columns (e.g. by workers still running an older release) into
+the row-per-answer tables. `python migrations.py --compact-resumes` moves
+resume text written by older workers out of the session rows and vacuums
+the database.
+"""
+
+import json
+import re
+import sys
+
+MIGRATIONS = []
+
+
+def migration(version, description, vacuum=False):
+    """Register a schema migration; vacuum=True reclaims the space it freed once it commits"""
+    def decorator(fn):
+        MIGRATIONS.append((version, description, fn, vacuum))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return decorator
+
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def add_column_if_missing(conn, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists"""
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+    if column not in columns:
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+def database_size(conn):
+    """Size of the main database file in bytes"""
+    page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    return page_count * page_size
+
+
+def vacuum_database(conn):
+    """VACUUM the database, returning its (size before, size after) in bytes"""
+    before = database_size(conn)
+    if conn.execute('PRAGMA freelist_count').fetchone()[0] == 0:
+        # Nothing to reclaim (e.g. a fresh database)
+        return before, before
+    try:
+        conn.execute('VACUUM')
+    except Exception as e:
+        # Another connection is busy; the pages stay free for reuse until the next VACUUM
+        print(f"Database VACUUM skipped: {e}")
+        return before, before
+    after = database_size(conn)
+    print(f"Vacuumed database: {before} -> {after} bytes")
+    return before, after
+
+
+def apply_migrations(conn):
+    """Bring the database schema up to the latest version, returning the versions applied"""
+    applied = []
+    for version, description, fn, vacuum in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+        # IMMEDIATE takes the write lock up front so concurrent workers
+        # starting at the same time cannot apply the same migration twice
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            fn(conn)
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Applied database migration {version}: {description}")
+        applied.append(version)
+        if vacuum:
+            vacuum_database(conn)
+    return applied
+
+
+@migration(1, 'baseline schema')
+def _baseline_schema(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            full_name TEXT,
+            role TEXT DEFAULT 'user',
+            phone TEXT,
+            company TEXT,
+            position TEXT,
+            experience_years INTEGER,
+            skills TEXT,
+            bio TEXT,
+            profile_picture TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS interview_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            session_id TEXT UNIQUE,
+            job_role TEXT,
+            resume_data TEXT,
+            questions TEXT,
+            answers TEXT,
+            scores TEXT,
+            overall_score INTEGER,
+            status TEXT DEFAULT 'completed',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS interview_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            session_id TEXT,
+            preferred_date DATETIME,
+            preferred_time TEXT,
+            message TEXT,
+            status TEXT DEFAULT 'pending',
+            recruiter_id INTEGER,
+            recruiter_response TEXT,
+            scheduled_date DATETIME,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            recruiter_proposed_date TEXT,
+            recruiter_proposed_time TEXT,
+            user_response TEXT DEFAULT 'pending',
+            user_proposed_date TEXT,
+            user_proposed_time TEXT,
+            final_date TEXT,
+            final_time TEXT,
+            workflow_status TEXT DEFAULT 'recruiter_scheduling',
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (recruiter_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            message TEXT NOT NULL,
+            data TEXT,
+            is_read BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    # Databases created before these columns existed were patched by hand;
+    # make sure every installation ends up with the same shape
+    for column, definition in [
+        ('role', "TEXT DEFAULT 'user'"),
+        ('phone', 'TEXT'),
+        ('company', 'TEXT'),
+        ('position', 'TEXT'),
+        ('experience_years', 'INTEGER'),
+        ('skills', 'TEXT'),
+        ('bio', 'TEXT'),
+        ('profile_picture', 'TEXT'),
+    ]:
+        add_column_if_missing(conn, 'users', column, definition)
+
+    add_column_if_missing(conn, 'interview_sessions', 'overall_score', 'INTEGER')
+    add_column_if_missing(conn, 'interview_sessions', 'status', "TEXT DEFAULT 'completed'")
+
+    for column, definition in [
+        ('recruiter_proposed_date', 'TEXT'),
+        ('recruiter_proposed_time', 'TEXT'),
+        ('user_response', "TEXT DEFAULT 'pending'"),
+        ('user_proposed_date', 'TEXT'),
+        ('user_proposed_time', 'TEXT'),
+        ('final_date', 'TEXT'),
+        ('final_time', 'TEXT'),
+        ('workflow_status', "TEXT DEFAULT 'recruiter_scheduling'"),
+    ]:
+        add_column_if_missing(conn, 'interview_requests', column, definition)
+
+
+@migration(2, 'indexes for hot queries')
+def _hot_query_indexes(conn):
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_interview_sessions_user_created ON interview_sessions (user_id, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_notifications_user_read_created ON notifications (user_id, is_read, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_interview_requests_status_created ON interview_requests (status, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_interview_requests_recruiter ON interview_requests (recruiter_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_interview_requests_user_created ON interview_requests (user_id, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_users_role ON users (role)')
+
+
+@migration(3, 'row-per-answer session_answers/session_scores tables')
+def _session_answer_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_answers (
+            session_id TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            answer TEXT,
+            answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (session_id, question_id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_scores (
+            session_id TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            feedback TEXT,
+            areas_to_improve TEXT,  -- JSON list
+            PRIMARY KEY (session_id, question_id)
+        )
+    ''')
+
+    # interview_sessions.overall_score is the rounded average of the session's
+    # scores; keep it current whenever a score row is written or replaced
+    for event in ('INSERT', 'UPDATE OF score', 'DELETE'):
+        row = 'OLD' if event == 'DELETE' else 'NEW'
+        trigger = 'trg_session_scores_' + event.split()[0].lower()
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {trigger}
+            AFTER {event} ON session_scores
+            BEGIN
+                UPDATE interview_sessions
+                SET overall_score = (
+                    SELECT CAST(ROUND(AVG(score)) AS INTEGER)
+                    FROM session_scores WHERE session_id = {row}.session_id
+                )
+                WHERE session_id = {row}.session_id;
+            END
+        ''')
+
+    backfill_session_answers(conn)
+
+
+@migration(4, 'candidate_stats leaderboard')
+def _candidate_stats(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS candidate_stats (
+            user_id INTEGER PRIMARY KEY,
+            best_score INTEGER,
+            latest_score INTEGER,
+            total_interviews INTEGER NOT NULL DEFAULT 0,
+            last_activity TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_candidate_stats_best ON candidate_stats (best_score DESC)')
+
+    # The stats are maintained by triggers, so the insert in upload_resume and
+    # the score upserts in submit_answer update them in the same transaction
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_candidate_stats_user_insert
+        AFTER INSERT ON users
+        WHEN COALESCE(NEW.role, 'user') = 'user'
+        BEGIN
+            INSERT OR IGNORE INTO candidate_stats (user_id, last_activity)
+            VALUES (NEW.id, CURRENT_TIMESTAMP);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_candidate_stats_session_insert
+        AFTER INSERT ON interview_sessions
+        BEGIN
+            INSERT OR IGNORE INTO candidate_stats (user_id) VALUES (NEW.user_id);
+            UPDATE candidate_stats
+            SET total_interviews = total_interviews + 1, last_activity = CURRENT_TIMESTAMP
+            WHERE user_id = NEW.user_id;
+        END
+    ''')
+    # A rescored answer can lower a session's score, so best_score is re-derived
+    # from the candidate's own sessions rather than kept as a running maximum
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_candidate_stats_session_score
+        AFTER UPDATE OF overall_score ON interview_sessions
+        WHEN NEW.overall_score IS NOT NULL
+        BEGIN
+            UPDATE candidate_stats
+            SET latest_score = NEW.overall_score,
+                best_score = (SELECT MAX(overall_score) FROM interview_sessions WHERE user_id = NEW.user_id),
+                last_activity = CURRENT_TIMESTAMP
+            WHERE user_id = NEW.user_id;
+        END
+    ''')
+
+    conn.execute('''
+        INSERT OR REPLACE INTO candidate_stats (user_id, best_score, latest_score, total_interviews, last_activity)
+        SELECT u.id,
+               (SELECT MAX(s.overall_score) FROM interview_sessions s WHERE s.user_id = u.id),
+               (SELECT s.overall_score FROM interview_sessions s
+                WHERE s.user_id = u.id AND s.overall_score IS NOT NULL
+                ORDER BY s.created_at DESC LIMIT 1),
+               (SELECT COUNT(*) FROM interview_sessions s WHERE s.user_id = u.id),
+               COALESCE((SELECT MAX(s.created_at) FROM interview_sessions s WHERE s.user_id = u.id), u.created_at)
+        FROM users u
+        WHERE u.role = 'user' OR EXISTS (SELECT 1 FROM interview_sessions s WHERE s.user_id = u.id)
+    ''')
+
+
+@migration(5, 'sort-key indexes for the paginated candidate list')
+def _candidate_sort_indexes(conn):
+    # NULL scores/dates are folded to a sentinel so keyset cursors never have
+    # to compare against NULL; the query expressions must match these exactly
+    conn.execute('DROP INDEX IF EXISTS idx_candidate_stats_best')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_candidate_stats_best_key ON candidate_stats (COALESCE(best_score, -1))')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_candidate_stats_latest_key ON candidate_stats (COALESCE(latest_score, -1))')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_candidate_stats_activity_key ON candidate_stats (COALESCE(last_activity, ''))")
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_candidate_stats_interviews ON candidate_stats (total_interviews)')
+
+
+@migration(6, 'question counts and types for session summaries')
+def _session_summary_columns(conn):
+    add_column_if_missing(conn, 'interview_sessions', 'question_count', 'INTEGER')
+    add_column_if_missing(conn, 'session_scores', 'question_type', 'TEXT')
+
+    rows = conn.execute('''
+        SELECT session_id, questions FROM interview_sessions
+        WHERE session_id IS NOT NULL AND questions IS NOT NULL
+    ''').fetchall()
+    for session_id, questions_json in rows:
+        try:
+            questions = json.loads(questions_json)
+        except ValueError:
+            continue
+        if not isinstance(questions, list):
+            continue
+        conn.execute('UPDATE interview_sessions SET question_count = ? WHERE session_id = ?', (len(questions), session_id))
+        conn.executemany(
+            'UPDATE session_scores SET question_type = ? WHERE session_id = ? AND question_id = ?',
+            [(q.get('type'), session_id, str(q.get('id'))) for q in questions if isinstance(q, dict)])
+
+
+@migration(7, 'persistent answer scoring cache')
+def _score_cache(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS score_cache (
+            cache_key TEXT PRIMARY KEY,
+            version TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_score_cache_created ON score_cache (created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_score_cache_version ON score_cache (version)')
+
+
+@migration(8, 'content-addressed resume parse cache')
+def _resume_cache(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS resume_cache (
+            cache_key TEXT PRIMARY KEY,
+            version TEXT NOT NULL,
+            result TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            source_size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        )
+    ''')
+    # Covers both the LRU order and the SUM(size) of the eviction check
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_resume_cache_lru ON resume_cache (last_used, size)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_resume_cache_version ON resume_cache (version)')
+
+
+
+@migration(9, 'scores_version for cached reports')
+def _session_scores_version(conn):
+    add_column_if_missing(conn, 'interview_sessions', 'scores_version', 'INTEGER NOT NULL DEFAULT 0')
+    # Cached PDF reports are keyed by this version, so every write to a
+    # session's scores (including feedback-only updates) must bump it
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        row = 'OLD' if event == 'DELETE' else 'NEW'
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_session_scores_version_{event.lower()}
+            AFTER {event} ON session_scores
+            BEGIN
+                UPDATE interview_sessions
+                SET scores_version = scores_version + 1
+                WHERE session_id = {row}.session_id;
+            END
+        ''')
+
+
+@migration(10, 'precomputed session_results summaries')
+def _session_results(conn):
+    from session_results import backfill_session_results
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_results (
+            session_id TEXT PRIMARY KEY,
+            answered_count INTEGER NOT NULL DEFAULT 0,
+            total_questions INTEGER NOT NULL DEFAULT 0,
+            avg_score REAL,
+            min_score REAL,
+            max_score REAL,
+            improvements TEXT NOT NULL,     -- JSON list, most frequent first
+            category_scores TEXT NOT NULL,  -- JSON {question_type: average}
+            skills TEXT NOT NULL,           -- JSON list
+            detailed_scores TEXT NOT NULL,  -- JSON {question_id: score}, in question order
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    backfill_session_results(conn)
+
+
+@migration(11, 'compressed, deduplicated resume text storage', vacuum=True)
+def _resume_texts(conn):
+    from resume_store import compact_resume_data
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS resume_texts (
+            text_hash TEXT PRIMARY KEY,     -- SHA-256 of the text
+            content BLOB NOT NULL,          -- zlib-compressed UTF-8 text
+            size INTEGER NOT NULL,
+            compressed_size INTEGER NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
+    add_column_if_missing(conn, 'interview_sessions', 'resume_text_hash', 'TEXT')
+    compacted, before, after = compact_resume_data(conn)
+    print(f"Compacted resume data of {compacted} sessions: {before} -> {after} bytes")
+
+
+def _iter_legacy_scores(questions, scores):
+    """Yield (question_id, score_dict) pairs from either legacy scores format"""
+    if isinstance(scores, dict):
+        items = scores.items()
+    elif isinstance(scores, list):
+        # Old list format: scores are in question order
+        question_ids = [q.get('id') for q in questions if isinstance(q, dict)] if isinstance(questions, list) else []
+        items = zip(question_ids, scores)
+    else:
+        return
+    for question_id, score_data in items:
+        if isinstance(score_data, (int, float)):
+            score_data = {'score': score_data}
+        if not isinstance(score_data, dict) or question_id is None:
+            continue
+        try:
+            score = int(float(score_data.get('score')))
+        except (TypeError, ValueError):
+            continue
+        areas = score_data.get('areas_to_improve')
+        yield str(question_id), {
+            'score': score,
+            'feedback': score_data.get('feedback'),
+            'areas_to_improve': areas if isinstance(areas, list) else [],
+        }
+
+
+def backfill_session_answers(conn):
+    """Copy answers/scores from the legacy JSON columns into the row-per-answer tables"""
+    rows = conn.execute('''
+        SELECT session_id, questions, answers, scores FROM interview_sessions
+        WHERE session_id IS NOT NULL AND (answers IS NOT NULL OR scores IS NOT NULL)
+    ''').fetchall()
+    migrated = 0
+    for session_id, questions_json, answers_json, scores_json in rows:
+        try:
+            questions = json.loads(questions_json) if questions_json else []
+            answers = json.loads(answers_json) if answers_json else {}
+            scores = json.loads(scores_json) if scores_json else {}
+        except ValueError:
+            continue
+        if isinstance(answers, dict):
+            conn.executemany('''
+                INSERT OR IGNORE INTO session_answers (session_id, question_id, answer)
+                VALUES (?, ?, ?)
+            ''', [(session_id, str(qid), answer) for qid, answer in answers.items()])
+        conn.executemany('''
+            INSERT OR IGNORE INTO session_scores (session_id, question_id, score, feedback, areas_to_improve)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (session_id, qid, data['score'], data['feedback'], json.dumps(data['areas_to_improve']))
+            for qid, data in _iter_legacy_scores(questions, scores)
+        ])
+        migrated += 1
+    return migrated
+
+
+# Queries issued by request handlers on every page load or poll. Keep this in
+# sync with app.py: find_full_scans() fails if any of them scans a whole table.
+HOT_QUERIES = {
+    'verify_user': (
+        'SELECT id, password_hash FROM users WHERE username = ?', ('alice',)),
+    'get_user_info': (
+        'SELECT username, email, full_name, role FROM users WHERE id = ?', (1,)),
+    'review_sessions': (
+        '''SELECT session_id, job_role, created_at FROM interview_sessions
+           WHERE user_id = ? ORDER BY created_at DESC''', (1,)),
+    'profile_interview_requests': (
+        '''SELECT ir.*, u.full_name FROM interview_requests ir
+           LEFT JOIN users u ON ir.recruiter_id = u.id
+           WHERE ir.user_id = ? ORDER BY ir.created_at DESC''', (1,)),
+    'recruiter_candidates_first_page': (
+        '''SELECT u.id, cs.best_score FROM candidate_stats cs CROSS JOIN users u ON u.id = cs.user_id
+           WHERE u.role = 'user'
+           ORDER BY COALESCE(cs.best_score, -1) DESC, cs.user_id DESC LIMIT 51''', ()),
+    'recruiter_candidates_next_page': (
+        '''SELECT u.id, cs.best_score FROM candidate_stats cs CROSS JOIN users u ON u.id = cs.user_id
+           WHERE u.role = 'user'
+             AND COALESCE(cs.best_score, -1) <= ?
+             AND (COALESCE(cs.best_score, -1) < ? OR cs.user_id < ?)
+           ORDER BY COALESCE(cs.best_score, -1) DESC, cs.user_id DESC LIMIT 51''', (70, 70, 12)),
+    'recruiter_candidates_by_activity': (
+        '''SELECT u.id FROM candidate_stats cs CROSS JOIN users u ON u.id = cs.user_id
+           WHERE u.role = 'user'
+             AND COALESCE(cs.last_activity, '') <= ?
+             AND (COALESCE(cs.last_activity, '') < ? OR cs.user_id < ?)
+           ORDER BY COALESCE(cs.last_activity, '') DESC, cs.user_id DESC LIMIT 51''', ('2025', '2025', 3)),
+    'recruiter_candidate_totals': (
+        '''SELECT COUNT(*), COUNT(cs.best_score), SUM(cs.best_score >= 80)
+           FROM users u LEFT JOIN candidate_stats cs ON cs.user_id = u.id
+           WHERE u.role = 'user' ''', ()),
+    'recruiter_dashboard_pending_requests': (
+        '''SELECT ir.*, u.full_name, s.job_role, s.overall_score
+           FROM interview_requests ir
+           JOIN users u ON ir.user_id = u.id
+           LEFT JOIN interview_sessions s ON ir.session_id = s.session_id
+           WHERE ir.status = 'pending' ORDER BY ir.created_at DESC''', ()),
+    'candidate_interview_requests_by_email': (
+        '''SELECT ir.id FROM interview_requests ir JOIN users u ON ir.user_id = u.id
+           WHERE u.email = ? ORDER BY ir.created_at DESC''', ('a@example.com',)),
+    'recruiter_proposals': (
+        'SELECT id FROM interview_requests WHERE recruiter_id = ?', (1,)),
+    'notifications_list': (
+        '''SELECT id, type, title, message, data, is_read, created_at FROM notifications
+           WHERE user_id = ? ORDER BY created_at DESC LIMIT 50''', (1,)),
+    'notifications_unread_count': (
+        'SELECT COUNT(*) FROM notifications WHERE user_id = ? AND is_read = FALSE', (1,)),
+    'notifications_since': (
+        '''SELECT id, type, title, message, data, is_read, created_at FROM notifications
+           WHERE user_id = ? AND id > ? ORDER BY id LIMIT 100''', (1, 0)),
+    'notifications_mark_all_read': (
+        '''UPDATE notifications SET is_read = TRUE, updated_at = CURRENT_TIMESTAMP
+           WHERE user_id = ? AND is_read = FALSE''', (1,)),
+    'session_by_id': (
+        'SELECT questions FROM interview_sessions WHERE session_id = ? AND user_id = ?', ('s', 1)),
+    'session_answer_count': (
+        'SELECT COUNT(*) FROM session_answers WHERE session_id = ?', ('s',)),
+    'session_summaries': (
+        '''SELECT s.session_id, s.job_role, s.created_at, s.overall_score, s.question_count,
+                  (SELECT COUNT(*) FROM session_answers a WHERE a.session_id = s.session_id),
+                  sc.question_type, AVG(sc.score)
+           FROM interview_sessions s
+           LEFT JOIN session_scores sc ON sc.session_id = s.session_id
+           WHERE s.user_id = ?
+           GROUP BY s.id, sc.question_type
+           ORDER BY s.created_at DESC''', (1,)),
+    'session_report_version': (
+        'SELECT scores_version, created_at FROM interview_sessions WHERE session_id = ? AND user_id = ?', ('s', 1)),
+    'resume_text_exists': (
+        'SELECT 1 FROM resume_texts WHERE text_hash = ?', ('h',)),
+    'session_results': (
+        '''SELECT s.job_role, r.answered_count, r.detailed_scores FROM interview_sessions s
+           LEFT JOIN session_results r ON r.session_id = s.session_id
+           WHERE s.session_id = ? AND s.user_id = ?''', ('s', 1)),
+    'session_scores': (
+        '''SELECT question_id, score, feedback, areas_to_improve FROM session_scores
+           WHERE session_id = ?''', ('s',)),
+    'score_cache_lookup': (
+        'SELECT result, created_at FROM score_cache WHERE cache_key = ? AND version = ?', ('k', 'v')),
+    'score_cache_purge_versions': (
+        'DELETE FROM score_cache WHERE version < ? OR version > ?', ('v', 'v')),
+    'score_cache_prune_oldest': (
+        '''DELETE FROM score_cache WHERE cache_key IN
+           (SELECT cache_key FROM score_cache ORDER BY created_at LIMIT ?)''', (1,)),
+    'resume_cache_lookup': (
+        'SELECT result FROM resume_cache WHERE cache_key = ? AND version = ?', ('k', 'v')),
+    'resume_cache_purge_versions': (
+        'DELETE FROM resume_cache WHERE version < ? OR version > ?', ('v', 'v')),
+    'resume_cache_totals': (
+        'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resume_cache', ()),
+    'resume_cache_lru': (
+        'SELECT cache_key, size FROM resume_cache ORDER BY last_used', ()),
+}
+
+_FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+
+def find_full_scans(conn, queries=None):
+    """Run EXPLAIN QUERY PLAN on each hot query and return those that scan a whole table"""
+    offenders = []
+    for name, (sql, params) in (queries or HOT_QUERIES).items():
+        for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params):
+            detail = row[-1]
+            if _FULL_SCAN.match(detail):
+                offenders.append((name, detail))
+    return offenders
+
+
+if __name__ == '__main__':
+    from database import db_pool
+
+    with db_pool.connection() as conn:
+        apply_migrations(conn)
+        print(f"Schema version: {get_schema_version(conn)}")
+        if '--backfill-answers' in sys.argv:
+            from session_results import backfill_session_results
+
+            migrated = backfill_session_answers(conn)
+            # The copied scores change the stored summaries, so they are all rebuilt
+            conn.execute('DELETE FROM session_results')
+            backfill_session_results(conn)
+            conn.commit()
+            print(f"Backfilled answers for {migrated} sessions")
+        if '--compact-resumes' in sys.argv:
+            from resume_store import compact_resume_data
+
+            compacted, before, after = compact_resume_data(conn)
+            conn.commit()
+            print(f"Compacted resume data of {compacted} sessions: {before} -> {after} bytes")
+            vacuum_database(conn)
+        if '--check-plans' in sys.argv:
+            offenders = find_full_scans(conn)
+            for name, detail in offenders:
+                print(f"FULL SCAN in {name}: {detail}")
+            if offenders:
+                sys.exit(1)
+            print(f"All {len(HOT_QUERIES)} hot queries use indexes")
@@ -0,0 +1,464 @@
+"""
+TalentMate notification push channel
+
+An in-process publish/subscribe broker that fans new notifications out to
+the Server-Sent Events streams opened by each logged-in browser tab.
+Subscribers only see events published by the same worker process; clients
+resume from the database with Last-Event-ID and fall back to polling when
+no stream is available.
+
+Unread counts are served from a bounded per-user cache that the notification
+write paths keep up to date.
+
+New notifications are written by a background thread that batches them into
+one transaction per flush interval, so request handlers never wait on the
+database write lock.
+"""
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+from database import db_pool
+
+STREAM_MAX_PER_USER = int(os.environ.get('TALENTMATE_SSE_MAX_PER_USER', '5'))
+STREAM_HEARTBEAT = float(os.environ.get('TALENTMATE_SSE_HEARTBEAT', '15'))
+STREAM_LIFETIME = float(os.environ.get('TALENTMATE_SSE_LIFETIME', '300'))
+STREAM_QUEUE_SIZE = 100
+STREAM_RETRY_MS = 3000
+UNREAD_CACHE_SIZE = int(os.environ.get('TALENTMATE_UNREAD_CACHE_SIZE', '10000'))
+WRITER_QUEUE_SIZE = int(os.environ.get('TALENTMATE_NOTIFY_QUEUE_SIZE', '10000'))
+WRITER_FLUSH_INTERVAL = float(os.environ.get('TALENTMATE_NOTIFY_FLUSH_INTERVAL', '0.05'))
+WRITER_SYNC = os.environ.get('TALENTMATE_NOTIFY_SYNC', '').lower() in ('1', 'true', 'yes')
+WRITER_BATCH_SIZE = 500
+WRITER_PUT_TIMEOUT = 1.0
+WRITER_ATTEMPTS = 3
+
+
+class TooManyStreams(Exception):
+    """Raised when a user already has the maximum number of open streams"""
+
+
+def format_sse(event, data, event_id=None):
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscription:
+    """One open stream: a bounded queue of pending messages for a single tab"""
+
+    def __init__(self, broker, user_id, role=None, queue_size=STREAM_QUEUE_SIZE):
+        self.broker = broker
+        self.user_id = user_id
+        self.role = role
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def put(self, event_id, message):
+        """Queue a message; a slow client is disconnected rather than blocking publishers"""
+        try:
+            self._queue.put_nowait((event_id, message))
+            return True
+        except queue.Full:
+            self.overflowed = True
+            return False
+
+    def stream(self, initial=(), last_event_id=None, heartbeat=STREAM_HEARTBEAT, lifetime=STREAM_LIFETIME):
+        """Yield SSE messages until the lifetime ends, the queue overflows or the client goes away"""
+        deadline = time.monotonic() + lifetime
+        try:
+            yield f'retry: {STREAM_RETRY_MS}\n\n'
+            for message in initial:
+                yield message
+            while not self.overflowed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event_id, message = self._queue.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+                    continue
+                # Skip anything already replayed from the database on connect
+                if event_id is not None and last_event_id is not None and event_id <= last_event_id:
+                    continue
+                yield message
+        finally:
+            self.broker.unsubscribe(self)
+
+
+class NotificationBroker:
+    """Fans published events out to every open stream of a user or role"""
+
+    def __init__(self, max_streams_per_user=STREAM_MAX_PER_USER):
+        self.max_streams_per_user = max_streams_per_user
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._stats = {
+            'published': 0,
+            'delivered': 0,
+            'dropped': 0,
+            'rejected': 0,
+            'peak_streams': 0,
+        }
+
+    def subscribe(self, user_id, role=None):
+        """Open a stream for a user, enforcing the per-user connection cap"""
+        with self._lock:
+            streams = self._subscribers.setdefault(user_id, set())
+            if len(streams) >= self.max_streams_per_user:
+                self._stats['rejected'] += 1
+                raise TooManyStreams(f'At most {self.max_streams_per_user} notification streams per user')
+            subscription = Subscription(self, user_id, role)
+            streams.add(subscription)
+            self._stats['peak_streams'] = max(self._stats['peak_streams'], self._count_streams())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Close a stream (idempotent)"""
+        with self._lock:
+            streams = self._subscribers.get(subscription.user_id)
+            if streams is None:
+                return
+            streams.discard(subscription)
+            if not streams:
+                del self._subscribers[subscription.user_id]
+
+    def _count_streams(self):
+        return sum(len(streams) for streams in self._subscribers.values())
+
+    def _deliver(self, targets, event, data, event_id):
+        message = format_sse(event, data, event_id)
+        delivered = dropped = 0
+        for subscription in targets:
+            if subscription.put(event_id, message):
+                delivered += 1
+            else:
+                dropped += 1
+        with self._lock:
+            self._stats['published'] += 1
+            self._stats['delivered'] += delivered
+            self._stats['dropped'] += dropped
+        return delivered
+
+    def publish(self, user_id, event, data, event_id=None):
+        """Send an event to every open stream of one user"""
+        with self._lock:
+            targets = list(self._subscribers.get(user_id, ()))
+        return self._deliver(targets, event, data, event_id)
+
+    def publish_role(self, role, event, data):
+        """Send an event to every open stream of users with the given role"""
+        with self._lock:
+            targets = [sub for streams in self._subscribers.values() for sub in streams if sub.role == role]
+        return self._deliver(targets, event, data, None)
+
+    def stream_count(self, user_id=None):
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscribers.get(user_id, ()))
+            return self._count_streams()
+
+    def stats(self):
+        """Snapshot of broker counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'users': len(self._subscribers),
+                'streams': self._count_streams(),
+                'max_streams_per_user': self.max_streams_per_user,
+            })
+        return snapshot
+
+
+class UnreadCountCache:
+    """LRU map of user id to unread notification count, updated write-through
+
+    Writers adjust entries that are already cached (or invalidate them when
+    the new count is not a simple delta) and leave missing ones alone;
+    readers rebuild a missing entry from the database. Writers wrap the
+    database write and the adjustment in writing(), and a rebuild is only
+    stored if no write started, finished or was in progress while it ran, so
+    a count read before a concurrent insert can never overwrite the newer
+    state, and a count that already includes a committed row is never
+    adjusted for it again.
+    """
+
+    def __init__(self, max_size=UNREAD_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._counts = OrderedDict()
+        self._write_seq = 0
+        self._writing = 0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'stale_fills': 0,
+        }
+
+    def get(self, user_id):
+        """Cached count, or None on a miss"""
+        with self._lock:
+            count = self._counts.get(user_id)
+            if count is None:
+                self._stats['misses'] += 1
+                return None
+            self._counts.move_to_end(user_id)
+            self._stats['hits'] += 1
+            return count
+
+    def token(self):
+        """Write sequence to pass to fill() after loading a count from the database"""
+        with self._lock:
+            return self._write_seq
+
+    def fill(self, user_id, count, token):
+        """Store a freshly loaded count unless a write raced with the load"""
+        with self._lock:
+            if token != self._write_seq or self._writing:
+                self._stats['stale_fills'] += 1
+                return False
+            self._store(user_id, count)
+            return True
+
+    @contextmanager
+    def writing(self):
+        """Wrap a database write and the adjust()/invalidate() calls that follow its commit"""
+        with self._lock:
+            self._write_seq += 1
+            self._writing += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._writing -= 1
+                self._write_seq += 1
+
+    def adjust(self, user_id, delta):
+        """Apply a committed change to a cached count; returns the new count if cached"""
+        with self._lock:
+            self._write_seq += 1
+            count = self._counts.get(user_id)
+            if count is None:
+                return None
+            count = max(0, count + delta)
+            self._store(user_id, count)
+            return count
+
+    def invalidate(self, user_id):
+        """Drop a user's count so the next read reloads it from the database"""
+        with self._lock:
+            self._write_seq += 1
+            self._counts.pop(user_id, None)
+
+    def _store(self, user_id, count):
+        self._counts[user_id] = count
+        self._counts.move_to_end(user_id)
+        while len(self._counts) > self.max_size:
+            self._counts.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._write_seq += 1
+            self._counts.clear()
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'size': len(self._counts),
+                'max_size': self.max_size,
+            })
+        lookups = snapshot['hits'] + snapshot['misses']
+        snapshot['hit_ratio'] = round(snapshot['hits'] / lookups, 3) if lookups else 0.0
+        return snapshot
+
+
+class NotificationWriter:
+    """Background writer that inserts queued notifications in batches
+
+    Each flush inserts everything queued during one flush interval with a
+    single executemany in one transaction, then updates the unread-count
+    cache and pushes the new rows to open streams. In synchronous mode the
+    same write happens on the calling thread instead (used by the tests).
+    """
+
+    def __init__(self, pool, broker, counts, queue_size=WRITER_QUEUE_SIZE,
+                 flush_interval=WRITER_FLUSH_INTERVAL, synchronous=WRITER_SYNC):
+        self.pool = pool
+        self.broker = broker
+        self.counts = counts
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'batches': 0,
+            'largest_batch': 0,
+            'rejected': 0,
+            'failed': 0,
+            'retries': 0,
+        }
+
+    def submit(self, user_id, notification_type, title, message, data=None):
+        """Queue a notification for writing; returns False if it could not be accepted"""
+        row = (
+            user_id, notification_type, title, message,
+            json.dumps(data) if data else None,
+            # Same format as SQLite's CURRENT_TIMESTAMP, stamped when the event happened
+            datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        )
+        with self._lock:
+            self._stats['submitted'] += 1
+
+        if self.synchronous:
+            return self._write([row], attempts=1)
+
+        self._ensure_thread()
+        try:
+            self._queue.put(row, timeout=WRITER_PUT_TIMEOUT)
+        except queue.Full:
+            with self._lock:
+                self._stats['rejected'] += 1
+            print(f"Notification queue full, dropping notification for user {user_id}")
+            return False
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            # Threads do not survive a fork, so each worker process starts its own
+            self._stopping.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='notification-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < WRITER_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch, attempts=WRITER_ATTEMPTS)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, rows, attempts):
+        # Counts loaded while the rows are being inserted may already include
+        # them, so they must not be cached before adjust() runs
+        with self.counts.writing():
+            return self._insert(rows, attempts)
+
+    def _insert(self, rows, attempts):
+        delay = 0.1
+        for attempt in range(attempts):
+            try:
+                with self.pool.connection() as conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.executemany('''
+                        INSERT INTO notifications (user_id, type, title, message, data, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', rows)
+                    # The write lock is held, so the batch received consecutive ids
+                    last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+                    conn.commit()
+                break
+            except sqlite3.OperationalError as e:
+                if attempt < attempts - 1:
+                    with self._lock:
+                        self._stats['retries'] += 1
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+                with self._lock:
+                    self._stats['failed'] += len(rows)
+                print(f"Error creating notifications: {e}")
+                return False
+            except Exception as e:
+                with self._lock:
+                    self._stats['failed'] += len(rows)
+                print(f"Error creating notifications: {e}")
+                return False
+
+        with self._lock:
+            self._stats['written'] += len(rows)
+            self._stats['batches'] += 1
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(rows))
+
+        first_id = last_id - len(rows) + 1
+        for notification_id, row in enumerate(rows, start=first_id):
+            user_id, notification_type, title, message, data, created_at = row
+            self.counts.adjust(user_id, 1)
+            self.broker.publish(user_id, 'notification', {
+                'id': notification_id,
+                'type': notification_type,
+                'title': title,
+                'message': message,
+                'data': json.loads(data) if data else {},
+                'is_read': False,
+                'created_at': created_at
+            }, event_id=notification_id)
+        return True
+
+    def flush(self):
+        """Block until everything queued so far has been written"""
+        self._queue.join()
+
+    def close(self, timeout=10):
+        """Write out pending notifications and stop the writer thread"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._stopping.set()
+        thread.join(timeout)
+
+    def stats(self):
+        """Snapshot of writer counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot.update({
+            'queue_depth': self._queue.qsize(),
+            'synchronous': self.synchronous,
+            'flush_interval': self.flush_interval,
+        })
+        return snapshot
+
+
+notification_broker = NotificationBroker()
+unread_counts = UnreadCountCache()
+notification_writer = NotificationWriter(db_pool, notification_broker, unread_counts)
+atexit.register(notification_writer.close)
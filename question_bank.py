@@ -0,0 +1,161 @@
+"""
+TalentMate question bank
+
+Interview questions live in a versioned JSON data file
+(data/question_bank.json by default) instead of in code:
+
+    {
+      "version": 1,
+      "questions": [
+        {"type": "coding", "level": "beginner", "text": "..."},
+        {"type": "role_specific", "role_category": "java_fullstack", "text": "..."},
+        {"type": "scenario", "category": "leadership", "text": "..."}
+      ]
+    }
+
+Loading builds an immutable snapshot indexed by (type, level / role category
+/ scenario category), so picking questions is a dict lookup plus a sample
+no matter how large the bank grows. The store checks the file's mtime at
+most every QUESTION_BANK_CHECK_INTERVAL seconds and swaps in a freshly built
+snapshot in one reference assignment, so edits go live in every worker
+without a restart; requests in flight keep the snapshot they started with.
+A file that fails to load is reported and the previous snapshot stays in
+use.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_QUESTION_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'question_bank.json')
+QUESTION_BANK_PATH = os.environ.get('QUESTION_BANK_PATH', DEFAULT_QUESTION_BANK_PATH)
+QUESTION_BANK_CHECK_INTERVAL = float(os.environ.get('QUESTION_BANK_CHECK_INTERVAL', '5'))
+
+# The field that selects questions within each type
+KEY_FIELDS = {
+    'coding': 'level',
+    'role_specific': 'role_category',
+    'scenario': 'category',
+}
+
+
+class QuestionBank:
+    """Immutable snapshot of the question bank with lookup indexes"""
+
+    def __init__(self, questions, version=None, checksum=None):
+        index = {}
+        for question in questions:
+            question_type = question['type']
+            key = question.get(KEY_FIELDS.get(question_type, 'category'))
+            index.setdefault((question_type, key), []).append(question['text'])
+        # Tuples: shared read-only by every request using this snapshot
+        self._index = {key: tuple(texts) for key, texts in index.items()}
+        self.version = version
+        self.checksum = checksum
+        self.size = len(questions)
+
+    @classmethod
+    def from_json(cls, raw):
+        data = json.loads(raw)
+        if not isinstance(data.get('questions'), list):
+            raise ValueError('question bank has no "questions" list')
+        return cls(data['questions'], data.get('version'), hashlib.sha256(raw).hexdigest())
+
+    def get(self, question_type, key):
+        """Questions of a type for a level, role category or scenario category (empty if none)"""
+        return self._index.get((question_type, key), ())
+
+
+class QuestionBankStore:
+    """Current question bank, reloaded atomically when its file changes"""
+
+    def __init__(self, path=QUESTION_BANK_PATH, check_interval=QUESTION_BANK_CHECK_INTERVAL, clock=time.monotonic):
+        self.path = path
+        self.check_interval = check_interval
+        self.clock = clock
+        self._reload_lock = threading.Lock()
+        self._bank = None
+        self._mtime = None
+        self._next_check = 0.0
+        self._stats = {
+            'reloads': 0,
+            'reload_errors': 0,
+            'last_error': None,
+            'load_ms': None,
+        }
+        self.reload()
+        if self._bank is None:
+            raise RuntimeError(f"Could not load question bank {path}: {self._stats['last_error']}")
+
+    def current(self):
+        """The bank to use for this request, picking up file changes first"""
+        if self.clock() >= self._next_check:
+            self._check()
+        return self._bank
+
+    def _check(self):
+        # Only one thread stats and reloads; the others keep using the current snapshot
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = self.clock() + self.check_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                self._failed(e)
+                return
+            if mtime != self._mtime:
+                self._load(mtime)
+        finally:
+            self._reload_lock.release()
+
+    def reload(self):
+        """Reload the file now; returns True if the new bank is in use"""
+        with self._reload_lock:
+            self._next_check = self.clock() + self.check_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                self._failed(e)
+                return False
+            return self._load(mtime)
+
+    def _load(self, mtime):
+        started = time.perf_counter()
+        try:
+            with open(self.path, 'rb') as file:
+                bank = QuestionBank.from_json(file.read())
+        except Exception as e:
+            # Keep serving the previous bank; a half-written file is retried on the next check
+            self._failed(e)
+            return False
+        self._bank = bank
+        self._mtime = mtime
+        self._stats['reloads'] += 1
+        self._stats['last_error'] = None
+        self._stats['load_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        print(f"Loaded question bank version {bank.version} ({bank.size} questions)")
+        return True
+
+    def _failed(self, error):
+        self._stats['reload_errors'] += 1
+        self._stats['last_error'] = str(error)
+        print(f"Error loading question bank {self.path}: {error}")
+
+    def stats(self):
+        """Snapshot of the loaded bank and reload counters"""
+        bank = self._bank
+        snapshot = dict(self._stats)
+        snapshot.update({
+            'path': self.path,
+            'version': bank.version if bank else None,
+            'checksum': bank.checksum[:12] if bank else None,
+            'questions': bank.size if bank else 0,
+            'check_interval': self.check_interval,
+        })
+        return snapshot
+
+
+question_bank_store = QuestionBankStore()
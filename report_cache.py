@@ -0,0 +1,225 @@
+"""
+TalentMate PDF report cache
+
+Rendered reports are cached under a key derived from the session id, the
+session's scores_version (bumped by the session_scores triggers whenever an
+answer is scored or rescored) and the report layout version, so a new answer
+makes the old report unreachable instead of having to find and delete it.
+The key doubles as the report's strong ETag: rendering is deterministic, so
+equal keys always mean byte-identical PDFs.
+
+There are two tiers: a byte-bounded LRU in memory, and a directory of PDF
+files shared by every worker process and surviving restarts, pruned to a
+byte budget by evicting the least recently used files. Each process keeps a
+running total of the directory's size, so the directory is only listed when
+that total passes the budget (pruning then goes a little below it) or every
+DISK_RESCAN_EVERY writes to pick up what other workers wrote. Stale versions
+of a report age out of both tiers like any other unused entry.
+
+The directory defaults to instance/report-cache next to the app, readable
+only by the app's user, rather than a fixed name in the shared temp
+directory.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from reports import REPORT_VERSION
+
+DEFAULT_REPORT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'report-cache')
+REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', DEFAULT_REPORT_CACHE_DIR)
+REPORT_CACHE_MEMORY_BYTES = int(os.environ.get('REPORT_CACHE_MEMORY_BYTES', str(32 * 1024 * 1024)))
+REPORT_CACHE_DISK_BYTES = int(os.environ.get('REPORT_CACHE_DISK_BYTES', str(512 * 1024 * 1024)))
+DISK_RESCAN_EVERY = 1000
+DISK_PRUNE_TARGET = 0.9
+
+
+class ReportCache:
+    """Memory LRU in front of an on-disk LRU of rendered reports, both bounded by bytes"""
+
+    def __init__(self, directory=REPORT_CACHE_DIR, memory_bytes=REPORT_CACHE_MEMORY_BYTES,
+                 disk_bytes=REPORT_CACHE_DISK_BYTES, version=REPORT_VERSION):
+        # An empty directory disables the disk tier
+        self.directory = directory or None
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.version = version
+        self._entries = OrderedDict()
+        self._size = 0
+        # Running size of the disk tier; None until the directory is first listed
+        self._disk_size = None
+        self._writes_since_scan = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stored': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+            'disk_scans': 0,
+            'disk_errors': 0,
+        }
+        if self.directory:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def key(self, session_id, scores_version):
+        """Cache key and strong ETag of a session's report at a scores version"""
+        payload = f'{self.version}:{session_id}:{scores_version}'
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pdf')
+
+    def get(self, key):
+        """Cached PDF bytes, or None on a miss"""
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return pdf
+
+        pdf = self._load_disk(key) if self.directory else None
+        with self._lock:
+            if pdf is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+            self._store(key, pdf)
+        return pdf
+
+    def contains(self, key):
+        """Whether a report is cached, without reading it or counting a lookup"""
+        with self._lock:
+            if key in self._entries:
+                return True
+        return bool(self.directory) and os.path.exists(self._path(key))
+
+    def put(self, key, pdf):
+        """Remember a freshly rendered report in both tiers"""
+        with self._lock:
+            self._store(key, pdf)
+            self._stats['stored'] += 1
+        if self.directory:
+            self._save_disk(key, pdf)
+
+    def _store(self, key, pdf):
+        if len(pdf) > self.memory_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = pdf
+        self._size += len(pdf)
+        while self._size > self.memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._stats['memory_evictions'] += 1
+
+    def _load_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                pdf = file.read()
+            # The modification time is the disk tier's LRU clock
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self._disk_error(e)
+            return None
+        return pdf
+
+    def _save_disk(self, key, pdf):
+        path = self._path(key)
+        try:
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            # Write then rename so other workers never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(pdf)
+                os.replace(tmp_path, path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+            with self._lock:
+                self._writes_since_scan += 1
+                if self._disk_size is not None:
+                    self._disk_size += len(pdf) - replaced
+                scan = (self._disk_size is None or self._disk_size > self.disk_bytes
+                        or self._writes_since_scan >= DISK_RESCAN_EVERY)
+            if scan:
+                self._prune_disk()
+        except OSError as e:
+            self._disk_error(e)
+
+    def _prune_disk(self):
+        """List the directory, evicting the least recently used files when over budget"""
+        files = []
+        total = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pdf'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        evicted = 0
+        if total > self.disk_bytes:
+            # Go below the budget so the next few writes do not list the directory again
+            target = self.disk_bytes * DISK_PRUNE_TARGET
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._disk_size = total
+            self._writes_since_scan = 0
+            self._stats['disk_evictions'] += evicted
+            self._stats['disk_scans'] += 1
+
+    def _disk_error(self, error):
+        with self._lock:
+            self._stats['disk_errors'] += 1
+        print(f"Report cache disk error: {error}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'memory_entries': len(self._entries),
+                'memory_bytes': self._size,
+                'memory_max_bytes': self.memory_bytes,
+                'disk_bytes': self._disk_size or 0,
+                'disk_max_bytes': self.disk_bytes if self.directory else 0,
+                'directory': self.directory,
+                'version': self.version,
+            })
+        lookups = snapshot['memory_hits'] + snapshot['disk_hits'] + snapshot['misses']
+        hits = snapshot['memory_hits'] + snapshot['disk_hits']
+        snapshot['hit_ratio'] = round(hits / lookups, 3) if lookups else 0.0
+        return snapshot
+
+
+report_cache = ReportCache()
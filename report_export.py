@@ -0,0 +1,213 @@
+"""
+TalentMate bulk report export
+
+Recruiters export the reports of every session matching a filter as one ZIP
+archive. Reports missing from the report cache are rendered in a pool of
+worker processes, so several PDFs are built in parallel without holding the
+web server's GIL; at most EXPORT_WINDOW renders are in flight and results
+are consumed in order, so the archive lists sessions in query order.
+
+The archive is written by zipfile into a sink that hands each entry's bytes
+to the response as soon as it is written (entries use data descriptors, so
+the output never has to be seekable). Memory use is bounded by the render
+window rather than the number of matching sessions; the only per-entry cost
+is zipfile's central directory record (well under 1 KB each).
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from reports import render_report
+
+EXPORT_WORKERS = int(os.environ.get('REPORT_EXPORT_WORKERS', str(min(4, os.cpu_count() or 1))))
+EXPORT_WINDOW = int(os.environ.get('REPORT_EXPORT_WINDOW', str(EXPORT_WORKERS * 2)))
+EXPORT_TIMEOUT = float(os.environ.get('REPORT_EXPORT_TIMEOUT', '60'))
+EXPORT_MAX_CONCURRENT = int(os.environ.get('REPORT_EXPORT_MAX_CONCURRENT', '2'))
+
+
+class ExportBusy(Exception):
+    """Raised when the maximum number of exports is already streaming"""
+
+
+class ZipSink:
+    """Write-only file object that buffers what zipfile writes until it is drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    """Yield a ZIP archive of (name, data) entries piece by piece"""
+    sink = ZipSink()
+    with zipfile.ZipFile(sink, 'w', compression=compression) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            yield sink.drain()
+    yield sink.drain()
+
+
+class ReportExportPool:
+    """Process pool rendering many reports in order with a bounded number in flight"""
+
+    def __init__(self, workers=EXPORT_WORKERS, window=EXPORT_WINDOW, timeout=EXPORT_TIMEOUT,
+                 max_concurrent=EXPORT_MAX_CONCURRENT):
+        self.workers = workers
+        self.window = max(window, 1)
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._stats = {
+            'exports': 0,
+            'rejected': 0,
+            'reports': 0,
+            'rendered': 0,
+            'cached': 0,
+            'failed': 0,
+            'restarts': 0,
+            'seconds_total': 0.0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Spawned workers do not inherit the web server's threads or sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+                self._pid = os.getpid()
+            return self._executor
+
+    def _restart(self, executor):
+        """Drop a broken or stuck pool; a new one is started for the next render"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self._stats['restarts'] += 1
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    def begin(self):
+        """Admit one export; raises ExportBusy when max_concurrent are already running"""
+        with self._lock:
+            if self._active >= self.max_concurrent:
+                self._stats['rejected'] += 1
+                raise ExportBusy('Too many report exports are running, please retry shortly')
+            self._active += 1
+            self._stats['exports'] += 1
+
+    def end(self):
+        with self._lock:
+            self._active -= 1
+
+    def render_many(self, tasks):
+        """Yield (name, pdf, rendered, error) for (name, cached_pdf, render_args) tasks, in order
+
+        Tasks with a cached PDF pass straight through; the others are rendered
+        in the pool. A failed render yields pdf None and the error message.
+        """
+        in_flight = deque()
+        try:
+            for name, pdf, args in tasks:
+                if pdf is not None:
+                    in_flight.append((name, pdf, None, None))
+                else:
+                    in_flight.append(self._submit(name, args))
+                while len(in_flight) > self.window:
+                    yield self._collect(in_flight.popleft())
+            while in_flight:
+                yield self._collect(in_flight.popleft())
+        finally:
+            # The client went away or a task failed hard: stop work nobody will read
+            for _, _, future, _ in in_flight:
+                if future is not None:
+                    future.cancel()
+
+    def _submit(self, name, args):
+        executor = self._get_executor()
+        try:
+            return name, None, executor.submit(render_report, *args), (executor, time.monotonic())
+        except (BrokenProcessPool, RuntimeError):
+            # RuntimeError: the pool was shut down by a restart in another thread
+            self._restart(executor)
+            executor = self._get_executor()
+            return name, None, executor.submit(render_report, *args), (executor, time.monotonic())
+
+    def _collect(self, item):
+        name, pdf, future, submitted = item
+        if future is None:
+            with self._lock:
+                self._stats['reports'] += 1
+                self._stats['cached'] += 1
+            return name, pdf, False, None
+
+        executor, started = submitted
+        try:
+            pdf = future.result(timeout=max(started + self.timeout - time.monotonic(), 0))
+            error = None
+        except FutureTimeout:
+            self._restart(executor)
+            pdf, error = None, f'Rendering took longer than {self.timeout:g}s'
+        except BrokenProcessPool:
+            self._restart(executor)
+            pdf, error = None, 'Report worker crashed'
+        except Exception as e:
+            pdf, error = None, str(e)
+        with self._lock:
+            self._stats['reports'] += 1
+            if error is None:
+                self._stats['rendered'] += 1
+                self._stats['seconds_total'] += time.monotonic() - started
+            else:
+                self._stats['failed'] += 1
+        if error is not None:
+            print(f"Error rendering exported report {name}: {error}")
+        return name, pdf, error is None, error
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=False)
+
+    def stats(self):
+        """Snapshot of export counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'active_exports': self._active,
+                'max_concurrent': self.max_concurrent,
+                'workers': self.workers,
+                'window': self.window,
+                'started': self._executor is not None,
+            })
+        total = snapshot.pop('seconds_total')
+        snapshot['avg_seconds'] = round(total / snapshot['rendered'], 4) if snapshot['rendered'] else 0.0
+        return snapshot
+
+
+report_export_pool = ReportExportPool()
+atexit.register(report_export_pool.shutdown)
@@ -0,0 +1,208 @@
+"""
+TalentMate report render jobs
+
+PDF reports are rendered on a small bounded thread pool instead of the
+request thread. A job's id is the report's cache key (session, scores
+version and layout version), so every request for the same report while it
+is queued or rendering joins the one job instead of starting another render;
+once a new answer bumps the scores version, the next request gets a new job.
+
+Finished jobs are remembered for REPORT_JOB_TTL seconds so clients can poll
+their status; the PDF itself goes to the report cache, whose byte budgets
+bound it, so renders should return it only when it could not be cached. Like notification
+streams, the job table belongs to one worker process; the rendered report is
+visible to every worker through the cache's disk tier.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', '2'))
+REPORT_MAX_PENDING = int(os.environ.get('REPORT_MAX_PENDING', str(REPORT_WORKERS * 8)))
+REPORT_JOB_TTL = float(os.environ.get('REPORT_JOB_TTL', '300'))
+REPORT_TIMEOUT = float(os.environ.get('REPORT_TIMEOUT', '60'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class ReportQueueFull(Exception):
+    """Raised when too many reports are already queued or rendering"""
+
+
+class ReportJobFailed(Exception):
+    """Raised to callers waiting on a job whose render failed"""
+
+
+class ReportJob:
+    """One report render, shared by every request for the same report"""
+
+    def __init__(self, job_id, session_id, user_id, now):
+        self.id = job_id
+        self.session_id = session_id
+        self.user_id = user_id
+        self.status = QUEUED
+        self.error = None
+        self.created_at = now
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+
+    def to_dict(self, queue_position=None):
+        """Status of the job as returned by the polling endpoint"""
+        data = {
+            'job_id': self.id,
+            'session_id': self.session_id,
+            'status': self.status,
+        }
+        if self.status == QUEUED:
+            data['queue_position'] = queue_position
+        if self.started_at is not None:
+            data['wait_ms'] = round((self.started_at - self.created_at) * 1000, 1)
+        if self.finished_at is not None:
+            data['render_ms'] = round((self.finished_at - self.started_at) * 1000, 1)
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+class ReportJobPool:
+    """Bounded thread pool of report renders, deduplicated by report key"""
+
+    def __init__(self, workers=REPORT_WORKERS, max_pending=REPORT_MAX_PENDING,
+                 ttl=REPORT_JOB_TTL, clock=time.monotonic):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.clock = clock
+        self._executor = None
+        self._pid = None
+        # job id -> job, in submission order (queue positions are counted in it)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'deduplicated': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'render_ms_total': 0.0,
+        }
+
+    def _ensure_executor(self):
+        # Threads do not survive a fork, so each worker process starts its own pool
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='report-render')
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, job_id, session_id, user_id, render):
+        """The job rendering this report, starting one with render() if none is in progress
+
+        Raises ReportQueueFull when max_pending renders are already queued or running.
+        """
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            job = self._jobs.get(job_id)
+            if job is not None and job.status != FAILED:
+                self._stats['deduplicated'] += 1
+                return job
+            if self._active() >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise ReportQueueFull(f'{self.max_pending} reports are already being rendered')
+            job = ReportJob(job_id, session_id, user_id, now)
+            self._jobs.pop(job_id, None)
+            self._jobs[job_id] = job
+            self._stats['submitted'] += 1
+            job.future = self._ensure_executor().submit(self._run, job, render)
+        return job
+
+    def _run(self, job, render):
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = self.clock()
+        try:
+            pdf = render()
+        except Exception as e:
+            with self._lock:
+                job.status = FAILED
+                job.error = str(e)
+                job.finished_at = self.clock()
+                self._stats['failed'] += 1
+            print(f"Error rendering report for session {job.session_id}: {e}")
+            raise ReportJobFailed(str(e))
+        with self._lock:
+            job.status = DONE
+            job.finished_at = self.clock()
+            self._stats['completed'] += 1
+            self._stats['render_ms_total'] += (job.finished_at - job.started_at) * 1000
+        return pdf
+
+    def wait(self, job, timeout=REPORT_TIMEOUT):
+        """Result of a job's render, blocking until it finishes
+
+        Raises ReportJobFailed if the render failed and
+        concurrent.futures.TimeoutError if it takes longer than timeout.
+        """
+        return job.future.result(timeout=timeout)
+
+    def get(self, job_id):
+        """A job that is in progress or finished within the TTL, or None"""
+        with self._lock:
+            self._prune(self.clock())
+            return self._jobs.get(job_id)
+
+    def status(self, job):
+        """The job's status, with its place in the queue while it waits"""
+        with self._lock:
+            position = None
+            if job.status == QUEUED:
+                position = 1
+                for other in self._jobs.values():
+                    if other is job:
+                        break
+                    if other.status == QUEUED:
+                        position += 1
+            return job.to_dict(position)
+
+    def _active(self):
+        return sum(1 for job in self._jobs.values() if job.status in (QUEUED, RUNNING))
+
+    def _prune(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def stats(self):
+        """Snapshot of queue depth and job counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            queued = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            running = sum(1 for job in self._jobs.values() if job.status == RUNNING)
+            snapshot.update({
+                'queued': queued,
+                'running': running,
+                'tracked_jobs': len(self._jobs),
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+            })
+        total_ms = snapshot.pop('render_ms_total')
+        snapshot['avg_render_ms'] = round(total_ms / snapshot['completed'], 1) if snapshot['completed'] else 0.0
+        return snapshot
+
+
+report_jobs = ReportJobPool()
+atexit.register(report_jobs.shutdown)
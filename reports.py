@@ -0,0 +1,103 @@
+"""
+TalentMate PDF interview reports
+
+render_report turns a session's questions, scores and resume summary into
+PDF bytes. Rendering is deterministic (reportlab's invariant mode, and the
+report is dated with the session's creation time), so the same session at
+the same scores version always produces byte-identical output; the report
+cache relies on this to serve strong ETags.
+
+Bump REPORT_VERSION whenever the report layout changes so cached copies of
+the old layout are no longer served.
+"""
+
+import io
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+from session_results import numeric_scores
+
+REPORT_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def report_styles():
+    """Paragraph styles shared by every report (built once per process)"""
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=colors.darkblue
+    )
+    return styles, title_style
+
+
+def render_report(session_id, job_role, created_at, questions_data, answered_count, scores_data, resume_data):
+    """PDF bytes of an interview report"""
+    styles, title_style = report_styles()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, invariant=1)
+    story = []
+
+    # Title
+    story.append(Paragraph("TalentMate Mock Interview Report", title_style))
+    story.append(Spacer(1, 20))
+
+    # Session info
+    story.append(Paragraph(f"<b>Session ID:</b> {session_id}", styles['Normal']))
+    story.append(Paragraph(f"<b>Job Role:</b> {job_role}", styles['Normal']))
+    story.append(Paragraph(f"<b>Date:</b> {str(created_at or '')[:16]}", styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    # Overall performance
+    scores = numeric_scores(scores_data)
+    if scores:
+        avg_score = sum(scores) / len(scores)
+        story.append(Paragraph("Overall Performance", styles['Heading2']))
+        story.append(Paragraph(f"Average Score: {avg_score:.1f}/100", styles['Normal']))
+        story.append(Paragraph(f"Questions Answered: {answered_count}/{len(questions_data) if isinstance(questions_data, (list, dict)) else 0}", styles['Normal']))
+        story.append(Spacer(1, 20))
+
+    # Detailed question analysis
+    story.append(Paragraph("Detailed Question Analysis", styles['Heading2']))
+
+    if isinstance(questions_data, list):
+        for i, question in enumerate(questions_data):
+            if isinstance(question, dict) and 'id' in question:
+                question_id = question['id']
+                if isinstance(scores_data, dict) and question_id in scores_data:
+                    score_data = scores_data[question_id]
+
+                    if isinstance(score_data, dict):
+                        story.append(Paragraph(f"Question {i+1}: {question.get('category', 'General')}", styles['Heading3']))
+                        story.append(Paragraph(f"<b>Q:</b> {question.get('question', 'N/A')}", styles['Normal']))
+                        story.append(Paragraph(f"<b>Score:</b> {score_data.get('score', 0)}/100", styles['Normal']))
+                        story.append(Paragraph(f"<b>Feedback:</b> {score_data.get('feedback', 'No feedback available')}", styles['Normal']))
+
+                        if score_data.get('areas_to_improve') and isinstance(score_data['areas_to_improve'], list):
+                            story.append(Paragraph("<b>Areas to Improve:</b>", styles['Normal']))
+                            for improvement in score_data['areas_to_improve']:
+                                story.append(Paragraph(f"• {improvement}", styles['Normal']))
+
+                        story.append(Spacer(1, 15))
+
+    # Skills and recommendations
+    story.append(Paragraph("Skills Identified", styles['Heading2']))
+    skills = resume_data.get('skills', []) if isinstance(resume_data, dict) else []
+    if skills and isinstance(skills, list):
+        for skill in skills:
+            if isinstance(skill, str):
+                story.append(Paragraph(f"• {skill.title()}", styles['Normal']))
+    else:
+        story.append(Paragraph("No specific technical skills identified", styles['Normal']))
+
+    story.append(Spacer(1, 20))
+
+    doc.build(story)
+    return buffer.getvalue()
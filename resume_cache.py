@@ -0,0 +1,132 @@
+"""
+TalentMate resume parse cache
+
+Candidates tend to upload the same resume for every mock interview. Parsed
+results are stored in the resume_cache table keyed by the SHA-256 of the
+uploaded bytes, so a repeat upload skips PDF/DOCX extraction entirely and
+every worker process shares the cache. Keys include the parser version, so
+changing the skill tables or extraction budgets makes old entries
+unreachable; stale rows are purged the first time the cache is used. The
+table is kept under a row and byte limit by evicting the least recently
+used entries.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+RESUME_CACHE_ENABLED = os.environ.get('RESUME_CACHE_ENABLED', '1') in ('1', 'true', 'True')
+RESUME_CACHE_MAX_ENTRIES = int(os.environ.get('RESUME_CACHE_MAX_ENTRIES', '5000'))
+RESUME_CACHE_MAX_BYTES = int(os.environ.get('RESUME_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+
+class ResumeCache:
+    """Content-addressed cache of parse results in SQLite with LRU and size-based eviction"""
+
+    def __init__(self, version, pool, max_entries=RESUME_CACHE_MAX_ENTRIES,
+                 max_bytes=RESUME_CACHE_MAX_BYTES, clock=time.time):
+        self.version = version
+        self.pool = pool
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._purged = False
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'bytes_saved': 0,
+            'stored': 0,
+            'evictions': 0,
+            'errors': 0,
+        }
+
+    def key(self, data, filename):
+        """Cache key of an upload: its extension, content hash and the parser version"""
+        extension = os.path.splitext(filename or '')[1].lower()
+        digest = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f'{self.version}:{extension}:{digest}'.encode('utf-8')).hexdigest()
+
+    def _purge_old_versions(self, conn):
+        if self._purged:
+            return
+        conn.execute('DELETE FROM resume_cache WHERE version < ? OR version > ?', (self.version, self.version))
+        conn.commit()
+        self._purged = True
+
+    def get(self, key, size):
+        """Cached parse result, or None on a miss; size is the upload's length in bytes"""
+        try:
+            with self.pool.connection() as conn:
+                self._purge_old_versions(conn)
+                row = conn.execute('SELECT result FROM resume_cache WHERE cache_key = ? AND version = ?',
+                                   (key, self.version)).fetchone()
+                if row is not None:
+                    conn.execute('UPDATE resume_cache SET last_used = ? WHERE cache_key = ?', (self.clock(), key))
+                    conn.commit()
+        except Exception as e:
+            self._error(e)
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            self._stats['bytes_saved'] += size
+        return json.loads(row[0])
+
+    def put(self, key, result, size):
+        """Store a fresh parse result, evicting the least recently used entries over the limits"""
+        payload = json.dumps(result)
+        now = self.clock()
+        try:
+            with self.pool.connection() as conn:
+                self._purge_old_versions(conn)
+                conn.execute('''
+                    INSERT OR REPLACE INTO resume_cache (cache_key, version, result, size, source_size, created_at, last_used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (key, self.version, payload, len(payload), size, now, now))
+                evicted = self._evict(conn)
+                conn.commit()
+        except Exception as e:
+            self._error(e)
+            return
+        with self._lock:
+            self._stats['stored'] += 1
+            self._stats['evictions'] += evicted
+
+    def _evict(self, conn):
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resume_cache').fetchone()
+        excess_entries = count - self.max_entries
+        excess_bytes = total - self.max_bytes
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return 0
+        victims = []
+        for cache_key, size in conn.execute('SELECT cache_key, size FROM resume_cache ORDER BY last_used'):
+            if len(victims) >= excess_entries and excess_bytes <= 0:
+                break
+            victims.append((cache_key,))
+            excess_bytes -= size
+        conn.executemany('DELETE FROM resume_cache WHERE cache_key = ?', victims)
+        return len(victims)
+
+    def _error(self, error):
+        with self._lock:
+            self._stats['errors'] += 1
+        print(f"Resume cache database error: {error}")
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+        lookups = snapshot['hits'] + snapshot['misses']
+        snapshot.update({
+            'hit_ratio': round(snapshot['hits'] / lookups, 3) if lookups else 0.0,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'version': self.version[:12],
+        })
+        return snapshot
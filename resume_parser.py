@@ -0,0 +1,457 @@
+"""
+TalentMate resume parsing
+
+Resumes are read incrementally: PDF pages, DOCX paragraphs and text chunks
+are yielded one at a time and fed to an incremental skill/experience
+detector. Reading stops as soon as the detector's result can no longer
+change, or when the page or character budget runs out, so a huge upload
+never has to be held in memory or extracted in full.
+
+Sources may be file paths, bytes or binary file objects (such as an
+upload's FileStorage.stream), so uploads are parsed without being copied
+to disk first.
+
+PDF and DOCX extraction is CPU-bound pure Python, so uploads are parsed in a
+process pool (ExtractionPool) rather than on the request thread. Each upload
+has a hard deadline after which the stuck workers are killed, the number of
+uploads in flight is bounded, and long PDFs are split into page ranges that
+are extracted in parallel once the first range has not settled the result.
+"""
+
+import atexit
+import codecs
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import docx
+import PyPDF2
+
+from skill_taxonomy import TOKEN_CHARS, TOKEN_PATTERN, skill_taxonomy
+
+RESUME_MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', '50'))
+RESUME_MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', '200000'))
+RESUME_WORKERS = int(os.environ.get('RESUME_WORKERS', '2'))
+RESUME_TIMEOUT = float(os.environ.get('RESUME_TIMEOUT', '20'))
+RESUME_MAX_PENDING = int(os.environ.get('RESUME_MAX_PENDING', str(RESUME_WORKERS * 4)))
+RESUME_FANOUT_PAGES = int(os.environ.get('RESUME_FANOUT_PAGES', '10'))
+RESUME_MAX_SKILLS = int(os.environ.get('RESUME_MAX_SKILLS', '30'))
+TEXT_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_EXPERIENCE_LEVEL = 'intermediate'
+
+# Bump when a change to extraction alters parse results, so cached results are dropped
+PARSER_VERSION = 2
+
+
+def iter_pdf_pages(source, max_pages=RESUME_MAX_PAGES, first_page=0):
+    """Yield the text of each PDF page followed by a newline (source is a path or binary file object)"""
+    reader = PyPDF2.PdfReader(source)
+    for index in range(first_page, min(len(reader.pages), max_pages)):
+        yield (reader.pages[index].extract_text() or '') + '\n'
+
+
+def iter_docx_paragraphs(source):
+    """Yield each DOCX paragraph followed by a newline"""
+    document = docx.Document(source)
+    for paragraph in document.paragraphs:
+        yield paragraph.text + '\n'
+
+
+def iter_text_chunks(source, chunk_size=TEXT_CHUNK_SIZE):
+    """Yield UTF-8 text in fixed-size chunks (source is a path or binary file object)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield from iter_text_chunks(file, chunk_size)
+        return
+    # Incremental decoding keeps multi-byte characters split across reads intact
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        data = source.read(chunk_size)
+        if not data:
+            break
+        yield decoder.decode(data)
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def as_source(source):
+    """Wrap in-memory bytes in a file object; paths and file objects pass through"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def read_source(source):
+    """Bytes of a path, bytes-like object or binary stream"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            return file.read()
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    return source.read()
+
+
+def parser_version(max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS):
+    """Fingerprint of everything that determines a parse result"""
+    return hashlib.sha256(json.dumps({
+        'parser': PARSER_VERSION,
+        'taxonomy': skill_taxonomy.fingerprint,
+        'max_skills': RESUME_MAX_SKILLS,
+        'max_pages': max_pages,
+        'max_chars': max_chars,
+    }, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def iter_resume_file(source, filename=None, max_pages=RESUME_MAX_PAGES):
+    """Pick the extractor for a resume by the extension of filename (or of a source path)"""
+    if filename is None and isinstance(source, (str, os.PathLike)):
+        filename = source
+    extension = os.path.splitext(os.fspath(filename or ''))[1].lower()
+    source = as_source(source)
+    if extension == '.pdf':
+        return iter_pdf_pages(source, max_pages)
+    if extension == '.docx':
+        return iter_docx_paragraphs(source)
+    return iter_text_chunks(source)
+
+
+class ResumeSignals:
+    """Incremental skill and experience detector fed one chunk of text at a time"""
+
+    def __init__(self, taxonomy=None, max_skills=RESUME_MAX_SKILLS):
+        self.taxonomy = taxonomy or skill_taxonomy
+        self.max_skills = min(max_skills, len(self.taxonomy.skills))
+        self.found_skills = set()
+        self.skill_order = []
+        self.levels_seen = set()
+        self._carry = ''
+
+    def feed(self, chunk):
+        text = self._carry + chunk.lower()
+        tokens = TOKEN_PATTERN.findall(text)
+        if not tokens:
+            self._carry = ''
+            return
+        # The last token may continue in the next chunk, so it is not matched yet
+        partial = text[-1] in TOKEN_CHARS
+        scanned = tokens[:-1] if partial else tokens
+        self.skill_order += self.taxonomy.scan(scanned, self.found_skills, self.levels_seen)
+
+        # Phrases may straddle chunks: the last few tokens are scanned again with
+        # the next chunk (re-finding a term is harmless, results are sets)
+        start = len(text)
+        for token in reversed(tokens[-self.taxonomy.depth:]):
+            start = text.rfind(token, 0, start)
+        self._carry = text[start:]
+
+    def finish(self):
+        """Match whatever was held back at the end of the last chunk"""
+        if self._carry:
+            tokens = TOKEN_PATTERN.findall(self._carry)
+            self.skill_order += self.taxonomy.scan(tokens, self.found_skills, self.levels_seen)
+            self._carry = ''
+
+    @property
+    def experience_level(self):
+        if self.levels_seen:
+            return self.taxonomy.levels[min(self.levels_seen)]
+        return DEFAULT_EXPERIENCE_LEVEL
+
+    @property
+    def complete(self):
+        """True once more text cannot change the result"""
+        return 0 in self.levels_seen and len(self.skill_order) >= self.max_skills
+
+    def result(self):
+        # The first max_skills skills mentioned, listed in taxonomy order
+        skills = sorted(self.skill_order[:self.max_skills])
+        return {
+            'skills': [self.taxonomy.skills[index] for index in skills],
+            'experience_level': self.experience_level,
+        }
+
+
+class ParseStats:
+    """Process-wide counters for /api/metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            'parsed': 0,
+            'chunks_read': 0,
+            'chars_read': 0,
+            'early_exits': 0,
+            'char_budget_hits': 0,
+        }
+
+    def record(self, chunks, chars, early_exit, char_budget_hit):
+        with self._lock:
+            self._stats['parsed'] += 1
+            self._stats['chunks_read'] += chunks
+            self._stats['chars_read'] += chars
+            self._stats['early_exits'] += int(early_exit)
+            self._stats['char_budget_hits'] += int(char_budget_hit)
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot.update({'max_pages': RESUME_MAX_PAGES, 'max_chars': RESUME_MAX_CHARS,
+                         'max_skills': RESUME_MAX_SKILLS, 'taxonomy': skill_taxonomy.stats()})
+        return snapshot
+
+
+parse_stats = ParseStats()
+
+
+class ExtractionError(Exception):
+    """Extraction could not be completed; the upload should be rejected"""
+
+
+class ExtractionTimeout(ExtractionError):
+    pass
+
+
+class ExtractionPoolBusy(ExtractionError):
+    pass
+
+
+def read_chunks(chunks, max_chars, signals):
+    """Feed chunks to signals until complete or out of budget: (kept, chars, count, early_exit, budget_hit)"""
+    kept = []
+    chars = count = 0
+    early_exit = char_budget_hit = False
+    try:
+        for chunk in chunks:
+            count += 1
+            if chars + len(chunk) > max_chars:
+                chunk = chunk[:max_chars - chars]
+                char_budget_hit = True
+            chars += len(chunk)
+            kept.append(chunk)
+            signals.feed(chunk)
+            if char_budget_hit:
+                break
+            if signals.complete:
+                early_exit = True
+                break
+    except ExtractionError:
+        raise
+    except Exception as e:
+        # Corrupt documents are parsed as far as they could be read
+        print(f"Error extracting resume text: {e}")
+    finally:
+        signals.finish()
+        # Stop the underlying reader (closes files held open by the generator)
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+    return kept, chars, count, early_exit, char_budget_hit
+
+
+def extract_resume(chunks, max_chars=RESUME_MAX_CHARS, signals=None):
+    """Feed text chunks to the detector until it is complete or the budget is spent"""
+    signals = signals or ResumeSignals()
+    kept, chars, count, early_exit, char_budget_hit = read_chunks(chunks, max_chars, signals)
+    parse_stats.record(count, chars, early_exit, char_budget_hit)
+
+    result = signals.result()
+    result['full_text'] = ''.join(kept)
+    return result
+
+
+def parse_resume_file(source, filename=None, max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS):
+    """Parse a resume path, bytes or binary stream into skills, experience level and (budgeted) text"""
+    return extract_resume(iter_resume_file(source, filename, max_pages), max_chars)
+
+
+def is_offloaded(filename):
+    """Formats whose extraction is heavy enough to run in the process pool"""
+    return os.path.splitext(os.fspath(filename or ''))[1].lower() in ('.pdf', '.docx')
+
+
+def extract_range(data, filename, first_page, stop_page, max_chars):
+    """Pool worker: (page_count, chunks) of pages [first_page, stop_page), or of a whole DOCX"""
+    source = io.BytesIO(data)
+    if filename.lower().endswith('.pdf'):
+        reader = PyPDF2.PdfReader(source)
+        page_count = len(reader.pages)
+        chunks = ((reader.pages[index].extract_text() or '') + '\n'
+                  for index in range(first_page, min(page_count, stop_page)))
+    else:
+        page_count = None
+        chunks = iter_resume_file(source, filename)
+    # Stop as early as the parent would, so no more text than needed is pickled back
+    return page_count, read_chunks(chunks, max_chars, ResumeSignals())[0]
+
+
+class ExtractionPool:
+    """Process pool for resume extraction with per-upload deadlines and bounded admission"""
+
+    def __init__(self, workers=RESUME_WORKERS, timeout=RESUME_TIMEOUT, max_pending=RESUME_MAX_PENDING,
+                 fanout_pages=RESUME_FANOUT_PAGES, max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max(max_pending, workers)
+        self.fanout_pages = fanout_pages
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'worker_crashes': 0,
+            'restarts': 0,
+            'fanout_uploads': 0,
+            'tasks': 0,
+            'seconds_total': 0.0,
+        }
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Spawned workers do not inherit the web server's threads or sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+                self._pid = os.getpid()
+            return self._executor
+
+    def _restart(self, executor):
+        """Kill the workers of a pool that ran over its deadline and start afresh on next use"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self._stats['restarts'] += 1
+        # The executor has no way to cancel a running task, so its processes are terminated
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    def _result(self, executor, future, deadline):
+        """Wait for a task until the upload's deadline"""
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeout:
+            self._restart(executor)
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise ExtractionTimeout(f'Resume extraction took longer than {self.timeout:g}s')
+        except BrokenProcessPool:
+            self._restart(executor)
+            with self._lock:
+                self._stats['worker_crashes'] += 1
+            raise
+
+    def _submit(self, executor, *args):
+        with self._lock:
+            self._stats['tasks'] += 1
+        return executor.submit(extract_range, *args)
+
+    def _pooled_chunks(self, data, filename, deadline):
+        """Yield a document's text in order, fanning long PDFs out across the pool"""
+        first_stop = min(self.fanout_pages or self.max_pages, self.max_pages)
+        # A pool broken by another upload's timeout gets one retry on a fresh one
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = self._submit(executor, data, filename, 0, first_stop, self.max_chars)
+                page_count, chunks = self._result(executor, future, deadline)
+                break
+            except (BrokenProcessPool, RuntimeError):
+                # RuntimeError: the pool was shut down by a restart in another thread
+                self._restart(executor)
+        else:
+            raise ExtractionError('Resume extraction worker crashed')
+        yield from chunks
+
+        # Reaching here means the first range neither settled the result nor spent the budget
+        last_page = min(page_count or 0, self.max_pages)
+        if last_page <= first_stop:
+            return
+        with self._lock:
+            self._stats['fanout_uploads'] += 1
+        futures = []
+        try:
+            for start in range(first_stop, last_page, self.fanout_pages):
+                futures.append(self._submit(executor, data, filename, start,
+                                            min(start + self.fanout_pages, last_page), self.max_chars))
+            for future in futures:
+                yield from self._result(executor, future, deadline)[1]
+        except (BrokenProcessPool, RuntimeError):
+            self._restart(executor)
+            raise ExtractionError('Resume extraction worker crashed')
+        finally:
+            # Ranges past an early exit are not needed any more
+            for future in futures:
+                future.cancel()
+
+    def parse(self, source, filename=None):
+        """Parse a resume like parse_resume_file, extracting PDF and DOCX text in the pool"""
+        if filename is None and isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        if not self.enabled or not is_offloaded(filename):
+            return parse_resume_file(source, filename, self.max_pages, self.max_chars)
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise ExtractionPoolBusy('Too many resumes are being processed, please retry shortly')
+            self._pending += 1
+            self._stats['submitted'] += 1
+        started = time.monotonic()
+        try:
+            data = read_source(source)
+            chunks = self._pooled_chunks(data, filename, started + self.timeout)
+            result = extract_resume(chunks, self.max_chars)
+            with self._lock:
+                self._stats['completed'] += 1
+            return result
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._stats['seconds_total'] += time.monotonic() - started
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=False)
+
+    def stats(self):
+        """Snapshot of pool counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'workers': self.workers,
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'timeout': self.timeout,
+                'fanout_pages': self.fanout_pages,
+                'started': self._executor is not None,
+            })
+        finished = snapshot['submitted'] - snapshot['pending']
+        snapshot['avg_seconds'] = round(snapshot.pop('seconds_total') / finished, 4) if finished else 0.0
+        return snapshot
+
+
+extraction_pool = ExtractionPool()
+atexit.register(extraction_pool.shutdown)
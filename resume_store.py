@@ -0,0 +1,106 @@
+"""
+TalentMate resume text storage
+
+A session row only keeps a small summary of the parsed resume (skills,
+experience level and the text's length). The extracted text itself is
+zlib-compressed and stored once in the resume_texts table, keyed by the
+SHA-256 of the text, so a candidate reusing the same resume for every mock
+interview stores it once, and queries reading resume_data no longer decode
+kilobytes of text to get at the skills. Sessions point at their text through
+interview_sessions.resume_text_hash.
+
+Rows written before the text moved out (or by workers still running an older
+release) are slimmed by compact_resume_data, which migration 11 and
+`python migrations.py --compact-resumes` run.
+"""
+
+import hashlib
+import json
+import time
+import zlib
+
+RESUME_TEXT_COMPRESSION = 6
+
+
+def resume_text_hash(text):
+    """Content address of a resume text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def store_resume_text(conn, text):
+    """Store a resume text unless it is already stored and return its hash; the caller commits
+
+    Returns None for empty text.
+    """
+    if not text:
+        return None
+    text_hash = resume_text_hash(text)
+    data = text.encode('utf-8')
+    # Skip compressing when the text is already stored (the common case: the same resume again)
+    if conn.execute('SELECT 1 FROM resume_texts WHERE text_hash = ?', (text_hash,)).fetchone() is None:
+        content = zlib.compress(data, RESUME_TEXT_COMPRESSION)
+        conn.execute('''
+            INSERT OR IGNORE INTO resume_texts (text_hash, content, size, compressed_size, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (text_hash, content, len(data), len(content), time.time()))
+    return text_hash
+
+
+def load_resume_text(conn, text_hash):
+    """A stored resume text, or None if there is none under this hash"""
+    if not text_hash:
+        return None
+    row = conn.execute('SELECT content FROM resume_texts WHERE text_hash = ?', (text_hash,)).fetchone()
+    return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+
+def slim_resume_data(conn, resume_data):
+    """Store a parsed resume's text and return (summary kept in the session row, text hash)"""
+    summary = {key: value for key, value in resume_data.items() if key != 'full_text'}
+    text = resume_data.get('full_text')
+    text_hash = store_resume_text(conn, text) if isinstance(text, str) else None
+    if text_hash is not None:
+        summary['text_length'] = len(text)
+    return summary, text_hash
+
+
+def compact_resume_data(conn, batch_size=500):
+    """Move full_text out of every session row that still has it; the caller commits
+
+    Returns (sessions compacted, resume_data bytes before, bytes after).
+    """
+    compacted = before = after = 0
+    last_id = 0
+    while True:
+        # Keyset batches keep memory flat on large tables
+        rows = conn.execute('''
+            SELECT id, resume_data FROM interview_sessions
+            WHERE id > ? AND resume_data LIKE '%"full_text"%'
+            ORDER BY id LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        for row_id, resume_json in rows:
+            last_id = row_id
+            try:
+                resume_data = json.loads(resume_json)
+            except ValueError:
+                continue
+            if not isinstance(resume_data, dict) or 'full_text' not in resume_data:
+                continue
+            summary, text_hash = slim_resume_data(conn, resume_data)
+            slim_json = json.dumps(summary)
+            conn.execute('UPDATE interview_sessions SET resume_data = ?, resume_text_hash = ? WHERE id = ?',
+                         (slim_json, text_hash, row_id))
+            compacted += 1
+            before += len(resume_json.encode('utf-8'))
+            after += len(slim_json.encode('utf-8'))
+    return compacted, before, after
+
+
+def resume_text_stats(conn):
+    """Stored texts, their total size and their total compressed size"""
+    count, size, compressed = conn.execute(
+        'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(compressed_size), 0) FROM resume_texts'
+    ).fetchone()
+    return {'texts': count, 'bytes': size, 'compressed_bytes': compressed}
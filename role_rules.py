@@ -0,0 +1,118 @@
+"""
+TalentMate role classification
+
+Job titles are mapped to a role category (which selects role-specific
+interview questions) by a rule table loaded from data/role_rules.json:
+
+    {"role": "java_fullstack", "priority": 72,
+     "required": [["full stack", "fullstack"], ["java", "spring"]],
+     "optional": ["senior"]}
+
+A rule matches when every required group has at least one of its terms in
+the title; among matching rules the highest priority wins, then the one
+with the most optional terms present, then the one listed first. Terms are
+whole tokens or token phrases ("java" does not match "javascript").
+
+The table is compiled into an inverted index from the first token of each
+rule's most selective required group (its anchor: the group whose tokens
+the fewest rules share) to that rule, so a title is classified in one pass
+over its tokens and only rules whose anchor appears are evaluated; common
+words such as "developer" never fan out to every rule. Recent titles are
+served from an LRU cache.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from skill_taxonomy import tokenize
+
+DEFAULT_ROLE_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'role_rules.json')
+ROLE_RULES_PATH = os.environ.get('ROLE_RULES_PATH', DEFAULT_ROLE_RULES_PATH)
+ROLE_CACHE_SIZE = int(os.environ.get('ROLE_CACHE_SIZE', '4096'))
+
+
+def padded(tokens):
+    """Tokens joined with spaces and space-padded, so phrases match whole tokens with `in`"""
+    return f" {' '.join(tokens)} "
+
+
+class RoleClassifier:
+    """Rule table compiled into an inverted token index, with an LRU of recent titles"""
+
+    def __init__(self, rules, cache_size=ROLE_CACHE_SIZE, version=None):
+        self.version = version
+        self.rules = []
+        # first token -> [(term tokens, rule index)] for each rule's anchor group
+        self.index = {}
+
+        groups_by_rule = []
+        frequency = {}
+        for rule in rules:
+            groups = [[tuple(tokenize(term)) for term in group] for group in rule.get('required', [])]
+            groups = [[tokens for tokens in group if tokens] for group in groups]
+            if not groups or not all(groups):
+                raise ValueError(f"Role rule for {rule['role']} has an empty required group")
+            groups_by_rule.append(groups)
+            for first in {tokens[0] for group in groups for tokens in group}:
+                frequency[first] = frequency.get(first, 0) + 1
+
+        for position, (rule, groups) in enumerate(zip(rules, groups_by_rule)):
+            anchor = min(range(len(groups)), key=lambda slot: sum(frequency[tokens[0]] for tokens in groups[slot]))
+            rule_index = len(self.rules)
+            for tokens in groups[anchor]:
+                self.index.setdefault(tokens[0], []).append((tokens, rule_index))
+            others = tuple(tuple(padded(tokens) for tokens in group)
+                           for slot, group in enumerate(groups) if slot != anchor)
+            optional = tuple(padded(tokenize(term)) for term in rule.get('optional', []) if tokenize(term))
+            self.rules.append((rule['role'], rule.get('priority', 0), -position, others, optional))
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    @classmethod
+    def load(cls, path=DEFAULT_ROLE_RULES_PATH, cache_size=ROLE_CACHE_SIZE):
+        """Load a rule table data file"""
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(data['rules'], cache_size, data.get('version'))
+
+    def detect(self, job_title):
+        """Role category of a job title, or None"""
+        return self.classify(' '.join((job_title or '').lower().split()))
+
+    def _classify(self, title):
+        tokens = tokenize(title)
+        candidates = set()
+        for i, token in enumerate(tokens):
+            for term, rule_index in self.index.get(token, ()):
+                if len(term) == 1 or tuple(tokens[i:i + len(term)]) == term:
+                    candidates.add(rule_index)
+        if not candidates:
+            return None
+
+        text = padded(tokens)
+        best = None
+        for rule_index in candidates:
+            role, priority, order, others, optional = self.rules[rule_index]
+            if all(any(term in text for term in group) for group in others):
+                rank = (priority, sum(term in text for term in optional), order)
+                if best is None or rank > best[0]:
+                    best = (rank, role)
+        return best[1] if best else None
+
+    def stats(self):
+        """Rule and cache counters"""
+        info = self.classify.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'rules': len(self.rules),
+            'indexed_tokens': len(self.index),
+            'version': self.version,
+            'cache_hits': info.hits,
+            'cache_misses': info.misses,
+            'cache_size': info.currsize,
+            'cache_max_size': info.maxsize,
+            'hit_ratio': round(info.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+role_classifier = RoleClassifier.load(ROLE_RULES_PATH)
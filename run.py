@@ -30,7 +30,6 @@ def install_dependencies():
 
 def create_directories():
     """Create necessary directories"""
-    os.makedirs('uploads', exist_ok=True)
     os.makedirs('static/css', exist_ok=True)
     os.makedirs('static/js', exist_ok=True)
     os.makedirs('templates', exist_ok=True)
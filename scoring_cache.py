@@ -0,0 +1,166 @@
+"""
+TalentMate answer scoring cache
+
+Memoizes score_answer results in a bounded LRU with a TTL, optionally backed
+by a persistent SQLite tier (the score_cache table) shared by every worker
+process and surviving restarts. Keys hash the scorer version together with
+the inputs that affect a score, so changing the keyword tables or bumping the
+scorer version makes old entries unreachable; stale rows of the persistent
+tier are purged the first time it is used.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+SCORE_CACHE_SIZE = int(os.environ.get('SCORE_CACHE_SIZE', '5000'))
+SCORE_CACHE_TTL = float(os.environ.get('SCORE_CACHE_TTL', '86400'))
+SCORE_CACHE_PERSIST = os.environ.get('SCORE_CACHE_PERSIST', '0') in ('1', 'true', 'True')
+SCORE_CACHE_PERSIST_MAX = int(os.environ.get('SCORE_CACHE_PERSIST_MAX', '100000'))
+PRUNE_EVERY = 500
+
+
+class ScoreCache:
+    """LRU + TTL cache of scoring results with an optional SQLite tier"""
+
+    def __init__(self, version, max_size=SCORE_CACHE_SIZE, ttl=SCORE_CACHE_TTL,
+                 pool=None, persist_max=SCORE_CACHE_PERSIST_MAX, clock=time.time):
+        self.version = version
+        self.max_size = max_size
+        self.ttl = ttl
+        self.pool = pool
+        self.persist_max = persist_max
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._purged = False
+        self._puts_since_prune = 0
+        self._stats = {
+            'hits': 0,
+            'persistent_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evictions': 0,
+            'persistent_errors': 0,
+        }
+
+    def key(self, *parts):
+        """Cache key for the given scoring inputs under the current version"""
+        payload = json.dumps([self.version] + list(parts), separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Cached result, or None on a miss"""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, created_at = entry
+                if now - created_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return result
+                del self._entries[key]
+                self._stats['expired'] += 1
+
+        if self.pool is not None:
+            found = self._load_persistent(key, now)
+            if found is not None:
+                result, created_at = found
+                with self._lock:
+                    self._store(key, result, created_at)
+                    self._stats['persistent_hits'] += 1
+                return result
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key, result):
+        """Remember a freshly computed result"""
+        now = self.clock()
+        with self._lock:
+            self._store(key, result, now)
+        if self.pool is not None:
+            self._save_persistent(key, result, now)
+
+    def _store(self, key, result, created_at):
+        self._entries[key] = (result, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _purge_old_versions(self, conn):
+        if self._purged:
+            return
+        conn.execute('DELETE FROM score_cache WHERE version < ? OR version > ?', (self.version, self.version))
+        conn.commit()
+        self._purged = True
+
+    def _load_persistent(self, key, now):
+        try:
+            with self.pool.connection() as conn:
+                self._purge_old_versions(conn)
+                row = conn.execute(
+                    'SELECT result, created_at FROM score_cache WHERE cache_key = ? AND version = ?',
+                    (key, self.version)).fetchone()
+        except Exception as e:
+            self._persistent_error(e)
+            return None
+        if row is None or now - row[1] > self.ttl:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _save_persistent(self, key, result, now):
+        try:
+            with self.pool.connection() as conn:
+                self._purge_old_versions(conn)
+                conn.execute('''
+                    INSERT OR REPLACE INTO score_cache (cache_key, version, result, created_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (key, self.version, json.dumps(result), now))
+                self._puts_since_prune += 1
+                if self._puts_since_prune >= PRUNE_EVERY:
+                    self._puts_since_prune = 0
+                    self._prune_persistent(conn, now)
+                conn.commit()
+        except Exception as e:
+            self._persistent_error(e)
+
+    def _prune_persistent(self, conn, now):
+        conn.execute('DELETE FROM score_cache WHERE created_at < ?', (now - self.ttl,))
+        excess = conn.execute('SELECT COUNT(*) FROM score_cache').fetchone()[0] - self.persist_max
+        if excess > 0:
+            conn.execute('''
+                DELETE FROM score_cache WHERE cache_key IN
+                (SELECT cache_key FROM score_cache ORDER BY created_at LIMIT ?)
+            ''', (excess,))
+
+    def _persistent_error(self, error):
+        with self._lock:
+            self._stats['persistent_errors'] += 1
+        print(f"Score cache database error: {error}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'persistent': self.pool is not None,
+                'version': self.version[:12],
+            })
+        lookups = snapshot['hits'] + snapshot['persistent_hits'] + snapshot['misses']
+        hits = snapshot['hits'] + snapshot['persistent_hits']
+        snapshot['hit_ratio'] = round(hits / lookups, 3) if lookups else 0.0
+        return snapshot
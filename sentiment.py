@@ -0,0 +1,186 @@
+"""
+TalentMate sentiment analysis
+
+The transformers sentiment pipeline is loaded lazily (on first use or by an
+explicit warm-up) and fed through a micro-batching queue: requests arriving
+within a few milliseconds of each other are run as one batch on a single
+inference thread instead of one unbatched call per answer on the request
+thread.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+ENABLE_SENTIMENT = os.environ.get('ENABLE_SENTIMENT', '0') in ('1', 'true', 'True')
+SENTIMENT_WARMUP = os.environ.get('SENTIMENT_WARMUP', '0') in ('1', 'true', 'True')
+SENTIMENT_MAX_BATCH = int(os.environ.get('SENTIMENT_MAX_BATCH', '16'))
+SENTIMENT_MAX_WAIT_MS = float(os.environ.get('SENTIMENT_MAX_WAIT_MS', '5'))
+SENTIMENT_TIMEOUT = float(os.environ.get('SENTIMENT_TIMEOUT', '10'))
+MAX_TEXT_LENGTH = 512
+
+
+def load_transformers_pipeline():
+    """Default model loader (imported here so transformers stays optional)"""
+    from transformers import pipeline
+    return pipeline("sentiment-analysis")
+
+
+class SentimentBatcher:
+    """Lazily loaded sentiment model behind a micro-batching queue"""
+
+    def __init__(self, enabled=ENABLE_SENTIMENT, loader=load_transformers_pipeline,
+                 max_batch_size=SENTIMENT_MAX_BATCH, max_wait_ms=SENTIMENT_MAX_WAIT_MS):
+        self.enabled = enabled
+        self.loader = loader
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._model = None
+        self._load_failed = False
+        self._load_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stats = {
+            'requests': 0,
+            'analyzed': 0,
+            'batches': 0,
+            'max_batch_size_seen': 0,
+            'errors': 0,
+            'load_seconds': None,
+            'queue_wait_ms_total': 0.0,
+            'queue_wait_ms_max': 0.0,
+            'inference_ms_total': 0.0,
+        }
+
+    @property
+    def available(self):
+        return self.enabled and not self._load_failed
+
+    def _load(self):
+        if self._model is not None or self._load_failed:
+            return self._model
+        with self._load_lock:
+            if self._model is None and not self._load_failed:
+                started = time.perf_counter()
+                try:
+                    self._model = self.loader()
+                    self._stats['load_seconds'] = round(time.perf_counter() - started, 3)
+                    print("NLP models loaded successfully")
+                except Exception as e:
+                    self._load_failed = True
+                    print(f"Error loading NLP models: {e}")
+        return self._model
+
+    def warm_up(self, background=False):
+        """Load the model now instead of on the first scored answer"""
+        if not self.enabled:
+            return
+        if background:
+            threading.Thread(target=self._load, name='sentiment-warmup', daemon=True).start()
+        else:
+            self._load()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='sentiment-batcher', daemon=True)
+            self._thread.start()
+
+    def submit(self, text):
+        """Queue a text for analysis; the Future resolves to {'label', 'score'} or None"""
+        future = Future()
+        if not self.available:
+            future.set_result(None)
+            return future
+        with self._lock:
+            self._stats['requests'] += 1
+        self._ensure_thread()
+        self._queue.put((text[:MAX_TEXT_LENGTH], future, time.perf_counter()))
+        return future
+
+    def analyze(self, text, timeout=SENTIMENT_TIMEOUT):
+        """Sentiment of one text, or None if unavailable"""
+        return self.analyze_many([text], timeout)[0]
+
+    def analyze_many(self, texts, timeout=SENTIMENT_TIMEOUT):
+        """Sentiment of several texts; they are queued together so they share a batch"""
+        futures = [self.submit(text) for text in texts]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout))
+            except Exception:
+                results.append(None)
+        return results
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        started = time.perf_counter()
+        waits = [(started - enqueued) * 1000 for _, _, enqueued in batch]
+        results = [None] * len(batch)
+        model = self._load()
+        if model is not None:
+            try:
+                results = model([text for text, _, _ in batch], batch_size=len(batch), truncation=True)
+            except Exception as e:
+                with self._lock:
+                    self._stats['errors'] += 1
+                print(f"Sentiment analysis failed: {e}")
+        elapsed = (time.perf_counter() - started) * 1000
+
+        # Every waiter gets an answer, even if the model returned too few results
+        for i, (_, future, _) in enumerate(batch):
+            future.set_result(results[i] if i < len(results) else None)
+
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['analyzed'] += len(batch)
+            self._stats['max_batch_size_seen'] = max(self._stats['max_batch_size_seen'], len(batch))
+            self._stats['queue_wait_ms_total'] += sum(waits)
+            self._stats['queue_wait_ms_max'] = max(self._stats['queue_wait_ms_max'], max(waits))
+            self._stats['inference_ms_total'] += elapsed
+
+    def stats(self):
+        """Snapshot of batching counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+        batches = snapshot['batches']
+        analyzed = snapshot['analyzed']
+        snapshot.update({
+            'enabled': self.enabled,
+            'loaded': self._model is not None,
+            'load_failed': self._load_failed,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queue_depth': self._queue.qsize(),
+            'avg_batch_size': round(analyzed / batches, 2) if batches else 0.0,
+            'avg_queue_wait_ms': round(snapshot['queue_wait_ms_total'] / analyzed, 3) if analyzed else 0.0,
+            'avg_inference_ms': round(snapshot['inference_ms_total'] / batches, 3) if batches else 0.0,
+        })
+        return snapshot
+
+
+sentiment_batcher = SentimentBatcher()
+if SENTIMENT_WARMUP:
+    sentiment_batcher.warm_up(background=True)
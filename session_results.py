@@ -0,0 +1,191 @@
+"""
+TalentMate session result summaries
+
+A session's results (average, best and worst score, answered/total,
+most frequent improvement suggestions, per-question-type averages, the
+skills from the resume and the per-question scores in question order) are
+computed once whenever its answers are written, in the same transaction,
+and stored as one row of the session_results table. Reading results is then
+a single primary-key lookup with no decoding of the session's questions or
+resume blobs.
+
+Sessions whose summary is missing (written by a worker running an older
+release) are summarized on first read.
+"""
+
+import json
+from collections import Counter
+
+TOP_IMPROVEMENTS = 5
+
+
+def numeric_scores(scores_data):
+    """Numeric scores from either scores format, skipping malformed entries"""
+    if isinstance(scores_data, dict):
+        scores = list(scores_data.values())
+    elif isinstance(scores_data, list):
+        scores = scores_data
+    else:
+        scores = []
+
+    numbers = []
+    for score_data in scores:
+        if isinstance(score_data, dict) and 'score' in score_data:
+            try:
+                numbers.append(float(score_data['score']))
+            except (ValueError, TypeError):
+                pass
+        elif isinstance(score_data, (int, float)):
+            numbers.append(float(score_data))
+    return numbers
+
+
+def load_session_scores(conn, session_id, questions_data):
+    """Load the answered count and per-question scores of a session, in question order"""
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM session_answers WHERE session_id = ?', (session_id,))
+    answered_count = cursor.fetchone()[0]
+    cursor.execute('''
+        SELECT question_id, score, feedback, areas_to_improve
+        FROM session_scores WHERE session_id = ?
+    ''', (session_id,))
+    rows = {
+        row[0]: {
+            'score': row[1],
+            'feedback': row[2],
+            'areas_to_improve': json.loads(row[3]) if row[3] else []
+        }
+        for row in cursor.fetchall()
+    }
+
+    scores_data = {}
+    if isinstance(questions_data, list):
+        for question in questions_data:
+            if isinstance(question, dict) and question.get('id') in rows:
+                scores_data[question['id']] = rows.pop(question['id'])
+    scores_data.update(rows)
+    return answered_count, scores_data
+
+
+def resume_skills(resume_data):
+    """Skill names from a parsed resume, tolerating malformed data"""
+    skills = resume_data.get('skills', []) if isinstance(resume_data, dict) else []
+    return [skill for skill in skills if isinstance(skill, str)] if isinstance(skills, list) else []
+
+
+class SessionResults:
+    """Summary of a session's scores, as stored in session_results"""
+
+    def __init__(self, answered_count, total_questions, avg_score, min_score, max_score,
+                 improvements, category_scores, skills, detailed_scores):
+        self.answered_count = answered_count
+        self.total_questions = total_questions
+        self.avg_score = avg_score
+        self.min_score = min_score
+        self.max_score = max_score
+        self.improvements = improvements
+        self.category_scores = category_scores
+        self.skills = skills
+        self.detailed_scores = detailed_scores
+
+    @classmethod
+    def compute(cls, questions_data, answered_count, scores_data, skills):
+        """Summarize scores loaded by load_session_scores"""
+        scores = numeric_scores(scores_data)
+
+        # Most frequent suggestions first; ties keep the order they were first given in
+        improvements = Counter()
+        by_type = {}
+        types = {q.get('id'): q.get('type') for q in questions_data if isinstance(q, dict)} if isinstance(questions_data, list) else {}
+        for question_id, score_data in (scores_data.items() if isinstance(scores_data, dict) else ()):
+            if not isinstance(score_data, dict):
+                continue
+            if isinstance(score_data.get('areas_to_improve'), list):
+                improvements.update(area for area in score_data['areas_to_improve'] if isinstance(area, str))
+            values = numeric_scores([score_data])
+            if types.get(question_id) and values:
+                by_type.setdefault(types[question_id], []).extend(values)
+
+        return cls(
+            answered_count=answered_count,
+            total_questions=len(questions_data) if isinstance(questions_data, (list, dict)) else 0,
+            avg_score=sum(scores) / len(scores) if scores else None,
+            min_score=min(scores) if scores else None,
+            max_score=max(scores) if scores else None,
+            improvements=[area for area, _ in improvements.most_common(TOP_IMPROVEMENTS)],
+            category_scores={t: round(sum(values) / len(values), 1) for t, values in by_type.items()},
+            skills=skills,
+            detailed_scores=scores_data if isinstance(scores_data, dict) else {},
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Summary from a session_results row (in the column order of RESULT_COLUMNS)"""
+        return cls(row[0], row[1], row[2], row[3], row[4],
+                   json.loads(row[5]), json.loads(row[6]), json.loads(row[7]), json.loads(row[8]))
+
+    def to_row(self):
+        return (self.answered_count, self.total_questions, self.avg_score, self.min_score, self.max_score,
+                json.dumps(self.improvements), json.dumps(self.category_scores),
+                json.dumps(self.skills), json.dumps(self.detailed_scores))
+
+
+RESULT_COLUMNS = ('answered_count, total_questions, avg_score, min_score, max_score, '
+                  'improvements, category_scores, skills, detailed_scores')
+
+
+def save_session_results(conn, session_id, results):
+    """Store a session's summary; the caller commits"""
+    conn.execute(f'''
+        INSERT OR REPLACE INTO session_results (session_id, {RESULT_COLUMNS}, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ''', (session_id,) + results.to_row())
+
+
+def load_session_results(conn, session_id):
+    """A session's stored summary, or None if it has none yet"""
+    row = conn.execute(f'SELECT {RESULT_COLUMNS} FROM session_results WHERE session_id = ?', (session_id,)).fetchone()
+    return SessionResults.from_row(row) if row else None
+
+
+def refresh_session_results(conn, session_id, questions_data=None):
+    """Recompute and store a session's summary from its scores; the caller commits
+
+    Skills never change after upload, so they are taken from the stored
+    summary when there is one and the resume blob is only decoded otherwise.
+    Returns None for unknown sessions.
+    """
+    skills = None
+    if questions_data is not None:
+        row = conn.execute('SELECT skills FROM session_results WHERE session_id = ?', (session_id,)).fetchone()
+        skills = json.loads(row[0]) if row else None
+    if skills is None:
+        row = conn.execute('SELECT questions, resume_data FROM interview_sessions WHERE session_id = ?',
+                           (session_id,)).fetchone()
+        if row is None:
+            return None
+        if questions_data is None:
+            questions_data = json.loads(row[0]) if row[0] else []
+        skills = resume_skills(json.loads(row[1]) if row[1] else {})
+    answered_count, scores_data = load_session_scores(conn, session_id, questions_data)
+    results = SessionResults.compute(questions_data, answered_count, scores_data, skills)
+    save_session_results(conn, session_id, results)
+    return results
+
+
+def backfill_session_results(conn):
+    """Summarize every session that has no stored summary yet; returns how many were written"""
+    rows = conn.execute('''
+        SELECT s.session_id FROM interview_sessions s
+        WHERE s.session_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM session_results r WHERE r.session_id = s.session_id)
+    ''').fetchall()
+    written = 0
+    for (session_id,) in rows:
+        try:
+            refresh_session_results(conn, session_id)
+        except ValueError:
+            # Unreadable legacy JSON; summarized (or reported) on first read instead
+            continue
+        written += 1
+    return written
@@ -0,0 +1,139 @@
+"""
+TalentMate skill taxonomy
+
+Skills, their aliases ("k8s" -> kubernetes) and the experience-level
+indicators are loaded from a JSON data file (data/skill_taxonomy.json by
+default) and compiled into a token trie. Text is tokenized once and every
+token position walks the trie, so matching costs O(tokens x longest phrase)
+no matter how many skills the taxonomy holds, and terms only match whole
+tokens ("ai" does not match inside "maintain", nor "java" inside
+"javascript").
+
+Data file format:
+
+    {
+      "version": 1,
+      "experience_levels": {"senior": ["senior", "tech lead"], ...},
+      "skills": [{"name": "kubernetes", "aliases": ["k8s"], "category": "cloud"}, ...]
+    }
+
+Experience levels are listed from most to least senior. A skill with
+"match_name": false is only matched through its aliases (for names like
+"go" or "r" that are ordinary words or letters).
+"""
+
+import hashlib
+import json
+import os
+import re
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skill_taxonomy.json')
+RESUME_SKILLS_FILE = os.environ.get('RESUME_SKILLS_FILE', DEFAULT_TAXONOMY_PATH)
+
+# Dots, plus and hash stay inside tokens so node.js, .net, c++, c# and 3+ survive
+TOKEN_PATTERN = re.compile(r'\.?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+TOKEN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789+#.')
+
+# Terminal entries are stored under this key; tokens are never None
+TERMINAL = None
+
+
+def tokenize(text):
+    """Lowercase tokens of text"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillTaxonomy:
+    """Skills and experience indicators compiled into a token trie"""
+
+    def __init__(self, skills, experience_levels, version=None):
+        self.skills = [skill['name'] for skill in skills]
+        self.levels = list(experience_levels)
+        self.version = version
+        self.root = {}
+        self.depth = 1
+        self.term_count = 0
+
+        for index, skill in enumerate(skills):
+            terms = list(skill.get('aliases', []))
+            if skill.get('match_name', True):
+                terms.insert(0, skill['name'])
+            for term in terms:
+                self._add(term, (True, index))
+        for rank, level in enumerate(self.levels):
+            for term in experience_levels[level]:
+                self._add(term, (False, rank))
+
+        # Fingerprint of the compiled content, for caches keyed by parse results
+        self.fingerprint = hashlib.sha256(json.dumps(
+            [skills, experience_levels], sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _add(self, term, entry):
+        tokens = tokenize(term)
+        if not tokens:
+            return
+        variants = [tokens]
+        # Plain plurals ("developers", "microservices") match the singular term
+        last = tokens[-1]
+        if last.isalpha() and len(last) > 2 and not last.endswith('s'):
+            variants.append(tokens[:-1] + [last + 's'])
+        for variant in variants:
+            node = self.root
+            for token in variant:
+                node = node.setdefault(token, {})
+            entries = node.setdefault(TERMINAL, [])
+            if entry not in entries:
+                entries.append(entry)
+                self.term_count += 1
+            self.depth = max(self.depth, len(variant))
+
+    @classmethod
+    def load(cls, path=DEFAULT_TAXONOMY_PATH):
+        """Load a taxonomy data file"""
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(data['skills'], data['experience_levels'], data.get('version'))
+
+    def scan(self, tokens, skills, levels):
+        """Add the skill indexes and level ranks found in tokens to the given sets
+
+        Returns the skill indexes in the order they were first found.
+        """
+        root = self.root
+        count = len(tokens)
+        found = []
+        for i in range(count):
+            node = root.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                entries = node.get(TERMINAL)
+                if entries is not None:
+                    for is_skill, value in entries:
+                        if is_skill:
+                            if value not in skills:
+                                skills.add(value)
+                                found.append(value)
+                        else:
+                            levels.add(value)
+                if j == count:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+        return found
+
+    def match(self, text):
+        """(skill names in taxonomy order, set of level names) mentioned in text"""
+        skills, levels = set(), set()
+        self.scan(tokenize(text), skills, levels)
+        return [self.skills[i] for i in sorted(skills)], {self.levels[rank] for rank in levels}
+
+    def stats(self):
+        return {
+            'skills': len(self.skills),
+            'terms': self.term_count,
+            'max_phrase_tokens': self.depth,
+            'version': self.version,
+        }
+
+
+skill_taxonomy = SkillTaxonomy.load(RESUME_SKILLS_FILE)
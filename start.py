@@ -12,7 +12,6 @@ def main():
     print("⏹️  Press Ctrl+C to stop the server\n")
     
     # Create directories if they don't exist
-    os.makedirs('uploads', exist_ok=True)
     os.makedirs('static/css', exist_ok=True)
     os.makedirs('static/js', exist_ok=True)
     os.makedirs('templates', exist_ok=True)
@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure repo root is on sys.path for CI environments
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+	sys.path.insert(0, str(PROJECT_ROOT))
+
+# Never let the test suite touch the checked-in talentmate.db
+_TEST_DB_DIR = tempfile.mkdtemp(prefix='talentmate-tests-')
+os.environ.setdefault('TALENTMATE_DB', os.path.join(_TEST_DB_DIR, 'talentmate.db'))
+os.environ.setdefault('REPORT_CACHE_DIR', os.path.join(_TEST_DB_DIR, 'reports'))
+
+# Write notifications on the calling thread so tests can assert on them directly
+os.environ.setdefault('TALENTMATE_NOTIFY_SYNC', '1')
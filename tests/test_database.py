@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from database import ConnectionPool, PoolTimeout
+
+
+def test_pool_reuses_connections_and_enables_wal(tmp_path):
+	pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=2, timeout=0.1)
+	with pool.connection() as conn:
+		assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+		assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+		first = id(conn)
+	with pool.connection() as conn:
+		assert id(conn) == first
+	stats = pool.stats()
+	assert stats['created'] == 1
+	assert stats['reused'] == 1
+	assert stats['in_use'] == 0
+	pool.close_all()
+
+
+def test_pool_is_bounded(tmp_path):
+	pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=1, timeout=0.05)
+	held = pool.acquire()
+	with pytest.raises(PoolTimeout):
+		pool.acquire()
+	assert pool.stats()['timeouts'] == 1
+
+	# A waiter is served as soon as the connection comes back
+	result = {}
+	waiter = threading.Thread(target=lambda: result.setdefault('conn', pool.acquire()))
+	pool.timeout = 2
+	waiter.start()
+	pool.release(held)
+	waiter.join()
+	assert result['conn'] is held
+	pool.release(result['conn'])
+	pool.close_all()
+
+
+def test_release_rolls_back_open_transaction(tmp_path):
+	pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=1)
+	with pool.connection() as conn:
+		conn.execute('CREATE TABLE t (x INTEGER)')
+		conn.commit()
+		conn.execute('INSERT INTO t VALUES (1)')
+	with pool.connection() as conn:
+		assert not conn.in_transaction
+		assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+	pool.close_all()
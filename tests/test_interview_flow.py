@@ -0,0 +1,310 @@
+import importlib
+import io
+import json
+import os
+from pathlib import Path
+
+from resume_store import load_resume_text
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ANSWER = (
+	'In my experience the approach was to design a solution with the team. '
+	'The result was a faster algorithm with better time complexity. '
+	'I learned a lot about communication and efficiency.'
+)
+
+
+def get_app_module():
+	return importlib.import_module('app')
+
+
+def start_interview(client, username):
+	client.post('/register', data={
+		'username': username,
+		'email': f'{username}@example.com',
+		'password': 'secret',
+		'full_name': username.title(),
+	})
+	resume = (PROJECT_ROOT / 'demo_resume.txt').read_bytes()
+	resp = client.post('/upload-resume', data={
+		'resume': (io.BytesIO(resume), 'resume.txt'),
+		'job_role': 'Software Engineer',
+	}, content_type='multipart/form-data')
+	assert resp.status_code == 200
+	return resp.get_json()
+
+
+def test_answers_are_stored_per_question():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		interview = start_interview(client, 'flowuser')
+		session_id = interview['session_id']
+		questions = interview['questions']
+
+		scores = []
+		for question in questions:
+			resp = client.post('/submit-answer', json={
+				'session_id': session_id,
+				'question_id': question['id'],
+				'answer': ANSWER,
+			})
+			assert resp.status_code == 200
+			scores.append(resp.get_json()['score'])
+
+		# Re-answering a question replaces its row instead of adding one
+		client.post('/submit-answer', json={
+			'session_id': session_id,
+			'question_id': questions[0]['id'],
+			'answer': 'too short',
+		})
+		scores[0] = 0
+
+		results = client.get(f'/get-results/{session_id}').get_json()
+		assert results['answered_questions'] == len(questions)
+		assert list(results['detailed_scores']) == [q['id'] for q in questions]
+		assert [v['score'] for v in results['detailed_scores'].values()] == scores
+
+		with app_module.db_pool.connection() as conn:
+			overall = conn.execute('SELECT overall_score FROM interview_sessions WHERE session_id = ?', (session_id,)).fetchone()[0]
+		assert overall == int(sum(scores) / len(scores) + 0.5)
+
+
+def test_candidate_stats_follow_uploads_and_answers():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		first = start_interview(client, 'statsuser')
+		for question in first['questions']:
+			client.post('/submit-answer', json={
+				'session_id': first['session_id'],
+				'question_id': question['id'],
+				'answer': ANSWER,
+			})
+		with app_module.db_pool.connection() as conn:
+			user_id = conn.execute("SELECT id FROM users WHERE username = 'statsuser'").fetchone()[0]
+			best, latest, total = conn.execute(
+				'SELECT best_score, latest_score, total_interviews FROM candidate_stats WHERE user_id = ?',
+				(user_id,)).fetchone()
+			first_score = conn.execute(
+				'SELECT overall_score FROM interview_sessions WHERE session_id = ?',
+				(first['session_id'],)).fetchone()[0]
+		assert (best, latest, total) == (first_score, first_score, 1)
+
+		# A weaker second interview updates latest_score but not best_score
+		resp = client.post('/upload-resume', data={
+			'resume': (io.BytesIO(b'junior developer'), 'resume.txt'),
+			'job_role': 'Software Engineer',
+		}, content_type='multipart/form-data')
+		second = resp.get_json()
+		client.post('/submit-answer', json={
+			'session_id': second['session_id'],
+			'question_id': second['questions'][0]['id'],
+			'answer': 'short answer here',
+		})
+		with app_module.db_pool.connection() as conn:
+			best, latest, total = conn.execute(
+				'SELECT best_score, latest_score, total_interviews FROM candidate_stats WHERE user_id = ?',
+				(user_id,)).fetchone()
+		assert (best, total) == (first_score, 2)
+		assert latest < first_score
+
+
+def test_session_summary_matches_results():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		interview = start_interview(client, 'summaryuser')
+		session_id = interview['session_id']
+		for question in interview['questions'][:2]:
+			client.post('/submit-answer', json={
+				'session_id': session_id,
+				'question_id': question['id'],
+				'answer': ANSWER,
+			})
+
+		summary = client.get('/api/sessions/summary?categories=1').get_json()['sessions']
+		assert [s['session_id'] for s in summary] == [session_id]
+		results = client.get(f'/get-results/{session_id}').get_json()
+		assert abs(summary[0]['overall_score'] - results['overall_score']) <= 0.5
+		assert summary[0]['answered_questions'] == results['answered_questions'] == 2
+		assert summary[0]['total_questions'] == results['total_questions']
+		answered_types = {q['type'] for q in interview['questions'][:2]}
+		assert set(summary[0]['category_scores']) == answered_types
+
+
+def test_bulk_submission_scores_all_answers_in_one_request():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		interview = start_interview(client, 'bulkuser')
+		session_id = interview['session_id']
+		questions = interview['questions']
+
+		resp = client.post('/submit-answers', json={
+			'session_id': session_id,
+			'answers': [{'question_id': 'missing', 'answer': ANSWER}],
+		})
+		assert resp.status_code == 404
+		assert resp.get_json()['question_ids'] == ['missing']
+
+		for bad in ({'question_id': questions[0]['id'], 'answer': 123},
+				{'question_id': questions[0]['id'], 'answer': ['text']},
+				{'question_id': 1, 'answer': ANSWER}):
+			resp = client.post('/submit-answers', json={'session_id': session_id, 'answers': [bad]})
+			assert resp.status_code == 400
+
+		resp = client.post('/submit-answers', json={
+			'session_id': session_id,
+			'answers': [{'question_id': q['id'], 'answer': ANSWER} for q in questions],
+		})
+		assert resp.status_code == 200
+		body = resp.get_json()
+		assert [r['question_id'] for r in body['results']] == [q['id'] for q in questions]
+		assert body['completed'] is True
+		assert body['answered_questions'] == body['total_questions'] == len(questions)
+		notifications = client.get('/api/notifications').get_json()['notifications']
+		assert [n['type'] for n in notifications] == ['interview_result']
+
+		# Same scores as answering one question at a time
+		single = client.post('/submit-answer', json={
+			'session_id': session_id,
+			'question_id': questions[0]['id'],
+			'answer': ANSWER,
+		}).get_json()
+		assert single['score'] == body['results'][0]['score']
+
+		results = client.get(f'/get-results/{session_id}').get_json()
+		assert [v['score'] for v in results['detailed_scores'].values()] == [r['score'] for r in body['results']]
+
+
+def test_report_is_cached_until_an_answer_changes():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		interview = start_interview(client, 'reportuser')
+		session_id = interview['session_id']
+		question_id = interview['questions'][0]['id']
+		client.post('/submit-answer', json={'session_id': session_id, 'question_id': question_id, 'answer': ANSWER})
+
+		first = client.get(f'/download-report/{session_id}')
+		assert first.status_code == 200
+		assert first.data.startswith(b'%PDF')
+		etag = first.headers['ETag']
+		stored = app_module.report_cache.stats()['stored']
+
+		# Revalidation and repeat downloads do no rendering
+		assert client.get(f'/download-report/{session_id}', headers={'If-None-Match': etag}).status_code == 304
+		again = client.get(f'/download-report/{session_id}')
+		assert again.data == first.data
+		# The disk tier serves other workers (and this one after a restart)
+		app_module.report_cache.clear()
+		assert client.get(f'/download-report/{session_id}').data == first.data
+		assert app_module.report_cache.stats()['stored'] == stored
+
+		client.post('/submit-answer', json={'session_id': session_id, 'question_id': question_id, 'answer': 'too short'})
+		changed = client.get(f'/download-report/{session_id}', headers={'If-None-Match': etag})
+		assert changed.status_code == 200
+		assert changed.headers['ETag'] != etag
+		assert changed.data != first.data
+
+
+def test_report_job_renders_in_the_background():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		interview = start_interview(client, 'reportjobuser')
+		session_id = interview['session_id']
+		client.post('/submit-answer', json={
+			'session_id': session_id,
+			'question_id': interview['questions'][0]['id'],
+			'answer': ANSWER,
+		})
+
+		started = client.post(f'/reports/{session_id}')
+		assert started.status_code in (200, 202)
+		job_id = started.get_json()['job_id']
+		assert started.headers['Location'].endswith(f'/reports/jobs/{job_id}')
+
+		# Finished jobs leave the PDF to the report cache instead of holding it
+		assert app_module.report_jobs.wait(app_module.report_jobs.get(job_id)) is None
+		status = client.get(f'/reports/jobs/{job_id}').get_json()
+		assert status['status'] == 'done'
+		report = client.get(status['download_url'])
+		assert report.status_code == 200
+		assert report.headers['ETag'] == f'"{job_id}"'
+		assert report.data.startswith(b'%PDF')
+
+		# A report evicted after its job finished is rendered again rather than lost
+		app_module.report_cache.clear()
+		os.remove(os.path.join(app_module.report_cache.directory, f'{job_id}.pdf'))
+		assert client.get(status['download_url']).data == report.data
+
+		# The rendered report is reused instead of starting another job
+		again = client.post(f'/reports/{session_id}')
+		assert again.status_code == 200
+		assert again.get_json()['job_id'] == job_id
+		assert client.post('/reports/missing-session').status_code == 404
+
+	with app_module.app.test_client() as other:
+		start_interview(other, 'reportjobother')
+		assert other.get(f'/reports/jobs/{job_id}').status_code == 404
+
+
+def test_results_are_read_from_the_stored_summary():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		interview = start_interview(client, 'storedresultsuser')
+		session_id = interview['session_id']
+		questions = interview['questions']
+		empty = client.get(f'/get-results/{session_id}').get_json()
+		assert (empty['answered_questions'], empty['overall_score'], empty['total_questions']) == (0, 0, len(questions))
+		assert empty['skills_identified']
+
+		client.post('/submit-answers', json={'session_id': session_id, 'answers': [
+			{'question_id': questions[0]['id'], 'answer': ANSWER},
+			{'question_id': questions[1]['id'], 'answer': 'too short'},
+		]})
+		expected = client.get(f'/get-results/{session_id}').get_json()
+		assert expected['answered_questions'] == 2
+		assert expected['min_score'] == 0
+		assert list(expected['detailed_scores']) == [questions[0]['id'], questions[1]['id']]
+		assert sum(expected['category_scores'].values()) > 0
+
+		# Reads never decode the session blobs
+		with app_module.db_pool.connection() as conn:
+			conn.execute("UPDATE interview_sessions SET questions = 'x', resume_data = 'x' WHERE session_id = ?", (session_id,))
+			conn.commit()
+		assert client.get(f'/get-results/{session_id}').get_json() == expected
+
+		# Sessions without a summary (from older workers) are summarized on first read
+		with app_module.db_pool.connection() as conn:
+			conn.execute('UPDATE interview_sessions SET questions = ?, resume_data = NULL WHERE session_id = ?',
+				(json.dumps(questions), session_id))
+			conn.execute('DELETE FROM session_results WHERE session_id = ?', (session_id,))
+			conn.commit()
+		rebuilt = client.get(f'/get-results/{session_id}').get_json()
+		assert rebuilt == dict(expected, skills_identified=[])
+
+
+def test_resume_text_is_stored_once_outside_the_session_row():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		first = start_interview(client, 'resumetextuser')['session_id']
+		resume = (PROJECT_ROOT / 'demo_resume.txt').read_bytes()
+		resp = client.post('/upload-resume', data={
+			'resume': (io.BytesIO(resume), 'resume.txt'),
+			'job_role': 'Data Scientist',
+		}, content_type='multipart/form-data')
+		second = resp.get_json()['session_id']
+
+		with app_module.db_pool.connection() as conn:
+			rows = conn.execute('SELECT resume_data, resume_text_hash FROM interview_sessions WHERE session_id IN (?, ?)',
+				(first, second)).fetchall()
+			assert rows[0][1] and rows[0][1] == rows[1][1]
+			summary = json.loads(rows[0][0])
+			assert 'full_text' not in summary and summary['skills']
+			text = load_resume_text(conn, rows[0][1])
+			assert text.strip() and summary['text_length'] == len(text)
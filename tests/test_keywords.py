@@ -0,0 +1,23 @@
+import importlib
+
+from keywords import KeywordMatcher
+
+
+def test_matches_whole_words_plurals_and_phrases():
+	matcher = KeywordMatcher({
+		'tech': ['ai', 'time', 'loop', 'process', 'process builder', 'asp.net'],
+		'team': ['process', 'team'],
+	})
+	match = matcher.match('Sometimes we maintain loops; the Process Builder runs on ASP.NET.')
+	assert sorted(match.found('tech')) == ['asp.net', 'loop', 'process', 'process builder']
+	assert match.found('team') == ['process']
+	assert matcher.counts('AI teams save time.') == {'tech': 2, 'team': 1}
+
+
+def test_score_answer_ignores_substrings_inside_words():
+	ai = importlib.import_module('app').skillmate_ai
+	padding = ' We met every week and I kept notes of what happened in detail.'
+	inside_words = 'Sometimes the functionality was hard to maintain and spaced out.' + padding
+	whole_words = 'The function had time and space issues and the loop was slow.' + padding
+	assert 'Use more technical language' in ' '.join(ai.score_answer('q', inside_words, 'coding')['areas_to_improve'])
+	assert ai.score_answer('q', whole_words, 'coding')['feedback'].count('technical terminology') == 1
@@ -0,0 +1,62 @@
+import json
+import shutil
+import sqlite3
+from pathlib import Path
+
+from migrations import MIGRATIONS, apply_migrations, backfill_session_answers, find_full_scans, get_schema_version
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_fresh_database_has_full_schema_and_no_full_scans(tmp_path):
+	conn = sqlite3.connect(str(tmp_path / 'fresh.db'))
+	applied = apply_migrations(conn)
+	assert applied == [m[0] for m in MIGRATIONS]
+	assert get_schema_version(conn) == MIGRATIONS[-1][0]
+	columns = {row[1] for row in conn.execute('PRAGMA table_info(interview_requests)')}
+	assert {'workflow_status', 'recruiter_proposed_date', 'final_date'} <= columns
+	assert find_full_scans(conn) == []
+
+	# Running again is a no-op
+	assert apply_migrations(conn) == []
+	conn.close()
+
+
+def test_legacy_database_is_upgraded(tmp_path):
+	# skillmate.db predates roles, notifications and the interview workflow
+	legacy = tmp_path / 'legacy.db'
+	shutil.copy(PROJECT_ROOT / 'skillmate.db', legacy)
+	conn = sqlite3.connect(str(legacy))
+	before = conn.execute('SELECT COUNT(*) FROM interview_sessions').fetchone()[0]
+	apply_migrations(conn)
+	assert conn.execute('SELECT COUNT(*) FROM interview_sessions').fetchone()[0] == before
+	assert conn.execute("SELECT COUNT(*) FROM users WHERE role = 'user'").fetchone()[0] >= 1
+	assert conn.execute('SELECT COUNT(*) FROM notifications').fetchone()[0] == 0
+	# Resume text moved out of the session rows
+	assert conn.execute('''SELECT COUNT(*) FROM interview_sessions WHERE resume_data LIKE '%"full_text"%' ''').fetchone()[0] == 0
+	assert conn.execute('SELECT COUNT(*) FROM interview_sessions WHERE resume_text_hash IS NOT NULL').fetchone()[0] == before
+	assert find_full_scans(conn) == []
+	conn.close()
+
+
+def test_legacy_json_answers_are_backfilled(tmp_path):
+	conn = sqlite3.connect(str(tmp_path / 'backfill.db'))
+	apply_migrations(conn)
+	questions = [{'id': 'coding_1'}, {'id': 'scenario_1'}]
+	conn.execute(
+		'INSERT INTO interview_sessions (user_id, session_id, questions, answers, scores) VALUES (?, ?, ?, ?, ?)',
+		(1, 's1', json.dumps(questions), json.dumps({'coding_1': 'a', 'scenario_1': 'b'}),
+		 json.dumps({'coding_1': {'score': 50, 'feedback': 'ok', 'areas_to_improve': ['x']}, 'scenario_1': 75})))
+	conn.execute(
+		'INSERT INTO interview_sessions (user_id, session_id, questions, answers, scores) VALUES (?, ?, ?, ?, ?)',
+		(1, 's2', json.dumps(questions), json.dumps({'coding_1': 'a'}), json.dumps([{'score': 40}])))
+	conn.commit()
+
+	assert backfill_session_answers(conn) == 2
+	assert backfill_session_answers(conn) == 2  # idempotent
+	conn.commit()
+	assert conn.execute('SELECT COUNT(*) FROM session_answers').fetchone()[0] == 3
+	assert conn.execute("SELECT question_id, score FROM session_scores WHERE session_id = 's2'").fetchall() == [('coding_1', 40)]
+	# The triggers derive overall_score from the backfilled rows
+	assert conn.execute("SELECT overall_score FROM interview_sessions WHERE session_id = 's1'").fetchone()[0] == 63
+	conn.close()
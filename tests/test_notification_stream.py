@@ -0,0 +1,196 @@
+import importlib
+import json
+
+
+def get_app_module():
+	return importlib.import_module('app')
+
+
+def register(client, username):
+	client.post('/register', data={
+		'username': username,
+		'email': f'{username}@example.com',
+		'password': 'secret',
+		'full_name': username.title(),
+	})
+	with client.session_transaction() as sess:
+		return sess['user_id']
+
+
+def read_events(resp, count):
+	events = []
+	chunks = iter(resp.response)
+	while len(events) < count:
+		chunk = next(chunks)
+		chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+		if chunk.startswith('retry:') or chunk.startswith(':'):
+			continue
+		fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+		events.append((fields.get('id'), fields['event'], json.loads(fields['data'])))
+	return events
+
+
+def test_stream_pushes_new_notifications_and_resumes():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	with app_module.app.test_client() as client:
+		user_id = register(client, 'streamuser')
+
+		resp = client.get('/api/notifications/stream', buffered=False)
+		assert resp.status_code == 200
+		assert resp.mimetype == 'text/event-stream'
+		assert read_events(resp, 1) == [(None, 'count', {'count': 0})]
+
+		with app_module.app.app_context():
+			assert app_module.create_notification(user_id, 'interview_result', 'Done', 'Finished', {'session_id': 's1'})
+		event_id, event, data = read_events(resp, 1)[0]
+		assert event == 'notification'
+		assert data['title'] == 'Done'
+		assert data['data'] == {'session_id': 's1'}
+		assert int(event_id) == data['id']
+		resp.close()
+		assert app_module.notification_broker.stream_count(user_id) == 0
+
+		# Notifications created while disconnected are replayed after Last-Event-ID
+		with app_module.app.app_context():
+			app_module.create_notification(user_id, 'interview_result', 'Missed', 'While offline')
+		resp = client.get('/api/notifications/stream', headers={'Last-Event-ID': event_id}, buffered=False)
+		events = read_events(resp, 2)
+		assert events[0] == (None, 'count', {'count': 2})
+		assert events[1][1] == 'notification'
+		assert events[1][2]['title'] == 'Missed'
+		resp.close()
+
+
+def test_stream_connection_cap_per_user():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	broker = app_module.notification_broker
+	original_cap = broker.max_streams_per_user
+	broker.max_streams_per_user = 1
+	try:
+		with app_module.app.test_client() as client:
+			register(client, 'capuser')
+			first = client.get('/api/notifications/stream', buffered=False)
+			assert first.status_code == 200
+
+			second = client.get('/api/notifications/stream', buffered=False)
+			assert second.status_code == 429
+			assert second.get_json()['fallback'] == 'poll'
+
+			first.close()
+			third = client.get('/api/notifications/stream', buffered=False)
+			assert third.status_code == 200
+			third.close()
+	finally:
+		broker.max_streams_per_user = original_cap
+
+
+def test_unread_count_cache_is_kept_in_sync():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	cache = app_module.unread_counts
+	with app_module.app.test_client() as client:
+		user_id = register(client, 'countuser')
+		with app_module.app.app_context():
+			for title in ('One', 'Two'):
+				app_module.create_notification(user_id, 'interview_result', title, 'Message')
+
+		hits = cache.stats()['hits']
+		assert client.get('/api/notifications/count').get_json() == {'count': 2}
+		assert client.get('/api/notifications/count').get_json() == {'count': 2}
+		assert cache.stats()['hits'] == hits + 1
+
+		notification_id = client.get('/api/notifications').get_json()['notifications'][0]['id']
+		client.post(f'/api/notifications/{notification_id}/read')
+		client.post(f'/api/notifications/{notification_id}/read')
+		assert client.get('/api/notifications/count').get_json() == {'count': 1}
+
+		client.post('/api/notifications/mark-all-read')
+		assert client.get('/api/notifications/count').get_json() == {'count': 0}
+
+
+def test_unread_count_cache_evicts_and_rejects_stale_fills():
+	notifications = importlib.import_module('notifications')
+	cache = notifications.UnreadCountCache(max_size=2)
+
+	# A write between loading and filling means the loaded count may be stale
+	token = cache.token()
+	cache.adjust(1, 1)
+	assert not cache.fill(1, 0, token)
+	assert cache.get(1) is None
+
+	for user_id in (1, 2, 3):
+		cache.fill(user_id, user_id, cache.token())
+	assert cache.get(1) is None
+	assert cache.get(3) == 3
+	assert cache.adjust(3, -1) == 2
+	assert cache.stats()['evictions'] == 1
+
+
+def test_fill_between_commit_and_adjust_is_not_counted_twice(tmp_path):
+	from database import ConnectionPool
+	from migrations import apply_migrations
+	notifications = importlib.import_module('notifications')
+
+	pool = ConnectionPool(str(tmp_path / 'race.db'), max_size=2)
+	with pool.connection() as conn:
+		apply_migrations(conn)
+
+	def load(cache):
+		count = cache.get(7)
+		if count is None:
+			token = cache.token()
+			with pool.connection() as conn:
+				count = conn.execute('SELECT COUNT(*) FROM notifications WHERE user_id = 7 AND is_read = FALSE').fetchone()[0]
+			cache.fill(7, count, token)
+		return count
+
+	class RacingCache(notifications.UnreadCountCache):
+		def adjust(self, user_id, delta):
+			# A reader misses and loads the count after the commit, before the adjustment
+			assert load(self) == 1
+			return super().adjust(user_id, delta)
+
+	cache = RacingCache()
+	writer = notifications.NotificationWriter(pool, notifications.NotificationBroker(), cache, synchronous=True)
+	assert writer.submit(7, 'interview_result', 'Title', 'Message')
+	assert cache.stats()['stale_fills'] == 1
+	assert load(cache) == 1
+	pool.close_all()
+
+
+def test_background_writer_batches_and_flushes(tmp_path):
+	from database import ConnectionPool
+	from migrations import apply_migrations
+	notifications = importlib.import_module('notifications')
+
+	pool = ConnectionPool(str(tmp_path / 'writer.db'), max_size=2)
+	with pool.connection() as conn:
+		apply_migrations(conn)
+	broker = notifications.NotificationBroker()
+	subscription = broker.subscribe(7)
+	writer = notifications.NotificationWriter(
+		pool, broker, notifications.UnreadCountCache(), flush_interval=0.2, synchronous=False)
+
+	for i in range(25):
+		assert writer.submit(7, 'interview_result', f'Title {i}', 'Message', {'n': i})
+	writer.flush()
+
+	with pool.connection() as conn:
+		rows = conn.execute('SELECT id, title FROM notifications WHERE user_id = 7 ORDER BY id').fetchall()
+	assert [title for _, title in rows] == [f'Title {i}' for i in range(25)]
+	stats = writer.stats()
+	assert stats['written'] == 25
+	assert stats['batches'] < 25
+	assert stats['queue_depth'] == 0
+
+	# Pushed events carry the ids the rows actually received
+	event_ids = [subscription._queue.get_nowait()[0] for _ in range(25)]
+	assert event_ids == [row_id for row_id, _ in rows]
+
+	writer.submit(7, 'interview_result', 'Last', 'Written on close')
+	writer.close()
+	with pool.connection() as conn:
+		assert conn.execute('SELECT COUNT(*) FROM notifications').fetchone()[0] == 26
+	pool.close_all()
@@ -0,0 +1,77 @@
+import importlib
+import json
+import os
+
+from werkzeug.security import generate_password_hash
+
+from question_bank import QuestionBankStore
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+def write_bank(path, version, questions, mtime):
+	path.write_text(json.dumps({'version': version, 'questions': questions}))
+	os.utime(path, (mtime, mtime))
+
+
+def test_shipped_bank_is_indexed_by_type_and_key():
+	store = QuestionBankStore()
+	bank = store.current()
+	assert len(bank.get('coding', 'advanced')) == 5
+	assert len(bank.get('role_specific', 'java_fullstack')) == 8
+	assert len(bank.get('scenario', 'leadership')) == 5
+	assert bank.get('role_specific', 'astronaut') == ()
+
+
+def test_reloads_atomically_when_the_file_changes(tmp_path):
+	path = tmp_path / 'bank.json'
+	write_bank(path, 1, [{'type': 'coding', 'level': 'beginner', 'text': 'Old question'}], 1000)
+	clock = FakeClock()
+	store = QuestionBankStore(str(path), check_interval=10, clock=clock)
+	before = store.current()
+
+	write_bank(path, 2, [{'type': 'coding', 'level': 'beginner', 'text': 'New question'}], 2000)
+	assert store.current() is before
+
+	# The change is picked up at the next check; the old snapshot is untouched
+	clock.now = 10
+	after = store.current()
+	assert after.version == 2
+	assert after.get('coding', 'beginner') == ('New question',)
+	assert before.get('coding', 'beginner') == ('Old question',)
+
+	# A broken file is reported and the last good bank stays in use
+	path.write_text('{"version": 3, "questions": [')
+	assert not store.reload()
+	assert store.current() is after
+	assert store.stats()['reload_errors'] == 1
+
+
+def test_reload_endpoint_is_for_recruiters():
+	app_module = importlib.import_module('app')
+	app_module.app.testing = True
+	with app_module.db_pool.connection() as conn:
+		conn.execute(
+			"INSERT INTO users (username, email, password_hash, full_name, role) VALUES (?, ?, ?, ?, 'recruiter')",
+			('bankrecruiter', 'bankrecruiter@example.com', generate_password_hash('secret'), 'Recruiter'))
+		conn.commit()
+	with app_module.app.test_client() as client:
+		client.post('/register', data={
+			'username': 'bankcandidate',
+			'email': 'bankcandidate@example.com',
+			'password': 'secret',
+			'full_name': 'Candidate',
+		})
+		assert client.post('/api/question-bank/reload').status_code == 403
+		client.get('/logout')
+
+		client.post('/login', data={'username': 'bankrecruiter', 'password': 'secret'})
+		resp = client.post('/api/question-bank/reload')
+		assert resp.status_code == 200
+		assert resp.get_json()['question_bank']['questions'] == 88
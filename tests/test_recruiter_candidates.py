@@ -0,0 +1,72 @@
+import importlib
+
+from werkzeug.security import generate_password_hash
+
+
+def get_app_module():
+	return importlib.import_module('app')
+
+
+def seed_candidates(app_module, prefix, scores):
+	with app_module.db_pool.connection() as conn:
+		for i, score in enumerate(scores):
+			cursor = conn.execute(
+				'INSERT INTO users (username, email, password_hash, full_name, company, experience_years) VALUES (?, ?, ?, ?, ?, ?)',
+				(f'{prefix}{i}', f'{prefix}{i}@example.com', 'x', f'{prefix.title()} {i}', 'Acme' if i % 2 else 'Globex', i))
+			if score is not None:
+				conn.execute('UPDATE candidate_stats SET best_score = ?, total_interviews = 1 WHERE user_id = ?', (score, cursor.lastrowid))
+		conn.execute(
+			"INSERT INTO users (username, email, password_hash, full_name, role) VALUES (?, ?, ?, ?, 'recruiter')",
+			(f'{prefix}recruiter', f'{prefix}recruiter@example.com', generate_password_hash('secret'), 'Recruiter'))
+		conn.commit()
+
+
+def login(client, username):
+	client.post('/login', data={'username': username, 'password': 'secret'})
+
+
+def fetch_all(client, query):
+	names, cursor = [], None
+	while True:
+		url = f'/api/recruiter/candidates?{query}&limit=2' + (f'&cursor={cursor}' if cursor else '')
+		data = client.get(url).get_json()
+		names.extend(c['full_name'] for c in data['candidates'])
+		cursor = data['next_cursor']
+		if not data['has_more']:
+			assert cursor is None
+			return names
+
+
+def test_keyset_pages_cover_every_candidate_once():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	scores = [70, None, 95, 70, 10, None, 70]
+	seed_candidates(app_module, 'pager', scores)
+	with app_module.app.test_client() as client:
+		login(client, 'pagerrecruiter')
+		names = fetch_all(client, 'name=Pager')
+		assert sorted(names) == sorted(f'Pager {i}' for i in range(len(scores)))
+		# Best score descending, unscored last, ties broken by newest user first
+		assert names[:5] == ['Pager 2', 'Pager 6', 'Pager 3', 'Pager 0', 'Pager 4']
+
+		assert fetch_all(client, 'name=Pager&min_score=60&max_score=79') == ['Pager 6', 'Pager 3', 'Pager 0']
+		assert fetch_all(client, 'name=Pager&has_score=0') == ['Pager 5', 'Pager 1']
+		assert fetch_all(client, 'name=Pager&company=acme&min_experience=3') == ['Pager 3', 'Pager 5']
+		assert fetch_all(client, 'name=Pager&sort=total_interviews&order=asc')[:2] == ['Pager 1', 'Pager 5']
+
+
+def test_candidate_api_rejects_bad_input():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	seed_candidates(app_module, 'badinput', [50])
+	with app_module.app.test_client() as client:
+		login(client, 'badinputrecruiter')
+		assert client.get('/api/recruiter/candidates?sort=password_hash').status_code == 400
+		assert client.get('/api/recruiter/candidates?cursor=not-a-cursor').status_code == 400
+		for values in (['best_score', 'desc', [50], 1], ['best_score', 'desc', 50, {'id': 1}],
+				['best_score', 'desc', 50], ['best_score', 'desc', 50, 1.5], [1, 'desc', 50, 1]):
+			bad = app_module.encode_cursor(values)
+			assert client.get(f'/api/recruiter/candidates?sort=best_score&cursor={bad}').status_code == 400
+		cursor = app_module.encode_cursor(['best_score', 'desc', 50, 1])
+		assert client.get(f'/api/recruiter/candidates?sort=latest_score&cursor={cursor}').status_code == 400
+		assert client.get('/recruiter/dashboard').status_code == 200
@@ -0,0 +1,51 @@
+import os
+
+from report_cache import ReportCache
+
+
+def test_memory_and_disk_tiers_evict_least_recently_used(tmp_path):
+	cache = ReportCache(str(tmp_path), memory_bytes=250, disk_bytes=250)
+	keys = [cache.key('s1', version) for version in range(3)]
+	assert len(set(keys)) == 3
+	assert cache.key('s1', 0) == keys[0]
+
+	cache.put(keys[0], b'a' * 100)
+	cache.put(keys[1], b'b' * 100)
+	# Touch the older entry in both tiers so the second one is evicted
+	os.utime(tmp_path / f'{keys[0]}.pdf', (0, 0))
+	os.utime(tmp_path / f'{keys[1]}.pdf', (0, 0))
+	assert cache.get(keys[0]) == b'a' * 100
+	cache.clear()
+	assert cache.get(keys[0]) == b'a' * 100
+	cache.put(keys[2], b'c' * 100)
+
+	assert sorted(os.listdir(tmp_path)) == sorted([f'{keys[0]}.pdf', f'{keys[2]}.pdf'])
+	assert cache.get(keys[1]) is None
+	stats = cache.stats()
+	assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 1, 1)
+	assert stats['disk_evictions'] == 1
+	assert stats['memory_bytes'] == 200
+
+	# Reports larger than the memory budget are only kept on disk
+	big = cache.key('s2', 0)
+	cache.put(big, b'd' * 300)
+	assert cache.stats()['memory_bytes'] == 200
+
+
+def test_disk_tier_is_only_listed_when_over_budget(tmp_path):
+	cache = ReportCache(str(tmp_path), memory_bytes=0, disk_bytes=1000)
+	for version in range(9):
+		cache.put(cache.key('s1', version), b'x' * 100)
+	# The first write lists the directory; later ones keep a running total
+	stats = cache.stats()
+	assert (stats['disk_scans'], stats['disk_bytes'], stats['disk_evictions']) == (1, 900, 0)
+
+	cache.put(cache.key('s1', 8), b'y' * 100)  # replacing a file keeps the total
+	cache.put(cache.key('s1', 9), b'x' * 100)
+	assert cache.stats()['disk_scans'] == 1
+	cache.put(cache.key('s1', 10), b'x' * 100)
+	stats = cache.stats()
+	assert stats['disk_scans'] == 2
+	# Pruned below the budget, so the next write does not list it again
+	assert stats['disk_bytes'] <= 900 and stats['disk_evictions'] >= 2
+	assert sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)) == stats['disk_bytes']
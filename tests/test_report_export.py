@@ -0,0 +1,73 @@
+import importlib
+import io
+import json
+import zipfile
+
+from werkzeug.security import generate_password_hash
+
+from report_export import stream_zip
+
+
+def get_app_module():
+	return importlib.import_module('app')
+
+
+def seed_sessions(app_module, prefix, scores):
+	questions = [{'id': 'q1', 'type': 'coding', 'category': 'Algorithms', 'question': 'Reverse a list'}]
+	with app_module.db_pool.connection() as conn:
+		for i, score in enumerate(scores):
+			user_id = conn.execute(
+				'INSERT INTO users (username, email, password_hash, full_name) VALUES (?, ?, ?, ?)',
+				(f'{prefix}{i}', f'{prefix}{i}@example.com', 'x', f'{prefix.title()} {i}')).lastrowid
+			conn.execute(
+				'INSERT INTO interview_sessions (user_id, session_id, job_role, resume_data, questions) VALUES (?, ?, ?, ?, ?)',
+				(user_id, f'{prefix}-session-{i}', f'{prefix} engineer', json.dumps({'skills': ['python']}), json.dumps(questions)))
+			conn.execute(
+				'INSERT INTO session_scores (session_id, question_id, score, feedback, areas_to_improve) VALUES (?, ?, ?, ?, ?)',
+				(f'{prefix}-session-{i}', 'q1', score, 'Fine', '[]'))
+		conn.execute(
+			"INSERT INTO users (username, email, password_hash, full_name, role) VALUES (?, ?, ?, ?, 'recruiter')",
+			(f'{prefix}recruiter', f'{prefix}recruiter@example.com', generate_password_hash('secret'), 'Recruiter'))
+		conn.commit()
+
+
+def test_stream_zip_writes_entries_as_they_come():
+	pieces = list(stream_zip(iter([('a.pdf', b'%PDF a'), ('b.txt', 'error')])))
+	assert len(pieces) == 3
+	with zipfile.ZipFile(io.BytesIO(b''.join(pieces))) as archive:
+		assert archive.namelist() == ['a.pdf', 'b.txt']
+		assert archive.read('a.pdf') == b'%PDF a'
+
+
+def test_recruiter_exports_matching_reports_as_zip():
+	app_module = get_app_module()
+	app_module.app.testing = True
+	seed_sessions(app_module, 'exporter', [40, 75, 90])
+	# One report is already cached and is not rendered again
+	cached, _ = app_module.render_session_report('exporter-session-2')
+
+	with app_module.app.test_client() as client:
+		client.post('/login', data={'username': 'exporter0', 'password': 'secret'})
+		assert client.get('/api/recruiter/reports/export').status_code in (302, 403)
+
+		client.post('/login', data={'username': 'exporterrecruiter', 'password': 'secret'})
+		assert client.get('/api/recruiter/reports/export?from=yesterday').status_code == 400
+
+		before = app_module.report_export_pool.stats()
+		resp = client.get('/api/recruiter/reports/export?role=exporter&min_score=50')
+		assert resp.status_code == 200
+		assert resp.mimetype == 'application/zip'
+		with zipfile.ZipFile(io.BytesIO(resp.data)) as archive:
+			names = archive.namelist()
+			assert names == ['Exporter_1_exporter-session-1.pdf', 'Exporter_2_exporter-session-2.pdf']
+			assert archive.read(names[0]).startswith(b'%PDF')
+			assert archive.read(names[1]) == cached
+		resp.close()
+
+		stats = app_module.report_export_pool.stats()
+		assert (stats['rendered'] - before['rendered'], stats['cached'] - before['cached']) == (1, 1)
+		assert stats['active_exports'] == 0
+
+		empty = client.get('/api/recruiter/reports/export?role=exporter&max_score=10')
+		with zipfile.ZipFile(io.BytesIO(empty.data)) as archive:
+			assert archive.namelist() == []
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from report_jobs import ReportJobFailed, ReportJobPool, ReportQueueFull
+
+
+def test_concurrent_requests_share_one_render_and_queue_is_bounded():
+	pool = ReportJobPool(workers=1, max_pending=2, ttl=60)
+	release = threading.Event()
+	started = threading.Event()
+	renders = []
+
+	def render(name):
+		def run():
+			renders.append(name)
+			started.set()
+			release.wait(5)
+			return name.encode()
+		return run
+
+	try:
+		first = pool.submit('k1', 's1', 1, render('first'))
+		assert pool.submit('k1', 's1', 1, render('duplicate')) is first
+		second = pool.submit('k2', 's2', 1, render('second'))
+		assert started.wait(5)
+		with pytest.raises(ReportQueueFull):
+			pool.submit('k3', 's3', 1, render('third'))
+
+		assert pool.status(second) == {'job_id': 'k2', 'session_id': 's2', 'status': 'queued', 'queue_position': 1}
+		stats = pool.stats()
+		assert (stats['queued'] + stats['running'], stats['deduplicated'], stats['rejected']) == (2, 1, 1)
+
+		release.set()
+		assert pool.wait(first) == b'first'
+		assert pool.wait(second) == b'second'
+		assert renders == ['first', 'second']
+		assert pool.status(first)['status'] == 'done'
+		assert pool.stats()['completed'] == 2
+	finally:
+		release.set()
+		pool.shutdown()
+
+
+def test_failed_render_is_reported_and_retried():
+	now = [0.0]
+	pool = ReportJobPool(workers=1, max_pending=4, ttl=10, clock=lambda: now[0])
+
+	def broken():
+		raise ValueError('Session not found')
+
+	try:
+		job = pool.submit('k1', 's1', 1, broken)
+		with pytest.raises(ReportJobFailed):
+			pool.wait(job)
+		assert pool.status(job)['error'] == 'Session not found'
+
+		retry = pool.submit('k1', 's1', 1, lambda: b'pdf')
+		assert retry is not job
+		assert pool.wait(retry) == b'pdf'
+
+		# Finished jobs are forgotten after the TTL
+		now[0] = 11.0
+		assert pool.get('k1') is None
+	finally:
+		pool.shutdown()
@@ -0,0 +1,97 @@
+import importlib
+import io
+import json
+
+from database import ConnectionPool
+from migrations import apply_migrations
+from resume_cache import ResumeCache
+
+RESULT = {'skills': ['python'], 'experience_level': 'senior', 'full_text': 'Senior Python engineer'}
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 1000.0
+
+	def __call__(self):
+		self.now += 1
+		return self.now
+
+
+def make_pool(tmp_path):
+	pool = ConnectionPool(str(tmp_path / 'resume_cache.db'), max_size=2)
+	with pool.connection() as conn:
+		apply_migrations(conn)
+	return pool
+
+
+def test_hits_misses_and_version_changes(tmp_path):
+	pool = make_pool(tmp_path)
+	cache = ResumeCache('v1', pool)
+	key = cache.key(b'%PDF resume bytes', 'cv.pdf')
+	assert key != cache.key(b'%PDF resume bytes', 'cv.docx')
+	assert cache.get(key, 17) is None
+	cache.put(key, RESULT, 17)
+	assert cache.get(key, 17) == RESULT
+	stats = cache.stats()
+	assert (stats['hits'], stats['misses'], stats['bytes_saved'], stats['hit_ratio']) == (1, 1, 17, 0.5)
+
+	# A new parser version cannot see, and purges, the old entries
+	upgraded = ResumeCache('v2', pool)
+	assert upgraded.get(upgraded.key(b'%PDF resume bytes', 'cv.pdf'), 17) is None
+	with pool.connection() as conn:
+		assert conn.execute('SELECT COUNT(*) FROM resume_cache').fetchone()[0] == 0
+	pool.close_all()
+
+
+def test_evicts_least_recently_used_by_count_and_size(tmp_path):
+	pool = make_pool(tmp_path)
+	cache = ResumeCache('v1', pool, max_entries=3, clock=FakeClock())
+	keys = [cache.key(f'resume {i}'.encode(), 'cv.pdf') for i in range(4)]
+	for key in keys[:3]:
+		cache.put(key, RESULT, 100)
+	assert cache.get(keys[0], 100) == RESULT
+	cache.put(keys[3], RESULT, 100)
+	assert cache.get(keys[1], 100) is None
+	assert cache.get(keys[0], 100) == RESULT
+
+	# Shrinking the byte budget evicts down to what fits
+	cache.max_bytes = len(json.dumps(RESULT)) * 2
+	cache.put(cache.key(b'resume 4', 'cv.pdf'), RESULT, 100)
+	with pool.connection() as conn:
+		assert conn.execute('SELECT COUNT(*) FROM resume_cache').fetchone()[0] == 2
+	assert cache.stats()['evictions'] == 3
+	pool.close_all()
+
+
+def test_repeat_upload_skips_extraction():
+	app_module = importlib.import_module('app')
+	app_module.app.testing = True
+	docx = importlib.import_module('docx')
+	document = docx.Document()
+	document.add_paragraph('Principal engineer with Go and SQL')
+	buffer = io.BytesIO()
+	document.save(buffer)
+	resume = buffer.getvalue()
+
+	with app_module.app.test_client() as client:
+		client.post('/register', data={
+			'username': 'repeatupload',
+			'email': 'repeatupload@example.com',
+			'password': 'secret',
+			'full_name': 'Repeat Upload',
+		})
+		summaries = []
+		for _ in range(2):
+			tasks = app_module.extraction_pool.stats()['tasks']
+			resp = client.post('/upload-resume', data={
+				'resume': (io.BytesIO(resume), 'resume.docx'),
+				'job_role': 'Software Engineer',
+			}, content_type='multipart/form-data')
+			assert resp.status_code == 200
+			summaries.append(resp.get_json()['resume_summary'])
+		assert app_module.extraction_pool.stats()['tasks'] == tasks
+		assert summaries[0] == summaries[1] == {'skills': ['sql'], 'experience_level': 'senior'}
+		stats = app_module.skillmate_ai.resume_cache.stats()
+		assert stats['hits'] >= 1
+		assert stats['bytes_saved'] >= len(resume)
@@ -0,0 +1,182 @@
+import glob
+import importlib
+import io
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_resume_parser():
+	return importlib.import_module('resume_parser')
+
+
+def test_streaming_matches_whole_text_on_demo_resumes():
+	resume_parser = get_resume_parser()
+	taxonomy = resume_parser.skill_taxonomy
+	for path in sorted(glob.glob(os.path.join(ROOT, 'demo_*.txt'))):
+		with open(path, encoding='utf-8') as file:
+			text = file.read()
+		skills, levels = taxonomy.match(text)
+		signals = resume_parser.ResumeSignals(max_skills=len(taxonomy.skills))
+		# Small chunks split words and phrases across chunk boundaries
+		result = resume_parser.extract_resume(iter(text[i:i + 7] for i in range(0, len(text), 7)), signals=signals)
+		assert result['skills'] == skills
+		assert result['experience_level'] == next(
+			(level for level in taxonomy.levels if level in levels), resume_parser.DEFAULT_EXPERIENCE_LEVEL)
+
+
+def test_stops_reading_once_result_is_settled():
+	resume_parser = get_resume_parser()
+	pulled = []
+
+	def pages():
+		yield 'Senior engineer: python, k8s, react.js, java\n'
+		for i in range(100):
+			pulled.append(i)
+			yield 'filler page'
+
+	signals = resume_parser.ResumeSignals(max_skills=4)
+	result = resume_parser.extract_resume(pages(), signals=signals)
+	assert result['skills'] == ['python', 'java', 'react', 'kubernetes']
+	assert result['experience_level'] == 'senior'
+	assert pulled == []
+
+
+def test_keywords_split_across_chunks_and_char_budget():
+	resume_parser = get_resume_parser()
+	result = resume_parser.extract_resume(iter(['knows kuber', 'netes and machine ', 'learning']))
+	assert result['skills'] == ['kubernetes', 'machine learning']
+
+	result = resume_parser.extract_resume(iter(['x' * 9 + ' ', 'python ' * 10, 'docker']), max_chars=20)
+	assert result['full_text'] == 'x' * 9 + ' python pyt'
+	assert result['skills'] == ['python']
+
+
+def test_unreadable_document_is_parsed_as_far_as_possible():
+	resume_parser = get_resume_parser()
+
+	def pages():
+		yield 'junior python developer'
+		raise ValueError('corrupt page')
+
+	result = resume_parser.extract_resume(pages())
+	assert result['skills'] == ['python']
+	assert result['experience_level'] == 'mid'
+
+
+def make_docx(text):
+	import docx
+	document = docx.Document()
+	for line in text.splitlines():
+		document.add_paragraph(line)
+	buffer = io.BytesIO()
+	document.save(buffer)
+	return buffer.getvalue()
+
+
+def make_pdf(text):
+	from reportlab.pdfgen import canvas
+	buffer = io.BytesIO()
+	pdf = canvas.Canvas(buffer)
+	for i, line in enumerate(text.splitlines()):
+		pdf.drawString(40, 800 - 14 * i, line)
+	pdf.save()
+	return buffer.getvalue()
+
+
+def test_parses_bytes_and_streams_without_a_path():
+	resume_parser = get_resume_parser()
+	text = 'Jane Roe\nSenior Engineer\nPython, Docker and AWS\nCafé résumé'
+	expected = {'skills': ['python', 'aws', 'docker'], 'experience_level': 'senior'}
+	for data, filename in ((make_pdf(text), 'cv.pdf'), (make_docx(text), 'CV.DOCX'), (text.encode(), 'cv.txt')):
+		for source in (data, io.BytesIO(data)):
+			result = resume_parser.parse_resume_file(source, filename)
+			assert {key: result[key] for key in expected} == expected, filename
+	# Multi-byte characters split across reads are decoded intact
+	chunks = list(resume_parser.iter_text_chunks(io.BytesIO(('é' * 5).encode()), chunk_size=3))
+	assert ''.join(chunks) == 'é' * 5
+
+
+def test_upload_is_parsed_from_the_request_stream(tmp_path, monkeypatch):
+	app_module = importlib.import_module('app')
+	app_module.app.testing = True
+	monkeypatch.chdir(tmp_path)
+	monkeypatch.setitem(app_module.app.config, 'UPLOAD_SPOOL_THRESHOLD', 1024)
+	resume = make_docx('Lead developer\nkubernetes and react\n' + 'filler line\n' * 200)
+	assert len(resume) > 1024
+	with app_module.app.test_client() as client:
+		client.post('/register', data={
+			'username': 'streamupload',
+			'email': 'streamupload@example.com',
+			'password': 'secret',
+			'full_name': 'Stream Upload',
+		})
+		resp = client.post('/upload-resume', data={
+			'resume': (io.BytesIO(resume), 'resume.docx'),
+			'job_role': 'Software Engineer',
+		}, content_type='multipart/form-data')
+	assert resp.status_code == 200
+	assert resp.get_json()['resume_summary'] == {'skills': ['react', 'kubernetes'], 'experience_level': 'senior'}
+	assert list(tmp_path.iterdir()) == []
+
+
+def make_long_pdf(pages):
+	from reportlab.pdfgen import canvas
+	buffer = io.BytesIO()
+	pdf = canvas.Canvas(buffer)
+	for page in range(pages):
+		pdf.drawString(40, 800, f'Page {page}: developer')
+		# Skills only show up on later pages, so the first range cannot settle the result
+		if page == pages - 2:
+			pdf.drawString(40, 780, 'Docker and Kubernetes, lead engineer')
+		pdf.showPage()
+	pdf.save()
+	return buffer.getvalue()
+
+
+def test_extraction_pool_fans_out_and_matches_inline_parsing():
+	resume_parser = get_resume_parser()
+	pool = resume_parser.ExtractionPool(workers=2, timeout=60, fanout_pages=3)
+	try:
+		data = make_long_pdf(10)
+		result = pool.parse(io.BytesIO(data), 'long.pdf')
+		assert result == resume_parser.parse_resume_file(data, 'long.pdf')
+		assert result['skills'] == ['docker', 'kubernetes']
+		assert result['experience_level'] == 'senior'
+
+		stats = pool.stats()
+		assert stats['completed'] == 1
+		assert stats['fanout_uploads'] == 1
+		assert stats['tasks'] == 4
+		assert stats['pending'] == 0
+
+		# Text is cheap to parse and stays on the calling thread
+		pool.parse(b'python developer', 'cv.txt')
+		assert pool.stats()['tasks'] == 4
+	finally:
+		pool.shutdown()
+
+
+def test_extraction_pool_times_out_and_rejects_when_saturated():
+	resume_parser = get_resume_parser()
+	pool = resume_parser.ExtractionPool(workers=1, timeout=0.01, max_pending=1)
+	try:
+		data = make_long_pdf(4)
+		with pytest.raises(resume_parser.ExtractionTimeout):
+			pool.parse(data, 'slow.pdf')
+		assert pool.stats()['timeouts'] == 1
+		assert pool.stats()['restarts'] == 1
+
+		# The killed pool is replaced on the next upload
+		pool.timeout = 60
+		assert pool.parse(data, 'cv.pdf')['skills'] == ['docker', 'kubernetes']
+
+		pool._pending = pool.max_pending
+		with pytest.raises(resume_parser.ExtractionPoolBusy):
+			pool.parse(data, 'busy.pdf')
+		assert pool.stats()['rejected'] == 1
+	finally:
+		pool._pending = 0
+		pool.shutdown()
@@ -0,0 +1,49 @@
+import json
+import sqlite3
+
+from migrations import apply_migrations
+from resume_store import compact_resume_data, load_resume_text, resume_text_stats, slim_resume_data
+
+TEXT = 'Senior Python engineer with Django, PostgreSQL and Kubernetes experience. ' * 40
+
+
+def test_texts_are_compressed_and_shared(tmp_path):
+	conn = sqlite3.connect(str(tmp_path / 'texts.db'))
+	apply_migrations(conn)
+	resume = {'skills': ['python'], 'experience_level': 'senior', 'full_text': TEXT}
+	summary, text_hash = slim_resume_data(conn, resume)
+	assert summary == {'skills': ['python'], 'experience_level': 'senior', 'text_length': len(TEXT)}
+	assert slim_resume_data(conn, dict(resume))[1] == text_hash
+	assert load_resume_text(conn, text_hash) == TEXT
+
+	stats = resume_text_stats(conn)
+	assert stats['texts'] == 1 and stats['bytes'] == len(TEXT)
+	assert stats['compressed_bytes'] < len(TEXT) / 5
+
+	assert slim_resume_data(conn, {'skills': []}) == ({'skills': []}, None)
+	assert load_resume_text(conn, None) is None
+	conn.close()
+
+
+def test_legacy_rows_are_compacted(tmp_path):
+	conn = sqlite3.connect(str(tmp_path / 'compact.db'))
+	apply_migrations(conn)
+	legacy = json.dumps({'skills': ['python'], 'experience_level': 'mid', 'full_text': TEXT})
+	for session_id in ('a', 'b', 'c'):
+		conn.execute('INSERT INTO interview_sessions (user_id, session_id, resume_data) VALUES (1, ?, ?)',
+			(session_id, legacy))
+	conn.execute("INSERT INTO interview_sessions (user_id, session_id, resume_data) VALUES (1, 'd', 'not json')")
+	conn.commit()
+
+	compacted, before, after = compact_resume_data(conn, batch_size=2)
+	conn.commit()
+	assert compacted == 3
+	assert before == 3 * len(legacy) and after < before / 10
+	rows = conn.execute("SELECT resume_data, resume_text_hash FROM interview_sessions WHERE session_id != 'd'").fetchall()
+	assert len({text_hash for _, text_hash in rows}) == 1
+	assert all(json.loads(data)['skills'] == ['python'] for data, _ in rows)
+	assert resume_text_stats(conn)['texts'] == 1
+
+	# Already compacted rows are left alone
+	assert compact_resume_data(conn) == (0, 0, 0)
+	conn.close()
@@ -0,0 +1,29 @@
+import json
+import os
+
+from role_rules import RoleClassifier, role_classifier
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'job_titles.json')
+
+
+def test_job_title_corpus():
+	with open(CORPUS, encoding='utf-8') as file:
+		corpus = json.load(file)
+	misclassified = [(title, expected, role_classifier.detect(title))
+		for title, expected in corpus if role_classifier.detect(title) != expected]
+	assert misclassified == []
+
+
+def test_priority_optional_terms_and_cache():
+	classifier = RoleClassifier([
+		{'role': 'generic', 'priority': 1, 'required': [['engineer']]},
+		{'role': 'data', 'priority': 1, 'required': [['engineer']], 'optional': ['data', 'etl']},
+		{'role': 'platform', 'priority': 5, 'required': [['platform engineer', 'sre']]},
+	], cache_size=2)
+	assert classifier.detect('Engineer') == 'generic'
+	assert classifier.detect('Data Engineer') == 'data'
+	assert classifier.detect('  data   ENGINEER ') == 'data'
+	assert classifier.detect('Data Platform Engineer') == 'platform'
+	assert classifier.detect('Platform Team Engineer') == 'generic'
+	stats = classifier.stats()
+	assert (stats['cache_hits'], stats['cache_misses'], stats['cache_size']) == (1, 4, 2)
@@ -0,0 +1,123 @@
+import importlib
+
+from database import ConnectionPool
+from migrations import apply_migrations
+from scoring_cache import ScoreCache
+
+RESULT = {'score': 70, 'feedback': 'Good response', 'areas_to_improve': ['Add examples']}
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 1000.0
+
+	def __call__(self):
+		return self.now
+
+
+def test_lru_and_ttl_eviction():
+	clock = FakeClock()
+	cache = ScoreCache('v1', max_size=2, ttl=60, clock=clock)
+	keys = [cache.key('coding', False, f'answer {i}') for i in range(3)]
+	for key in keys:
+		cache.put(key, RESULT)
+	assert cache.get(keys[0]) is None
+	assert cache.get(keys[2]) == RESULT
+
+	clock.now += 61
+	assert cache.get(keys[2]) is None
+	stats = cache.stats()
+	assert (stats['hits'], stats['misses'], stats['evictions'], stats['expired']) == (1, 2, 1, 1)
+
+
+def test_persistent_tier_survives_restarts_and_version_changes(tmp_path):
+	pool = ConnectionPool(str(tmp_path / 'cache.db'), max_size=2)
+	with pool.connection() as conn:
+		apply_migrations(conn)
+
+	first = ScoreCache('v1', pool=pool)
+	key = first.key('scenario', False, 'same answer')
+	first.put(key, RESULT)
+
+	# A new process (fresh memory tier) finds the row in SQLite
+	second = ScoreCache('v1', pool=pool)
+	assert second.get(key) == RESULT
+	assert second.stats()['persistent_hits'] == 1
+
+	# A new scorer version never sees the old rows, and purges them
+	upgraded = ScoreCache('v2', pool=pool)
+	assert upgraded.get(upgraded.key('scenario', False, 'same answer')) is None
+	with pool.connection() as conn:
+		assert conn.execute('SELECT COUNT(*) FROM score_cache').fetchone()[0] == 0
+	pool.close_all()
+
+
+def test_identical_answers_share_a_cached_score():
+	app_module = importlib.import_module('app')
+	ai = app_module.SkillMateAI()
+	answer = 'In my experience the team solved the challenge. The result was good. I learned a lot.'
+	first = ai.score_answer('q', answer, 'scenario')
+	first['areas_to_improve'].append('mutated by caller')
+	again = ai.score_answer('q', answer, 'scenario')
+	assert again['score'] == first['score']
+	assert 'mutated by caller' not in again['areas_to_improve']
+	assert ai.score_cache.stats()['hits'] == 1
+
+	# Bumping the scorer version gives every answer a new key
+	class BumpedScorer(app_module.SkillMateAI):
+		SCORER_VERSION = app_module.SkillMateAI.SCORER_VERSION + 1
+
+	bumped = BumpedScorer()
+	assert bumped.scoring_version != ai.scoring_version
+	assert bumped._score_cache_key(answer, 'scenario') != ai._score_cache_key(answer, 'scenario')
+
+
+def test_answers_differing_in_whitespace_are_scored_separately():
+	app_module = importlib.import_module('app')
+	ai = app_module.SkillMateAI()
+	short = ai.score_answer('q', 'x y z', 'coding')
+	padded = ai.score_answer('q', 'x     y     z', 'coding')
+	# The padded answer passes the length check, so it must not reuse the short answer's result
+	assert padded == ai._score_answer('q', 'x     y     z', 'coding')
+	assert padded['feedback'] != short['feedback']
+	assert ai.score_cache.stats()['hits'] == 0
+
+
+class FlakySentiment:
+	"""Stub batcher whose first call times out (returns None) while the model loads"""
+
+	available = True
+
+	def __init__(self):
+		self.calls = 0
+
+	def analyze_many(self, texts, timeout=None):
+		self.calls += 1
+		return [None if self.calls == 1 else {'label': 'POSITIVE', 'score': 0.9} for _ in texts]
+
+	def analyze(self, text, timeout=None):
+		return self.analyze_many([text], timeout)[0]
+
+
+def test_scores_missing_a_timed_out_sentiment_are_not_cached(monkeypatch):
+	app_module = importlib.import_module('app')
+	answer = 'In my experience the team solved the challenge. The result was good. I learned a lot.'
+	for score in ('score_answer', 'score_answers'):
+		batcher = FlakySentiment()
+		monkeypatch.setattr(app_module, 'sentiment_batcher', batcher)
+		ai = app_module.SkillMateAI()
+
+		def run():
+			if score == 'score_answer':
+				return ai.score_answer('q', answer, 'scenario')
+			return ai.score_answers([('q', answer, 'scenario')])[0]
+
+		without = run()
+		assert 'Positive and confident tone' not in without['feedback']
+		assert ai.score_cache.stats()['size'] == 0
+
+		# The next call re-scores with sentiment instead of hitting the cache
+		rescored = run()
+		assert rescored['score'] == without['score'] + 15
+		assert batcher.calls == 2
+		assert run() == rescored and batcher.calls == 2
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from sentiment import SentimentBatcher
+
+
+class FakePipeline:
+	def __init__(self):
+		self.batch_sizes = []
+
+	def __call__(self, texts, **kwargs):
+		self.batch_sizes.append(len(texts))
+		time.sleep(0.01)
+		return [{'label': 'POSITIVE' if 'good' in text else 'NEGATIVE', 'score': 0.9} for text in texts]
+
+
+def test_model_loads_lazily_and_concurrent_requests_share_batches():
+	loads = []
+	model = FakePipeline()
+
+	def loader():
+		loads.append(1)
+		return model
+
+	batcher = SentimentBatcher(enabled=True, loader=loader, max_batch_size=8, max_wait_ms=50)
+	assert loads == []
+
+	results = {}
+	threads = [
+		threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.analyze('good' if i % 2 else 'bad')))
+		for i in range(12)
+	]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert loads == [1]
+	assert [results[i]['label'] for i in range(12)] == ['NEGATIVE', 'POSITIVE'] * 6
+	assert max(model.batch_sizes) <= 8
+	assert len(model.batch_sizes) < 12
+	stats = batcher.stats()
+	assert stats['analyzed'] == 12
+	assert stats['avg_batch_size'] > 1
+
+
+def test_disabled_or_failed_model_returns_none():
+	assert SentimentBatcher(enabled=False).analyze('good answer') is None
+
+	def broken_loader():
+		raise RuntimeError('no model')
+
+	batcher = SentimentBatcher(enabled=True, loader=broken_loader)
+	assert batcher.analyze('good answer') is None
+	assert not batcher.available
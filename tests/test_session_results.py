@@ -0,0 +1,27 @@
+from session_results import SessionResults
+
+
+def test_summary_ranks_improvements_and_tolerates_bad_scores():
+	questions = [
+		{'id': 'q1', 'type': 'coding'},
+		{'id': 'q2', 'type': 'coding'},
+		{'id': 'q3', 'type': 'scenario'},
+		{'id': 'q4', 'type': 'scenario'},
+	]
+	scores = {
+		'q1': {'score': 80, 'areas_to_improve': ['Add examples', 'Mention complexity']},
+		'q2': {'score': 'n/a', 'areas_to_improve': 'not a list'},
+		'q3': {'score': 50, 'areas_to_improve': ['Mention complexity', 'Be concise', 7]},
+		'q4': 'garbage',
+	}
+	results = SessionResults.compute(questions, 3, scores, ['python'])
+	assert (results.avg_score, results.min_score, results.max_score) == (65.0, 50.0, 80.0)
+	assert results.improvements == ['Mention complexity', 'Add examples', 'Be concise']
+	assert results.category_scores == {'coding': 80.0, 'scenario': 50.0}
+	assert (results.answered_count, results.total_questions) == (3, 4)
+
+	restored = SessionResults.from_row(results.to_row())
+	assert vars(restored) == vars(results)
+
+	empty = SessionResults.compute([], 0, {}, [])
+	assert (empty.avg_score, empty.improvements, empty.category_scores) == (None, [], {})
@@ -0,0 +1,30 @@
+from skill_taxonomy import SkillTaxonomy, skill_taxonomy, tokenize
+
+
+def test_whole_token_matching_and_aliases():
+	skills, levels = skill_taxonomy.match(
+		'Maintained digital JavaScript apps on K8s with Node.js, C++ and C#; led microservices design. '
+		'Lead developers for .NET Core and CI/CD.')
+	assert 'ai' not in skills
+	assert 'git' not in skills
+	assert 'java' not in skills
+	for skill in ('javascript', 'kubernetes', 'node.js', 'c++', 'c#', 'microservices', '.net', 'ci/cd'):
+		assert skill in skills
+	assert levels == {'senior', 'mid'}
+
+
+def test_names_that_are_common_words_match_only_through_aliases():
+	skills, _ = skill_taxonomy.match('I go to R and C meetings; Golang and R programming')
+	assert 'go' in skills
+	assert 'r' in skills
+	assert 'c' not in skills
+
+
+def test_custom_taxonomy_trie():
+	taxonomy = SkillTaxonomy(
+		[{'name': 'machine learning', 'aliases': ['ml']}, {'name': 'sql', 'aliases': ['t-sql']}],
+		{'senior': ['tech lead'], 'junior': ['intern']})
+	assert tokenize('T-SQL, node.js; 3+ years.') == ['t', 'sql', 'node.js', '3+', 'years']
+	assert taxonomy.depth == 2
+	assert taxonomy.match('Tech leads doing Machine Learning') == (['machine learning'], {'senior'})
+	assert taxonomy.match('machine vision, learning and interns') == ([], {'junior'})